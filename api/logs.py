@@ -0,0 +1,43 @@
+"""Log CSV downloads.
+
+  GET /logs/miner.csv    — the miner status log (wm_status_log.csv)
+  GET /logs/battery.csv  — the EG4 battery log (eg4_battery_log.csv)
+
+These are the names the dashboards link to (WM_Dashboard.html,
+EG4_Battery.html). Only the two files the DataLoader reads are served;
+any other name is a 404, so the route can never reach outside them.
+"""
+from __future__ import annotations
+
+import os
+
+from flask import Blueprint, jsonify, send_from_directory
+
+
+def create_blueprint(data_loader) -> Blueprint:
+    """Build the /logs/* blueprint serving `data_loader`'s CSV files.
+
+    Conditional GET (ETag / Last-Modified) lets a client skip re-downloading
+    an unchanged file, and send_from_directory hands the body to
+    wsgi.file_wrapper so the server can use sendfile.
+    """
+    bp = Blueprint("logs", __name__)
+    files = {
+        "miner": data_loader.miner_log_file,
+        "battery": data_loader.battery_log_file,
+    }
+
+    @bp.get("/logs/<name>.csv")
+    def download_log_csv(name):
+        path = files.get(name)
+        if path is None:
+            return jsonify({"error": "unknown log file"}), 404
+        return send_from_directory(
+            os.path.abspath(os.path.dirname(path)),
+            os.path.basename(path),
+            as_attachment=True,
+            conditional=True,
+            max_age=10,
+        )
+
+    return bp
@@ -12,15 +12,21 @@ Refactored modular architecture with:
 """
 import os
 import sys
+import time
+import hashlib
 import logging
-import threading
-from collections import deque
-from datetime import datetime
-from flask import Flask, jsonify, request, send_from_directory
+from datetime import datetime, timezone
+from flask import Flask, Response, jsonify, request, send_from_directory
 
 # Load configuration
 from config import load_settings
 from utils.state_manager import StateManager
+from utils.log_config import is_enabled, log
+from utils.json_provider import OrjsonProvider, dumps_bytes
+from utils.chart_data import index_chart_rows, iter_chart_points
+from utils.async_runner import run_coroutine
+from utils.log_capture import LogBuffer, LogCapture
+from utils.ttl_cache import ttl_cache
 
 # Services
 from services.data_loader import DataLoader
@@ -33,82 +39,23 @@ from services.weather_service import WeatherService
 from services.weather_gate import WeatherGate, WeatherGateConfigSnapshot
 from services.pv_prediction_logger import PVPredictionLogger
 from api.weather import create_blueprint as create_weather_blueprint
+from api.logs import create_blueprint as create_logs_blueprint
 
 # ========== LOG BUFFER ==========
-class LogBuffer:
-    """Thread-safe buffer for capturing backend logs."""
-
-    def __init__(self, maxlen=500):
-        self.logs = deque(maxlen=maxlen)
-        self.lock = threading.Lock()
-
-    def add(self, message: str, level: str = "info"):
-        """Add a log message with timestamp."""
-        with self.lock:
-            self.logs.append({
-                "timestamp": datetime.now().isoformat(),
-                "message": message,
-                "level": level
-            })
-
-    def get_recent(self, count: int = 200):
-        """Get recent log messages."""
-        with self.lock:
-            return list(self.logs)[-count:]
-
-    def clear(self):
-        """Clear all logs."""
-        with self.lock:
-            self.logs.clear()
-
-# Global log buffer
+# Global log buffer (read by /api/system/logs)
 log_buffer = LogBuffer()
 
-class LogCapture:
-    """Captures stdout/stderr and routes to log buffer."""
-
-    def __init__(self, original, level="info"):
-        self.original = original
-        self.level = level
-
-    def write(self, text):
-        """Capture write calls."""
-        # Handle both str and bytes
-        if isinstance(text, bytes):
-            # Just write bytes directly to original
-            self.original.write(text)
-            self.original.flush()
-            return
-
-        if text and text.strip():
-            # Still write to original
-            self.original.write(text)
-            self.original.flush()
-
-            # Also add to log buffer
-            text = text.strip()
-
-            # Determine log level from content
-            level = self.level
-            if "error" in text.lower() or "✗" in text:
-                level = "error"
-            elif "warning" in text.lower():
-                level = "warning"
-            elif "✓" in text or "success" in text.lower():
-                level = "success"
-
-            log_buffer.add(text, level)
-
-    def flush(self):
-        """Flush the stream."""
-        self.original.flush()
-
 # Capture stdout and stderr
-sys.stdout = LogCapture(sys.stdout, "info")
-sys.stderr = LogCapture(sys.stderr, "error")
+sys.stdout = LogCapture(sys.stdout, log_buffer, "info")
+sys.stderr = LogCapture(sys.stderr, log_buffer, "error")
 
 # Initialize Flask app
 app = Flask(__name__, static_folder="static", static_url_path="/static")
+# orjson-backed JSON provider (falls back to the stdlib encoder when orjson
+# is not installed). History/chart rows have a fixed schema and the
+# dashboard reads fields by name, so key sorting stays off on either path.
+app.json = OrjsonProvider(app)
+app.json.sort_keys = False
 
 # Load settings
 print("[APP] Loading configuration...")
@@ -243,7 +190,7 @@ autocontrol_service = AutoControlService(
     sunset_minute=settings.autocontrol.sunset_minute
 )
 
-# Register the weather blueprint now that its collaborators exist.
+# Register the blueprints now that their collaborators exist.
 app.register_blueprint(
     create_weather_blueprint(
         weather_service,
@@ -252,6 +199,7 @@ app.register_blueprint(
         pv_prediction_logger=pv_prediction_logger,
     )
 )
+app.register_blueprint(create_logs_blueprint(data_loader))
 
 # Network scanner
 network_scanner = NetworkScanner(subnet="192.168.86")
@@ -271,6 +219,45 @@ braiins_service = BraiinsService(
     freshness_window_sec=settings.braiins.freshness_window_sec,
 )
 
+# ========== CONDITIONAL GET ==========
+# Mixed into every data ETag so validators cached by a browser before a
+# restart never match (live-history revisions start again at 0).
+_ETAG_SEED = time.time_ns()
+
+
+def _data_etag(*parts) -> str:
+    """ETag for a data response derived from its inputs, not its body.
+
+    The DataLoader cutoff moves at UTC midnight, so the UTC day is part of
+    every tag.
+    """
+    day = datetime.now(timezone.utc).toordinal()
+    key = repr((_ETAG_SEED, day) + parts).encode()
+    return hashlib.blake2b(key, digest_size=8).hexdigest()
+
+
+def _with_etag(resp, etag: str):
+    """Attach the validator; clients must revalidate before reusing."""
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "private, no-cache"
+    return resp
+
+
+def _not_modified(etag: str):
+    """Return a 304 response if the client already holds `etag`, else None."""
+    if etag in request.if_none_match:
+        return _with_etag(app.response_class(status=304), etag)
+    return None
+
+# ========== CONSTANT RESPONSES ==========
+# Fixed bodies for the hot acknowledgement / health endpoints, encoded once.
+_OK_BODY = dumps_bytes({"ok": True}) + b"\n"
+_HEALTH_BODY = dumps_bytes({"ok": True, "status": "healthy"}) + b"\n"
+
+
+def _ok_response():
+    return app.response_class(_OK_BODY, mimetype="application/json")
+
 # ========== API ROUTES ==========
 
 @app.route("/")
@@ -289,11 +276,26 @@ def miner_status():
         "connection": connection
     })
 
+# Shared across test_communication calls: pyasic caches the privileged
+# token on the instance (30 min), so repeat tests skip get_token — which
+# the firmware also rate-limits.
+_test_rpc_api = None
+
+
+def _get_test_rpc_api():
+    global _test_rpc_api
+    if _test_rpc_api is None:
+        from pyasic.rpc.btminer import BTMinerRPCAPI
+        api = BTMinerRPCAPI(settings.miner.host)
+        api.pwd = settings.miner.password
+        _test_rpc_api = api
+    return _test_rpc_api
+
+
 @app.get("/api/miner/test_communication")
 def test_miner_communication():
     """Test direct communication with miner - returns raw summary."""
     import asyncio
-    from pyasic.rpc.btminer import BTMinerRPCAPI
 
     print("\n" + "="*60)
     print("[TEST] DIRECT MINER COMMUNICATION TEST")
@@ -302,19 +304,19 @@ def test_miner_communication():
     print("="*60)
 
     try:
-        api = BTMinerRPCAPI(settings.miner.host)
-        api.pwd = settings.miner.password
+        api = _get_test_rpc_api()
 
-        print("[TEST] Step 1: Getting summary...")
-        summary = asyncio.run(api.summary())
-        print(f"[TEST] Summary response: {summary}")
+        async def _run_tests():
+            # Summary and token are independent reads; the privileged
+            # command needs the token, so it runs after both.
+            summary, token = await asyncio.gather(api.summary(), api.get_token())
+            result = await api.send_privileged_command("set_power_limit", power_limit="3500")
+            return summary, token, result
 
-        print("[TEST] Step 2: Getting token...")
-        token = asyncio.run(api.get_token())
+        print("[TEST] Getting summary + token, then sending test power limit command (3500W)...")
+        summary, token, result = run_coroutine(_run_tests(), timeout=30)
+        print(f"[TEST] Summary response: {summary}")
         print(f"[TEST] Token response: {token}")
-
-        print("[TEST] Step 3: Sending test power limit command (3500W)...")
-        result = asyncio.run(api.send_privileged_command("set_power_limit", power_limit="3500"))
         print(f"[TEST] Power limit response: {result}")
 
         print("="*60 + "\n")
@@ -348,25 +350,28 @@ def miner_history():
     except (ValueError, TypeError):
         days = settings.data.default_days
 
+    etag = _data_etag("miner_history", days, data_loader.file_signature(data_loader.miner_log_file))
+    cached = _not_modified(etag)
+    if cached is not None:
+        return cached
+
     # Load data if needed
     if days > data_loader.miner_loaded_days:
         rows = data_loader.extend_miner_data(days)
     else:
         rows = data_loader.load_miner_data(days)
 
-    # DEBUG: Log what we're returning
-    print(f"[API /api/miner/history] Returning {len(rows)} rows")
-    if rows:
-        print(f"[API] First row timestamp: {rows[0].get('ts')} (type: {type(rows[0].get('ts'))})")
-        print(f"[API] First row sample: {list(rows[0].items())[:5]}")
+    if __debug__:
+        log("API", f"/api/miner/history returning {len(rows)} rows"
+                   f" (first ts={rows[0].get('ts') if rows else None})")
 
-    return jsonify({
+    return _with_etag(jsonify({
         "data": rows,
         "meta": {
             "loaded_days": data_loader.miner_loaded_days,
             "requested_days": days
         }
-    })
+    }), etag)
 
 @app.post("/api/miner/power_limit")
 def set_miner_power_limit():
@@ -414,7 +419,7 @@ def miner_power_on():
     def _on_verified():
         state_mgr.save(miner_power_state="running")
     miner_service.power_on(on_verified=_on_verified)
-    return jsonify({"ok": True})
+    return _ok_response()
 
 @app.post("/api/miner/power_off")
 def miner_power_off():
@@ -430,7 +435,7 @@ def miner_power_off():
     def _on_verified():
         state_mgr.save(miner_power_state="stopped")
     miner_service.power_off(on_verified=_on_verified)
-    return jsonify({"ok": True})
+    return _ok_response()
 
 @app.get("/api/miner/op_status")
 def miner_op_status():
@@ -457,25 +462,28 @@ def battery_history():
     except (ValueError, TypeError):
         days = settings.data.default_days
 
+    etag = _data_etag("battery_history", days, data_loader.file_signature(data_loader.battery_log_file))
+    cached = _not_modified(etag)
+    if cached is not None:
+        return cached
+
     # Load data if needed
     if days > data_loader.battery_loaded_days:
         rows = data_loader.extend_battery_data(days)
     else:
         rows = data_loader.load_battery_data(days)
 
-    # DEBUG: Log what we're returning
-    print(f"[API /api/battery/history] Returning {len(rows)} rows")
-    if rows:
-        print(f"[API] First row timestamp: {rows[0].get('ts')} (type: {type(rows[0].get('ts'))})")
-        print(f"[API] First row sample: {list(rows[0].items())[:5]}")
+    if __debug__:
+        log("API", f"/api/battery/history returning {len(rows)} rows"
+                   f" (first ts={rows[0].get('ts') if rows else None})")
 
-    return jsonify({
+    return _with_etag(jsonify({
         "data": rows,
         "meta": {
             "loaded_days": data_loader.battery_loaded_days,
             "requested_days": days
         }
-    })
+    }), etag)
 
 @app.post("/api/battery/refresh_session")
 def battery_refresh_session():
@@ -484,12 +492,30 @@ def battery_refresh_session():
     return jsonify({"ok": success})
 
 # --- Chart Data Route ---
+# Points per chunk when streaming /api/chart-data: small enough that no
+# full-size list of output dicts exists, large enough to keep the number
+# of socket writes low.
+_CHART_STREAM_BATCH = 500
+
+
+def _stream_chart_json(index, hours):
+    """Yield {"data": [...], "hours": h, "count": n} as JSON in batches."""
+    yield b'{"data":['
+    first = True
+    batch = []
+    for point in iter_chart_points(index):
+        batch.append(dumps_bytes(point))
+        if len(batch) >= _CHART_STREAM_BATCH:
+            yield (b"" if first else b",") + b",".join(batch)
+            first = False
+            batch = []
+    if batch:
+        yield (b"" if first else b",") + b",".join(batch)
+    yield b'],"hours":' + dumps_bytes(hours) + b',"count":' + dumps_bytes(len(index)) + b"}\n"
+
 @app.get("/api/chart-data")
 def chart_data():
     """Get unified chart data with all metrics."""
-    print("\n" + "="*50)
-    print("[ChartAPI] === CHART DATA REQUEST ===")
-
     try:
         hours = int(request.args.get('hours', 72))  # Default 3 days
         hours = max(1, min(hours, 8760))  # Cap at 1 year
@@ -498,202 +524,50 @@ def chart_data():
         hours = 72
         days = 3
 
-    # Helper function to normalize timestamps
-    def normalize_timestamp(ts_str):
-        """
-        Convert any timestamp format to ISO 8601 with UTC timezone.
-        Handles:
-        - ISO with timezone: 2025-08-30T17:30:16-04:00
-        - ISO without timezone: 2025-08-30T04:47:24
-        - Various other formats
-        Returns ISO string with UTC: 2025-08-30T12:47:24+00:00
-        """
-        if not ts_str:
-            return None
-
-        from datetime import datetime, timezone
-
-        try:
-            # Parse timestamp - handle various formats
-            dt = datetime.fromisoformat(ts_str.replace('Z', '+00:00'))
-
-            # If no timezone, assume UTC
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-
-            # Convert to UTC
-            dt_utc = dt.astimezone(timezone.utc)
-
-            # Return ISO string
-            return dt_utc.isoformat()
-        except Exception as e:
-            print(f"[ChartAPI] ⚠️  Failed to parse timestamp '{ts_str}': {e}")
-            return None
+    etag = _data_etag(
+        "chart", hours,
+        data_loader.file_signature(data_loader.miner_log_file),
+        data_loader.file_signature(data_loader.battery_log_file),
+        miner_service.history_revision,
+        battery_service.history_revision,
+    )
+    cached = _not_modified(etag)
+    if cached is not None:
+        return cached
 
     try:
-        print(f"[ChartAPI] Requested: {hours} hours = {days} days")
-        print(f"[ChartAPI] Currently loaded: miner={data_loader.miner_loaded_days} days, battery={data_loader.battery_loaded_days} days")
-
         # Load miner and battery data
         if days > data_loader.miner_loaded_days:
-            print(f"[ChartAPI] Extending miner data to {days} days...")
             miner_rows = data_loader.extend_miner_data(days)
         else:
-            print(f"[ChartAPI] Using existing miner data ({data_loader.miner_loaded_days} days)...")
             miner_rows = data_loader.load_miner_data(days)
 
         if days > data_loader.battery_loaded_days:
-            print(f"[ChartAPI] Extending battery data to {days} days...")
             battery_rows = data_loader.extend_battery_data(days)
         else:
-            print(f"[ChartAPI] Using existing battery data ({data_loader.battery_loaded_days} days)...")
             battery_rows = data_loader.load_battery_data(days)
 
-        print(f"[ChartAPI] Miner CSV rows: {len(miner_rows)}")
-        print(f"[ChartAPI] Battery CSV rows: {len(battery_rows)}")
-
         # ALSO get in-memory live data from services
         miner_live = miner_service.get_history()  # Get live polling data
         battery_live = battery_service.get_history()  # Get live polling data
-        print(f"[ChartAPI] Miner live rows: {len(miner_live)}")
-        print(f"[ChartAPI] Battery live rows: {len(battery_live)}")
-
-        # Combine CSV + live data
-        all_miner_rows = miner_rows + miner_live
-        all_battery_rows = battery_rows + battery_live
-        print(f"[ChartAPI] Total miner (CSV+live): {len(all_miner_rows)}")
-        print(f"[ChartAPI] Total battery (CSV+live): {len(all_battery_rows)}")
-
-        # Log sample timestamps BEFORE normalization
-        if all_miner_rows:
-            print(f"[ChartAPI] Sample miner timestamp (before): {all_miner_rows[0].get('ts')}")
-        if all_battery_rows:
-            print(f"[ChartAPI] Sample battery timestamp (before): {all_battery_rows[0].get('ts')}")
-
-        # Build timestamp indexes: live rows are preferred over CSV rows at the same ts.
-        # Index CSV first, then overwrite with live rows, logging any collisions.
-        miner_by_ts: dict = {}
-        miner_csv_ts: set = set()
-        for row in miner_rows:
-            ts = row.get('ts')
-            if ts:
-                normalized_ts = normalize_timestamp(ts)
-                if normalized_ts:
-                    miner_by_ts[normalized_ts] = row
-                    miner_csv_ts.add(normalized_ts)
-        for row in miner_live:
-            ts = row.get('ts')
-            if ts:
-                normalized_ts = normalize_timestamp(ts)
-                if normalized_ts:
-                    if normalized_ts in miner_csv_ts:
-                        print(f"[ChartAPI] Live miner row overwrites CSV row at ts={normalized_ts}")
-                    miner_by_ts[normalized_ts] = row
-
-        battery_by_ts: dict = {}
-        battery_csv_ts: set = set()
-        for row in battery_rows:
-            ts = row.get('ts')
-            if ts:
-                normalized_ts = normalize_timestamp(ts)
-                if normalized_ts:
-                    battery_by_ts[normalized_ts] = row
-                    battery_csv_ts.add(normalized_ts)
-        for row in battery_live:
-            ts = row.get('ts')
-            if ts:
-                normalized_ts = normalize_timestamp(ts)
-                if normalized_ts:
-                    if normalized_ts in battery_csv_ts:
-                        print(f"[ChartAPI] Live battery row overwrites CSV row at ts={normalized_ts}")
-                    battery_by_ts[normalized_ts] = row
-
-        # Log sample normalized timestamps
-        if miner_by_ts:
-            first_normalized = list(miner_by_ts.keys())[0]
-            print(f"[ChartAPI] Sample miner timestamp (after): {first_normalized}")
-        if battery_by_ts:
-            first_normalized = list(battery_by_ts.keys())[0]
-            print(f"[ChartAPI] Sample battery timestamp (after): {first_normalized}")
-
-        # Merge data by timestamp (union of all timestamps)
-        all_timestamps = sorted(set(list(miner_by_ts.keys()) + list(battery_by_ts.keys())))
-
-        # Build unified data array
-        # Helper to safely convert to float (handles None and empty strings)
-        def safe_float(val):
-            if val is None or val == '':
-                return None
-            try:
-                return float(val)
-            except (ValueError, TypeError):
-                return None
-
-        def safe_int(val):
-            if val is None or val == '':
-                return None
-            try:
-                return int(val)
-            except (ValueError, TypeError):
-                return None
-
-        data = []
-        for ts in all_timestamps:
-            miner = miner_by_ts.get(ts, {})
-            battery = battery_by_ts.get(ts, {})
-
-            # Extract miner data
-            hashrate = miner.get('Hashrate')
-            miner_power = miner.get('Power')
-            fan_speed = None
-            for k in miner.keys():
-                # Add None check before calling .lower()
-                if k and (('fan' in k.lower()) or ('rpm' in k.lower())):
-                    try:
-                        fan_speed = int(miner[k])
-                        break
-                    except:
-                        pass
-            env_temp = miner.get('Env Temp') or miner.get('Env Temperature')
-            miner_temp = miner.get('Temperature') or miner.get('Chip Temp Avg')
-
-            # Extract battery data
-            battery_soc = battery.get('soc_percent')
-            pv_power = battery.get('pv_power_w')
-            eps_power = battery.get('load_power_w')
-            net_power = battery.get('battery_net_w')
-
-            data.append({
-                "timestamp": ts,
-                "hash_rate": safe_float(hashrate),
-                "miner_power": safe_float(miner_power),
-                "fan_speed": safe_int(fan_speed),
-                "env_temp": safe_float(env_temp),
-                "miner_temp": safe_float(miner_temp),
-                "battery_soc": safe_float(battery_soc),
-                "pv_power": safe_float(pv_power),
-                "eps_power": safe_float(eps_power),
-                "net_power": safe_float(net_power),
-            })
-
-        print(f"[ChartAPI] === FINAL RESULTS ===")
-        print(f"[ChartAPI] Merged timestamps: {len(all_timestamps)}")
-        print(f"[ChartAPI] Final data points: {len(data)}")
-        if len(data) > 0:
-            print(f"[ChartAPI] First timestamp: {data[0]['timestamp']}")
-            print(f"[ChartAPI] Last timestamp: {data[-1]['timestamp']}")
-            print(f"[ChartAPI] Sample row: hash_rate={data[0]['hash_rate']}, miner_power={data[0]['miner_power']}, battery_soc={data[0]['battery_soc']}")
-        else:
-            print(f"[ChartAPI] ⚠️  NO DATA IN FINAL RESULT!")
-        print("="*50 + "\n")
 
-        return jsonify({"data": data, "hours": hours, "count": len(data)})
+        # Merge CSV + live data by timestamp (live rows win on collision)
+        index = index_chart_rows(miner_rows, miner_live, battery_rows, battery_live)
+
+        if __debug__ and is_enabled("API"):
+            log("API", f"chart-data hours={hours} days={days} "
+                       f"miner csv/live={len(miner_rows)}/{len(miner_live)} "
+                       f"battery csv/live={len(battery_rows)}/{len(battery_live)} "
+                       f"points={len(index)} "
+                       f"range={index[0][0] if index else None}..{index[-1][0] if index else None}")
+
+        resp = Response(_stream_chart_json(index, hours), mimetype="application/json")
+        return _with_etag(resp, etag)
 
     except Exception as e:
         print(f"[ChartAPI] ❌ ERROR: {type(e).__name__}: {e}")
         import traceback
         traceback.print_exc()
-        print("="*50 + "\n")
         return jsonify({"error": str(e), "data": [], "count": 0}), 500
 
 # --- Auto-Control Routes ---
@@ -839,23 +713,20 @@ def network_devices():
 
 @app.post("/api/network/scan")
 def network_scan():
-    """Trigger immediate network scan."""
-    devices = network_scanner.scan_network()
-    return jsonify({
-        "ok": True,
-        "device_count": len(devices),
-        "devices": [
-            {
-                "ip": d.ip,
-                "type": d.device_type.value,
-                "hashrate_ths": d.hashrate_ths,
-                "power_w": d.power_w,
-            }
-            for d in devices
-        ]
-    })
+    """Trigger an immediate background scan.
+
+    Returns at once; the results appear in /api/network/devices when the
+    scan lands ("scanning" is true until then).
+    """
+    network_scanner.trigger_scan_now()
+    return jsonify({"ok": True, "scanning": True}), 202
 
 # --- System Routes ---
+# Scan results change at most once per scan cycle (minutes); rebuilding the
+# device list on every status poll is wasted work. Connection/autocontrol
+# state stays live.
+_cached_scan_info = ttl_cache(2.0)(network_scanner.get_scan_info)
+
 @app.get("/api/system/status")
 def system_status():
     """Get overall system status."""
@@ -863,14 +734,14 @@ def system_status():
         "miner": miner_service.get_connection_status(),
         "battery": battery_service.get_connection_status(),
         "autocontrol": autocontrol_service.get_state(),
-        "network": network_scanner.get_scan_info(),
+        "network": _cached_scan_info(),
         "data_loader": data_loader.get_stats()
     })
 
 @app.get("/api/system/health")
 def system_health():
     """Health check endpoint."""
-    return jsonify({"ok": True, "status": "healthy"})
+    return app.response_class(_HEALTH_BODY, mimetype="application/json")
 
 @app.get("/api/system/logs")
 def system_logs():
@@ -888,10 +759,15 @@ def system_logs():
 def clear_system_logs():
     """Clear system logs."""
     log_buffer.clear()
-    return jsonify({"ok": True})
+    return _ok_response()
 
-# ========== MAIN ==========
-if __name__ == "__main__":
+# ========== STARTUP ==========
+def start_background_services():
+    """Preload history and start the pollers / control loops.
+
+    Called once per process: from __main__ for `python3 app.py`, and from
+    gunicorn.conf.py's post_worker_init when run under gunicorn.
+    """
     # Load initial data
     print("[APP] Loading initial data...")
     data_loader.load_miner_data(settings.data.default_days)
@@ -909,15 +785,23 @@ if __name__ == "__main__":
         print("[APP] Starting Braiins Pool service...")
         braiins_service.start()
 
+
+# ========== MAIN ==========
+if __name__ == "__main__":
+    start_background_services()
+
     # Configure logging
     logging.getLogger("werkzeug").setLevel(logging.ERROR)
 
     print(f"[APP] Starting Flask server on {settings.app.host}:{settings.app.port}")
     print(f"[APP] Dashboard: http://localhost:{settings.app.port}/")
 
-    # Run Flask app
+    # Run Flask app. One thread per request: the slow network-bound
+    # endpoints (test_communication, refresh_session, network scan) block
+    # only their own thread, never /api/chart-data or the status polls.
     app.run(
         host=settings.app.host,
         port=settings.app.port,
-        debug=settings.app.debug
+        debug=settings.app.debug,
+        threaded=True,
     )
@@ -1,12 +1,19 @@
 """Configuration management with YAML + environment variable support."""
+import functools
 import os
 import yaml
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, is_dataclass, replace
 from typing import Optional
 from pathlib import Path
 
+# libyaml-backed loader when PyYAML was built with it; same safe semantics.
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
-@dataclass
+
+@dataclass(slots=True)
 class MinerConfig:
     """WhatsMiner configuration."""
     host: str = "192.168.86.52"
@@ -16,7 +23,7 @@ class MinerConfig:
     poll_seconds: int = 10
 
 
-@dataclass
+@dataclass(slots=True)
 class BatteryConfig:
     """EG4 Battery configuration."""
     user: str = ""
@@ -26,7 +33,7 @@ class BatteryConfig:
     session_refresh_hours: int = 168  # 1 week
 
 
-@dataclass
+@dataclass(slots=True)
 class AwayModeConfig:
     """Away mode specific configuration."""
     emergency_soc: int = 30
@@ -34,7 +41,7 @@ class AwayModeConfig:
     after_sunset_min_soc: int = 40
 
 
-@dataclass
+@dataclass(slots=True)
 class LocationConfig:
     """Location configuration for sunset calculation."""
     latitude: float = 40.0
@@ -42,7 +49,7 @@ class LocationConfig:
     timezone: str = "America/New_York"
 
 
-@dataclass
+@dataclass(slots=True)
 class AutoControlConfig:
     """Auto-control configuration."""
     enabled: bool = False
@@ -55,7 +62,7 @@ class AutoControlConfig:
     sunset_minute: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class BraiinsConfig:
     """Braiins Pool integration configuration."""
     enabled: bool = False
@@ -63,7 +70,7 @@ class BraiinsConfig:
     freshness_window_sec: int = 300
 
 
-@dataclass
+@dataclass(slots=True)
 class WeatherGateConfig:
     """Weather-gated autocontrol configuration.
 
@@ -88,7 +95,7 @@ class WeatherGateConfig:
     forecast_freshness_seconds: int = 7200
 
 
-@dataclass
+@dataclass(slots=True)
 class DataConfig:
     """Data loading configuration."""
     default_days: int = 3
@@ -96,7 +103,7 @@ class DataConfig:
     log_interval_sec: int = 3600
 
 
-@dataclass
+@dataclass(slots=True)
 class AppConfig:
     """Application configuration."""
     port: int = 8080
@@ -104,7 +111,7 @@ class AppConfig:
     debug: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class Settings:
     """Complete application settings."""
     miner: MinerConfig = field(default_factory=MinerConfig)
@@ -125,6 +132,83 @@ class Settings:
             raise ValueError("default_days cannot exceed max_days")
 
 
+# (env var, Settings section, field, cast) applied over the YAML values.
+_ENV_OVERRIDES = (
+    ('WM_HOST', 'miner', 'host', str),
+    ('WM_USER', 'miner', 'user', str),
+    ('WM_PASS', 'miner', 'password', str),
+    ('WM_BASE_WATTS', 'miner', 'base_watts', int),
+    ('EG4_USER', 'battery', 'user', str),
+    ('EG4_PASS', 'battery', 'password', str),
+    ('EG4_BASE_URL', 'battery', 'base_url', str),
+    ('POLL_SECONDS', 'miner', 'poll_seconds', int),
+    ('POLL_SECONDS', 'battery', 'poll_seconds', int),
+    ('PORT', 'app', 'port', int),
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_yaml_cached(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse one version of a config file; the stat key is part of the
+    cache key so an edited file misses. The returned dict is shared
+    between calls and must not be mutated."""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
+
+
+def _read_yaml(config_file: Path) -> dict:
+    """Return the parsed YAML dict, from memory while the file is unchanged.
+
+    Nothing is written to disk: config.local.yaml holds credentials, which
+    must not be copied anywhere else.
+    """
+    st = config_file.stat()
+    return _parse_yaml_cached(str(config_file.resolve()), st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=None)
+def _field_plan(cls) -> tuple:
+    """(name, type) for each field of a config dataclass, computed once."""
+    return tuple((f.name, f.type) for f in fields(cls))
+
+
+def _merge(base, section: Optional[dict], coerce: bool = False):
+    """Return `base` with the fields present in a YAML section replaced.
+
+    Keys that are not fields are ignored and missing keys keep the base
+    value; with nothing to change `base` itself is returned. Nested
+    dataclass fields (autocontrol.away_mode, .location) merge recursively.
+    With coerce=True, int/float fields are cast with their declared type.
+    """
+    if not section:
+        return base
+    changes = {}
+    for name, ftype in _field_plan(type(base)):
+        if name not in section:
+            continue
+        value = section[name]
+        current = getattr(base, name)
+        if is_dataclass(current) and isinstance(value, dict):
+            value = _merge(current, value, coerce)
+        elif coerce and ftype in (int, float):
+            value = ftype(value)
+        changes[name] = value
+    return replace(base, **changes) if changes else base
+
+
+# (Settings section, cast int/float fields) merged from YAML in order.
+# Weather gate numbers are cast to their declared types.
+_YAML_SECTIONS = (
+    ('miner', False),
+    ('battery', False),
+    ('autocontrol', False),
+    ('data', False),
+    ('app', False),
+    ('braiins', False),
+    ('weather_gate', True),
+)
+
+
 def load_settings(config_path: Optional[str] = None) -> Settings:
     """
     Load settings from YAML file and environment variables.
@@ -149,137 +233,32 @@ def load_settings(config_path: Optional[str] = None) -> Settings:
     config_file = Path(config_path)
     if config_file.exists():
         print(f"[Config] Loading from {config_file}")
-        with open(config_file, 'r') as f:
-            data = yaml.safe_load(f) or {}
+        data = _read_yaml(config_file)
         print(f"[Config] YAML data section: {data.get('data', {})}")
 
-        # Miner config
-        if 'miner' in data:
-            m = data['miner']
-            settings.miner = MinerConfig(
-                host=m.get('host', settings.miner.host),
-                user=m.get('user', settings.miner.user),
-                password=m.get('password', settings.miner.password),
-                base_watts=m.get('base_watts', settings.miner.base_watts),
-                poll_seconds=m.get('poll_seconds', settings.miner.poll_seconds),
-            )
-
-        # Battery config
-        if 'battery' in data:
-            b = data['battery']
-            settings.battery = BatteryConfig(
-                user=b.get('user', settings.battery.user),
-                password=b.get('password', settings.battery.password),
-                base_url=b.get('base_url', settings.battery.base_url),
-                poll_seconds=b.get('poll_seconds', settings.battery.poll_seconds),
-                session_refresh_hours=b.get('session_refresh_hours', settings.battery.session_refresh_hours),
-            )
-
-        # Auto-control config
-        if 'autocontrol' in data:
-            a = data['autocontrol']
-
-            # Parse away_mode section
-            away_mode_data = a.get('away_mode', {})
-            away_mode = AwayModeConfig(
-                emergency_soc=away_mode_data.get('emergency_soc', 30),
-                max_pv_power=away_mode_data.get('max_pv_power', 3600),
-                after_sunset_min_soc=away_mode_data.get('after_sunset_min_soc', 40)
-            )
-
-            # Parse location section
-            location_data = a.get('location', {})
-            location = LocationConfig(
-                latitude=location_data.get('latitude', 40.0),
-                longitude=location_data.get('longitude', -74.0),
-                timezone=location_data.get('timezone', 'America/New_York')
-            )
-
-            settings.autocontrol = AutoControlConfig(
-                enabled=a.get('enabled', settings.autocontrol.enabled),
-                min_interval_sec=a.get('min_interval_sec', settings.autocontrol.min_interval_sec),
-                mode=a.get('mode', 'away'),
-                away_mode=away_mode,
-                location=location,
-                sunset_hour=a.get('sunset_hour', settings.autocontrol.sunset_hour),
-                sunset_minute=a.get('sunset_minute', settings.autocontrol.sunset_minute),
-            )
-
-        # Data config
+        for section, coerce in _YAML_SECTIONS:
+            merged = _merge(getattr(settings, section), data.get(section), coerce)
+            setattr(settings, section, merged)
         if 'data' in data:
-            d = data['data']
-            settings.data = DataConfig(
-                default_days=d.get('default_days', settings.data.default_days),
-                max_days=d.get('max_days', settings.data.max_days),
-                log_interval_sec=d.get('log_interval_sec', settings.data.log_interval_sec),
-            )
             print(f"[Config] Set default_days={settings.data.default_days}, max_days={settings.data.max_days}")
 
-        # App config
-        if 'app' in data:
-            app = data['app']
-            settings.app = AppConfig(
-                port=app.get('port', settings.app.port),
-                host=app.get('host', settings.app.host),
-                debug=app.get('debug', settings.app.debug),
-            )
-
-        # Braiins Pool config
-        if 'braiins' in data:
-            br = data['braiins']
-            settings.braiins = BraiinsConfig(
-                enabled=br.get('enabled', settings.braiins.enabled),
-                poll_seconds=br.get('poll_seconds', settings.braiins.poll_seconds),
-                freshness_window_sec=br.get('freshness_window_sec', settings.braiins.freshness_window_sec),
+        eg4_mult = settings.weather_gate.eg4_predict_multiplier
+        if eg4_mult <= 0:
+            raise ValueError(
+                f"weather_gate.eg4_predict_multiplier must be > 0, got {eg4_mult}"
             )
 
-        # Weather gate config
-        if 'weather_gate' in data:
-            wg = data['weather_gate'] or {}
-            d = settings.weather_gate
-            eg4_mult = float(wg.get('eg4_predict_multiplier', d.eg4_predict_multiplier))
-            if eg4_mult <= 0:
-                raise ValueError(
-                    f"weather_gate.eg4_predict_multiplier must be > 0, got {eg4_mult}"
-                )
-            settings.weather_gate = WeatherGateConfig(
-                enabled=wg.get('enabled', d.enabled),
-                battery_total_kwh=float(wg.get('battery_total_kwh', d.battery_total_kwh)),
-                summer_max_kwh=float(wg.get('summer_max_kwh', d.summer_max_kwh)),
-                winter_max_kwh=float(wg.get('winter_max_kwh', d.winter_max_kwh)),
-                pre_sunrise_window_minutes=int(wg.get('pre_sunrise_window_minutes', d.pre_sunrise_window_minutes)),
-                recovery_soc_threshold_pct=int(wg.get('recovery_soc_threshold_pct', d.recovery_soc_threshold_pct)),
-                recovery_min_hours_before_sunset=float(wg.get('recovery_min_hours_before_sunset', d.recovery_min_hours_before_sunset)),
-                eg4_predict_multiplier=eg4_mult,
-                forecast_refresh_seconds=int(wg.get('forecast_refresh_seconds', d.forecast_refresh_seconds)),
-                forecast_freshness_seconds=int(wg.get('forecast_freshness_seconds', d.forecast_freshness_seconds)),
-            )
-
-    # Override with environment variables
-    if os.getenv('WM_HOST'):
-        settings.miner.host = os.getenv('WM_HOST')
-    if os.getenv('WM_USER'):
-        settings.miner.user = os.getenv('WM_USER')
-    if os.getenv('WM_PASS'):
-        settings.miner.password = os.getenv('WM_PASS')
-    if os.getenv('WM_BASE_WATTS'):
-        settings.miner.base_watts = int(os.getenv('WM_BASE_WATTS'))
-
-    if os.getenv('EG4_USER'):
-        settings.battery.user = os.getenv('EG4_USER')
-    if os.getenv('EG4_PASS'):
-        settings.battery.password = os.getenv('EG4_PASS')
-    if os.getenv('EG4_BASE_URL'):
-        settings.battery.base_url = os.getenv('EG4_BASE_URL')
-
-    if os.getenv('POLL_SECONDS'):
-        settings.miner.poll_seconds = int(os.getenv('POLL_SECONDS'))
-        settings.battery.poll_seconds = int(os.getenv('POLL_SECONDS'))
-
-    if os.getenv('PORT'):
-        settings.app.port = int(os.getenv('PORT'))
+    # Override with environment variables (empty values count as unset)
+    env = os.environ
+    for name, section, attr, cast in _ENV_OVERRIDES:
+        v = env.get(name)
+        if v:
+            setattr(getattr(settings, section), attr, cast(v))
 
     # Validate settings
     settings.validate()
 
     return settings
+
+
+load_settings.cache_clear = _parse_yaml_cached.cache_clear
@@ -0,0 +1,98 @@
+"""Optional config hot-reload driven by filesystem events.
+
+Uses the `watchdog` package when installed; without it
+start_config_watcher() returns None and callers keep the settings they
+loaded at startup. Nothing is re-read while the file is unchanged.
+
+Usage:
+    from config.watcher import start_config_watcher
+
+    observer = start_config_watcher(lambda s: print(s.autocontrol))
+    ...
+    if observer:
+        observer.stop()
+"""
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from .settings import Settings, load_settings
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+    WATCHDOG_AVAILABLE = False
+
+# Event types that can change the file. Reads (our own reload included)
+# raise "opened"/"closed_no_write" and must not trigger another reload.
+_WRITE_EVENTS = frozenset({"created", "modified", "moved", "closed"})
+
+# Editors save in bursts (truncate + write, or write temp + rename);
+# wait this long after the last event before reloading.
+DEBOUNCE_SEC = 0.2
+
+
+class _ConfigChangeHandler(FileSystemEventHandler):
+    """Reload settings after events that touch the watched config file."""
+
+    def __init__(self, config_path: Path, on_change: Callable[[Settings], None],
+                 debounce_sec: float = DEBOUNCE_SEC):
+        super().__init__()
+        self.config_path = config_path
+        self.on_change = on_change
+        self.debounce_sec = debounce_sec
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def on_any_event(self, event):
+        if getattr(event, "event_type", None) not in _WRITE_EVENTS:
+            return
+        # Renames land on dest_path (atomic-save editors write a temp file).
+        paths = (getattr(event, "src_path", None), getattr(event, "dest_path", None))
+        if not any(p and Path(p).name == self.config_path.name for p in paths):
+            return
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce_sec, self._reload)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _reload(self):
+        load_settings.cache_clear()
+        try:
+            settings = load_settings(str(self.config_path))
+        except Exception as e:
+            # Keep running on the previous settings until the file is fixed.
+            print(f"[Config] Reload of {self.config_path} failed: {e}")
+            return
+        print(f"[Config] Reloaded {self.config_path}")
+        self.on_change(settings)
+
+
+def start_config_watcher(on_change: Callable[[Settings], None],
+                         config_path: Optional[str] = None):
+    """Watch the config file and call `on_change(settings)` after each edit.
+
+    `config_path` defaults to the file load_settings() would pick
+    (config.local.yaml if present, else config.yaml). Returns the running
+    watchdog Observer, or None when watchdog is not installed.
+    """
+    if not WATCHDOG_AVAILABLE:
+        print("[Config] watchdog not installed, config hot-reload disabled")
+        return None
+    if config_path is None:
+        config_path = "config.local.yaml" if Path("config.local.yaml").exists() else "config.yaml"
+    path = Path(config_path).resolve()
+
+    observer = Observer()
+    observer.schedule(_ConfigChangeHandler(path, on_change), str(path.parent), recursive=False)
+    observer.daemon = True
+    observer.start()
+    return observer
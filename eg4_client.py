@@ -10,12 +10,13 @@ eg4_client.py — background EG4 battery runtime fetcher with a simple sync API.
 """
 
 import os, sys, json, time, threading, asyncio
-from dataclasses import is_dataclass, asdict
 from collections import deque
+from itertools import islice
+from operator import itemgetter
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
-from eg4_inverter_api import EG4InverterAPI
+from eg4_inverter_api import EG4AuthError, EG4InverterAPI
 
 from utils.eg4_pv_predict import (
     classify_pv_predict_response,
@@ -28,11 +29,36 @@ from utils.log_config import log
 # possible before the staleness threshold fires and autocontrol stops the miner.
 RELOGIN_COOLDOWN_SEC = 300
 
+# Ceiling for the poll interval while polls keep raising. Kept well inside the
+# 600s freshness gate so a recovered portal is noticed before it fires.
+POLL_BACKOFF_MAX_SEC = 120
+
+# Minimum spacing between re-logins after a poll raised something that does
+# not look like an auth failure (timeouts, DNS, 5xx). Auth failures re-login
+# immediately.
+ERROR_RELOGIN_MIN_INTERVAL_SEC = 60
+
 # EG4 portal context-path prefix. The bare /api/weather/forecast is a 404 —
 # the Tomcat app is mounted under /WManage. Probed 2026-05-23.
 _PV_PREDICT_PATH = "/WManage/api/weather/forecast"
 
 
+# Merged-snapshot keys in history-row order. History keeps each snapshot as
+# a tuple of these values (no per-row key table) and only rebuilds dicts in
+# get_history(). A 10-field tuple is 120 bytes against 272 for the dict.
+_HISTORY_FIELDS = (
+    "ts", "soc_percent", "pack_voltage_v", "pack_current_a", "pv_power_w",
+    "load_power_w", "grid_power_w", "ac_couple_w", "battery_net_w", "units",
+)
+_history_row = itemgetter(*_HISTORY_FIELDS)
+
+# Numeric runtime fields read by _merge_response, converted in one pass.
+_RUNTIME_NUM_KEYS = (
+    "ppv1", "ppv2", "ppv3", "ppv", "pEpsL1N", "pEpsL2N", "pToUser",
+    "consumptionPower", "pToGrid", "acCouplePower", "pCharge", "pDisCharge",
+)
+
+
 def _is_empty_response(resp) -> bool:
     """Single authoritative rule for what counts as an empty EG4 response.
 
@@ -88,24 +114,48 @@ def _is_merged_snapshot_empty(merged: dict) -> bool:
     return True
 
 
-def _to_plain(o):
-    if o is None or isinstance(o, (str,int,float,bool)): return o
-    if is_dataclass(o):  # handles nested dataclasses
-        return {k: _to_plain(v) for k, v in asdict(o).items()}
-    if hasattr(o, "model_dump"): return _to_plain(o.model_dump())
-    if hasattr(o, "dict"): return _to_plain(o.dict())
-    if isinstance(o, dict): return {str(k): _to_plain(v) for k,v in o.items()}
-    if isinstance(o, (list,tuple,set)): return [_to_plain(v) for v in o]
-    if hasattr(o, "__dict__"): return {k: _to_plain(v) for k,v in o.__dict__.items() if not k.startswith("_")}
-    return str(o)
+def _get(obj, key, default=None):
+    """Read one field from an EG4 response object or a plain dict.
 
-def _num(x):
+    The library returns plain attribute objects (RuntimeData, BatteryData,
+    BatteryUnit); tests and older versions hand back dicts. Only the fields
+    _merge_response consumes are read, instead of converting the whole tree.
+    """
+    if isinstance(obj, dict):
+        return obj.get(key, default)
+    return getattr(obj, key, default)
+
+def _num(x, _float=float, _int=int):
+    # The portal hands back ints/floats for almost every field; convert
+    # those without entering a try block and only parse the rest.
+    t = type(x)
+    if t is _int or t is _float:
+        return _float(x)
+    if x is None:
+        return None
     try:
-        return float(x)
+        return _float(x)
     except (TypeError, ValueError):
         return None
 
 
+def _is_auth_error(exc: BaseException) -> bool:
+    """True when a poll exception means the session itself is bad."""
+    if isinstance(exc, EG4AuthError):
+        return True
+    msg = str(exc).lower()
+    return any(marker in msg for marker in ("401", "403", "unauthorized", "forbidden", "login"))
+
+
+def _next_poll_delay(current: float, base: float, failed: bool) -> float:
+    """Interval before the next poll: back to `base` after a success,
+    doubled after a failure, capped at POLL_BACKOFF_MAX_SEC (or `base` if
+    that is already longer)."""
+    if not failed:
+        return base
+    return min(current * 2, max(base, POLL_BACKOFF_MAX_SEC))
+
+
 def _validate_today_yielding(raw: Any) -> Optional[float]:
     """Validate a raw todayYielding value and convert tenths-of-kWh -> kWh.
 
@@ -147,11 +197,16 @@ class EG4Client:
         self._api: Optional[EG4InverterAPI] = None
 
         self._latest: Dict[str, Any] = {}
+        # Units list of the last merge; see _units_snapshot.
+        self._prev_units: Optional[list] = None
         self._last_error: Optional[str] = None
         self._lock = threading.Lock()
 
         # Monotonic timestamp of last re-login attempt; 0.0 = eligible immediately.
         self._last_relogin_attempt: float = 0.0
+        # Same, for re-logins after a poll raised (separate from the
+        # empty-response cooldown above so one cannot starve the other).
+        self._last_error_relogin: float = 0.0
 
         # PV-predict cache. Populated by refresh_pv_predict_blocking() via the
         # background event loop; the shape mirrors the parsed forecast snapshot:
@@ -195,9 +250,28 @@ class EG4Client:
         if self._thread:
             self._thread.join(timeout=timeout)
 
+    def reauth(self, timeout: float = 30.0) -> bool:
+        """Log in again on the running client and poll once.
+
+        Keeps the polling thread, event loop and HTTP session alive, unlike
+        stop() + a new EG4Client. Returns True when the follow-up poll
+        produced a new snapshot with SOC. Raises RuntimeError if the loop is
+        not running; login errors propagate so the caller can fall back to
+        recreating the client.
+        """
+        if self._loop is None or not self._loop.is_running():
+            raise RuntimeError("EG4Client loop not running")
+        before = self._latest.get("ts")
+        asyncio.run_coroutine_threadsafe(self._reauth_async(), self._loop).result(timeout)
+        latest = self._latest
+        return latest.get("ts") != before and latest.get("soc_percent") is not None
+
     def get_latest(self) -> Dict[str, Any]:
-        with self._lock:
-            return dict(self._latest) if self._latest else {}
+        # _poll_once only ever rebinds _latest to a new dict, never mutates
+        # it, so a single attribute read sees a complete snapshot without
+        # taking the lock.
+        latest = self._latest
+        return dict(latest) if latest else {}
 
     def get_latest_pv_predict(self) -> Dict[str, Any]:
         """Return the most recent EG4 PV prediction snapshot (sync, cache-only).
@@ -320,16 +394,21 @@ class EG4Client:
         return getattr(energy, "todayYielding", None)
 
     def get_history(self, limit: int = 120) -> list[Dict[str, Any]]:
+        # Walk back from the newest entry so only `limit` items are touched;
+        # islice(history, n - limit, n) would still step over the older ones.
+        if limit <= 0:
+            return []
         with self._lock:
-            return list(self.history)[-limit:]
+            recent = list(islice(reversed(self.history), limit))
+        recent.reverse()
+        return [dict(zip(_HISTORY_FIELDS, row)) for row in recent]
 
     def last_error(self) -> Optional[str]:
         return self._last_error
 
     def last_snapshot_ts(self) -> Optional[datetime]:
         """Return the timestamp of the most recent accepted snapshot, or None if no poll yet."""
-        with self._lock:
-            ts_str = self._latest.get("ts")
+        ts_str = self._latest.get("ts")
         if not ts_str:
             return None
         try:
@@ -367,22 +446,48 @@ class EG4Client:
             # non-fatal; will still try runtime/battery which may set inverter implicitly
             self._last_error = f"select_inverter_failed: {e}"
 
-        # polling loop
+        # polling loop; back off exponentially while polls keep raising
+        delay = self.poll_seconds
         while not self._stop_evt.is_set():
             try:
                 await self._poll_once()
                 self._last_error = None
+                failed = False
             except Exception as e:
                 self._last_error = f"poll_error: {e}"
-                # if auth expired, re-login once
-                try:
-                    await self._api.login(ignore_ssl=True)
-                except Exception:
-                    pass
-            await asyncio.sleep(self.poll_seconds)
+                failed = True
+                # Re-login on auth failures; anything else (network blips,
+                # 5xx) only gets a re-login once per interval.
+                now = time.monotonic()
+                if (_is_auth_error(e)
+                        or now - self._last_error_relogin >= ERROR_RELOGIN_MIN_INTERVAL_SEC):
+                    self._last_error_relogin = now
+                    try:
+                        await self._api.login(ignore_ssl=True)
+                    except Exception:
+                        pass
+            delay = _next_poll_delay(delay, self.poll_seconds, failed)
+            if failed and __debug__:
+                log("EG4_SESSION", f"poll failed, next attempt in {delay:.0f}s")
+            await asyncio.sleep(delay)
 
         await self._shutdown()
 
+    async def _reauth_async(self):
+        assert self._api is not None
+        await self._api.login(ignore_ssl=True)
+        if __debug__:
+            log("EG4_SESSION", "re-login on existing session (reauth)")
+        # The selected inverter is lost with the old session (see
+        # _attempt_recovery); non-fatal, the poll below may still work.
+        try:
+            invs = self._api.get_inverters()
+            if invs:
+                self._api.set_selected_inverter(inverterIndex=0)
+        except Exception as e:
+            print(f"[EG4Client] Re-select inverter failed (non-fatal): {e}")
+        await self._poll_once()
+
     async def _shutdown(self):
         try:
             if self._api:
@@ -436,8 +541,7 @@ class EG4Client:
         except Exception as e:
             print(f"[EG4Client] Re-select inverter failed (non-fatal): {e}")
 
-        batt = await self._api.get_inverter_battery_async()
-        runtime = await self._api.get_inverter_runtime_async()
+        batt, runtime = await self._fetch_battery_and_runtime()
         if _is_empty_response(batt) or _is_empty_response(runtime):
             self._last_error = "empty_response_relogin_pending"
             print(
@@ -448,58 +552,87 @@ class EG4Client:
         print("[EG4Client] Recovered — session re-established, data flowing")
         return (batt, runtime)
 
+    async def _fetch_battery_and_runtime(self):
+        """Fetch battery and runtime concurrently over the shared session.
+
+        Both requests are always awaited to completion; if either raised,
+        the battery error (else the runtime error) is re-raised, as the
+        sequential calls did.
+        """
+        batt, runtime = await asyncio.gather(
+            self._api.get_inverter_battery_async(),
+            self._api.get_inverter_runtime_async(),
+            return_exceptions=True,
+        )
+        for result in (batt, runtime):
+            if isinstance(result, BaseException):
+                raise result
+        return batt, runtime
+
+    def _units_snapshot(self, raw_units) -> list:
+        """Per-unit rows for the snapshot, reusing the previous list when
+        every unit reads the same as last poll.
+
+        Snapshots (and their units lists) are shared with history and with
+        get_latest() callers, so a changed reading always gets a new list;
+        reuse only happens when nothing moved, e.g. an idle pack overnight.
+        """
+        prev = self._prev_units
+        if prev is not None and len(prev) == len(raw_units) and all(
+            p["sn"] == _get(u, "batterySn") and p["soc"] == _get(u, "soc")
+            and p["voltage_mv"] == _get(u, "totalVoltage") and p["current_a"] == _get(u, "current")
+            for p, u in zip(prev, raw_units)
+        ):
+            return prev
+        units = [
+            {"sn": _get(u, "batterySn"), "soc": _get(u, "soc"),
+             "voltage_mv": _get(u, "totalVoltage"), "current_a": _get(u, "current")}
+            for u in raw_units
+        ]
+        self._prev_units = units
+        return units
+
     def _merge_response(self, batt, runtime) -> Dict[str, Any]:
         """Translate raw EG4 battery + runtime objects into the merged snapshot."""
-        b = _to_plain(batt)
-        r = _to_plain(runtime)
-
         # Derive PV/Load/Grid/Battery powers from runtime
-        pv_candidates = [_num(r.get(k)) for k in ("ppv1","ppv2","ppv3")]
-        pv_vals = [v for v in pv_candidates if v is not None]
-        pv_power_w = sum(pv_vals) if pv_vals else _num(r.get("ppv"))
+        n = {k: _num(_get(runtime, k)) for k in _RUNTIME_NUM_KEYS}
+        pv_vals = [v for v in (n["ppv1"], n["ppv2"], n["ppv3"]) if v is not None]
+        pv_power_w = sum(pv_vals) if pv_vals else n["ppv"]
 
         # EPS (backup) power fields pEpsL1N and pEpsL2N give load power
-        eps_l1 = _num(r.get("pEpsL1N")) or 0.0
-        eps_l2 = _num(r.get("pEpsL2N")) or 0.0
-        load_power_w = eps_l1 + eps_l2
+        load_power_w = (n["pEpsL1N"] or 0.0) + (n["pEpsL2N"] or 0.0)
 
         # Fallback to old fields if EPS fields not available
         if load_power_w == 0.0:
-            load_power_w = _num(r.get("pToUser"))
+            load_power_w = n["pToUser"]
             if load_power_w is None:
-                load_power_w = _num(r.get("consumptionPower"))
+                load_power_w = n["consumptionPower"]
 
-        grid_power_w = _num(r.get("pToGrid"))
-        ac_couple_w = _num(r.get("acCouplePower"))
+        grid_power_w = n["pToGrid"]
+        ac_couple_w = n["acCouplePower"]
 
-        p_chg  = _num(r.get("pCharge"))
-        p_dchg = _num(r.get("pDisCharge"))
+        p_chg  = n["pCharge"]
+        p_dchg = n["pDisCharge"]
         bat_net_w = (p_chg or 0.0) - (p_dchg or 0.0) if (p_chg is not None or p_dchg is not None) else None
 
         # Pack metrics
-        remain = b.get("remainCapacity")
-        full   = b.get("fullCapacity")
-        units  = b.get("battery_units") or []
+        remain = _get(batt, "remainCapacity")
+        full   = _get(batt, "fullCapacity")
+        units  = self._units_snapshot(_get(batt, "battery_units") or [])
 
         if isinstance(remain,(int,float)) and isinstance(full,(int,float)) and full>0:
             soc_pct = round((remain/full)*100, 1)
         else:
-            socs = [u.get("soc") for u in units if isinstance(u.get("soc"), (int,float))]
+            socs = [u["soc"] for u in units if isinstance(u["soc"], (int,float))]
             soc_pct = round(sum(socs)/len(socs), 1) if socs else None
 
-        pack_voltage = None
-        if "totalVoltageText" in b:
-            try: pack_voltage = float(b["totalVoltageText"])
-            except: pass
+        pack_voltage = _num(_get(batt, "totalVoltageText"))
         if pack_voltage is None and units:
             try:
-                pack_voltage = round(sum(u.get("totalVoltage",0) for u in units)/100.0, 1)  # mV→V rough
+                pack_voltage = round(sum(u["voltage_mv"] for u in units)/100.0, 1)  # mV→V rough
             except: pass
 
-        pack_current = None
-        if "currentText" in b:
-            try: pack_current = float(b["currentText"])
-            except: pass
+        pack_current = _num(_get(batt, "currentText"))
 
         return {
             "ts": datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds"),
@@ -511,18 +644,12 @@ class EG4Client:
             "grid_power_w": grid_power_w,
             "ac_couple_w": ac_couple_w,
             "battery_net_w": bat_net_w,
-            "units": [
-                {"sn": u.get("batterySn"), "soc": u.get("soc"),
-                 "voltage_mv": u.get("totalVoltage"), "current_a": u.get("current")}
-                for u in units
-            ]
+            "units": units,
         }
 
     async def _poll_once(self):
         assert self._api is not None
-        # Fetch battery & runtime via async endpoints
-        batt = await self._api.get_inverter_battery_async()
-        runtime = await self._api.get_inverter_runtime_async()
+        batt, runtime = await self._fetch_battery_and_runtime()
 
         # Path 1: structurally empty raw response (success=False / data=None /
         # falsy). Classic silent session expiry — handled by _attempt_recovery.
@@ -564,7 +691,7 @@ class EG4Client:
 
         with self._lock:
             self._latest = merged
-            self.history.append(merged)
+            self.history.append(_history_row(merged))
 
         # Terse one-line poll summary (replaces the prior verbose dumps)
         soc_pct = merged.get("soc_percent")
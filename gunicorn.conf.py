@@ -0,0 +1,34 @@
+"""Gunicorn settings for running the dashboard in production.
+
+    gunicorn app:app
+
+Exactly ONE worker process. Each process owns the miner/battery pollers
+and the AutoControl loop, so a second worker would mean two control loops
+sending power commands to the same miner. Concurrency comes from threads
+inside the single worker instead.
+
+The bind address comes from app.host / app.port in config.yaml (and
+config.local.yaml, PORT env), the same values `python3 app.py` uses.
+"""
+import os
+import sys
+
+# gunicorn reads this file before it imports app:app; make the repo
+# importable from here regardless of how gunicorn was launched.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config.settings import load_settings  # noqa: E402
+
+_app = load_settings().app
+bind = f"{_app.host}:{_app.port}"
+workers = 1
+worker_class = "gthread"
+threads = 8
+# test_communication and refresh_session can hold a request for ~30s.
+timeout = 60
+
+
+def post_worker_init(worker):
+    """Start the background services once the worker has imported app."""
+    from app import start_background_services
+    start_background_services()
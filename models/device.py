@@ -1,6 +1,6 @@
 """Device models for network discovery."""
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Optional
 
@@ -12,18 +12,23 @@ class DeviceType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class ConnectionStatus:
     """Connection status for a device."""
     connected: bool
-    last_seen: Optional[datetime] = None
+    last_seen: Optional[float] = None  # time.time() of the last good poll
     uptime_seconds: Optional[float] = None
     error: Optional[str] = None
 
+    def last_seen_iso(self) -> Optional[str]:
+        """last_seen as a UTC ISO 8601 string, or None if never seen."""
+        ts = self.last_seen
+        return datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts is not None else None
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Device:
-    """Network device information."""
+    """Network device information (immutable; use dataclasses.replace)."""
     ip: str
     hostname: Optional[str] = None
     device_type: DeviceType = DeviceType.UNKNOWN
@@ -1,20 +1,21 @@
 """Auto-control service with Away Mode for sophisticated SOC-based power management."""
 import time
 import threading
-from datetime import datetime, date, timezone
+from datetime import datetime, date, time as dtime, timezone
 from typing import Optional, Dict, Any
 from zoneinfo import ZoneInfo
 
 # Try to import astral for sunset calculations
 try:
     from astral import LocationInfo
-    from astral.sun import sun
+    from astral.sun import sunset
     ASTRAL_AVAILABLE = True
 except ImportError:
     ASTRAL_AVAILABLE = False
     print("[AutoControl] WARNING: astral library not available, using fixed sunset time")
 
-from utils.log_config import log
+from utils.error_throttle import ErrorThrottle
+from utils.log_config import is_enabled, log
 from utils.state_manager import StateManager
 from services.tier_promotion import TierPromotion
 
@@ -62,6 +63,9 @@ class AutoControlService:
         self.battery = battery_service
         self.state = state_manager
         self.base_watts = base_watts
+        # Watts for every tier the controller can target (deciles + promotions)
+        self._tier_watts = {pct: int(base_watts * (pct / 100.0))
+                            for pct in (0, 30, 40, 50, 60, 70, 80, 90, 100)}
         self.min_interval_sec = min_interval_sec
         self.mode = mode
         self.weather = weather_service
@@ -79,6 +83,7 @@ class AutoControlService:
         self.latitude = location_config.get("latitude", 40.0)
         self.longitude = location_config.get("longitude", -74.0)
         self.timezone_str = location_config.get("timezone", "America/New_York")
+        self._tz = ZoneInfo(self.timezone_str)
 
         # Sunset calculation setup
         if ASTRAL_AVAILABLE:
@@ -92,6 +97,18 @@ class AutoControlService:
         self.fallback_sunset_hour = kwargs.get("sunset_hour", 19)
         self.fallback_sunset_minute = kwargs.get("sunset_minute", 0)
 
+        # Bind the sunset calculation once instead of re-checking astral on
+        # every cache miss: (compute(day) -> aware datetime, log label).
+        tz = self._tz
+        if ASTRAL_AVAILABLE and self.location:
+            observer = self.location.observer
+            self._compute_sunset = lambda day: sunset(observer, date=day, tzinfo=tz)
+            self._sunset_label = "Today's sunset"
+        else:
+            fallback = dtime(self.fallback_sunset_hour, self.fallback_sunset_minute)
+            self._compute_sunset = lambda day: datetime.combine(day, fallback, tz)
+            self._sunset_label = "Using fallback sunset"
+
         # Load state
         saved_state = self.state.load()
         self.enabled = saved_state.get("autocontrol", False)
@@ -138,6 +155,8 @@ class AutoControlService:
         # Cache today's sunset
         self._cached_sunset_date: Optional[date] = None
         self._cached_sunset_time: Optional[datetime] = None
+        # (sunset datetime, its HH:MM:SS) swapped as one tuple; see _sunset_str.
+        self._sunset_str_cache = (None, None)
 
         # Grace period after any privileged command. Prevents autocontrol from
         # re-issuing power_on during the ~60-90s firmware chip recalibration that
@@ -155,6 +174,21 @@ class AutoControlService:
 
         self._running = False
         self._thread: Optional[threading.Thread] = None
+        # Set to cut the inter-tick wait short: stop() to exit promptly,
+        # enable()/disable()/set_mode() to re-evaluate right away.
+        self._wake = threading.Event()
+
+        # Per-tick chatter goes to the AUTOCONTROL log tag (read once per
+        # tick); stdout only gets a line when the decision itself changes.
+        self._trace = False
+        self._last_reported_decision = None
+
+        # Battery snapshot_revision seen at the start of the last tick; the
+        # next tick waits briefly for it to advance (see _wait_for_next_tick).
+        self._tick_revision = None
+
+        # Repeating loop errors print their traceback at most once an hour.
+        self._loop_errors = ErrorThrottle()
 
     def start(self):
         """Start auto-control thread."""
@@ -168,6 +202,7 @@ class AutoControlService:
     def stop(self):
         """Stop auto-control thread."""
         self._running = False
+        self._kick()
         if self._thread:
             self._thread.join(timeout=5)
         print("[AutoControl] Stopped")
@@ -178,12 +213,14 @@ class AutoControlService:
         self.state.save(autocontrol=True)
         self.last_set_ts = 0.0  # Allow immediate action
         self._last_sent_pct = None  # Re-sync tier on first tick
+        self._kick()
         print(f"[AutoControl] Enabled ({self.mode} mode)")
 
     def disable(self):
         """Disable auto-control."""
         self.enabled = False
         self.state.save(autocontrol=False)
+        self._kick()
         print("[AutoControl] Disabled")
 
     def set_mode(self, mode: str) -> bool:
@@ -205,6 +242,7 @@ class AutoControlService:
 
         self.mode = mode
         self.last_set_ts = 0.0  # Allow immediate re-evaluation
+        self._kick()
         print(f"[AutoControl] Mode changed to: {mode}")
         return True
 
@@ -234,54 +272,45 @@ class AutoControlService:
         if self._cached_sunset_date == today and self._cached_sunset_time:
             return self._cached_sunset_time
 
-        # Calculate new sunset
+        # Calculate new sunset (astral, sunset event only, or the fixed
+        # fallback time; chosen in __init__)
         try:
-            if ASTRAL_AVAILABLE and self.location:
-                # Use astral for accurate calculation
-                tz = ZoneInfo(self.timezone_str)
-                s = sun(self.location.observer, date=today, tzinfo=tz)
-                sunset_time = s['sunset']
-
-                # Cache the result
-                self._cached_sunset_date = today
-                self._cached_sunset_time = sunset_time
-
-                print(f"[AutoControl] Today's sunset: {sunset_time.strftime('%H:%M:%S')}")
-                return sunset_time
-            else:
-                # Use fallback fixed time
-                tz = ZoneInfo(self.timezone_str)
-                now = datetime.now(tz)
-                sunset_time = now.replace(
-                    hour=self.fallback_sunset_hour,
-                    minute=self.fallback_sunset_minute,
-                    second=0,
-                    microsecond=0
-                )
+            sunset_time = self._compute_sunset(today)
 
-                # Cache the result
-                self._cached_sunset_date = today
-                self._cached_sunset_time = sunset_time
+            # Cache the result
+            self._cached_sunset_date = today
+            self._cached_sunset_time = sunset_time
 
-                print(f"[AutoControl] Using fallback sunset: {sunset_time.strftime('%H:%M:%S')}")
-                return sunset_time
+            print(f"[AutoControl] {self._sunset_label}: {self._sunset_str(sunset_time)}")
+            return sunset_time
 
         except Exception as e:
             print(f"[AutoControl] Error calculating sunset: {e}")
             return None
 
-    def _is_past_sunset(self) -> bool:
-        """Check if current time is past today's sunset."""
+    def _sunset_str(self, sunset_time: Optional[datetime]) -> Optional[str]:
+        """HH:MM:SS for sunset_time, formatted once per distinct sunset."""
+        if sunset_time is None:
+            return None
+        src, text = self._sunset_str_cache
+        if src is not sunset_time:
+            text = sunset_time.strftime('%H:%M:%S')
+            self._sunset_str_cache = (sunset_time, text)
+        return text
+
+    def _sunset_context(self):
+        """Return (sunset_time, now, is_past_sunset) from one clock read.
+
+        sunset_time may be None (calculation failed), in which case
+        is_past_sunset is False.
+        """
         sunset = self._get_sunset_time()
-        if not sunset:
-            return False
+        now = datetime.now(self._tz)
+        return sunset, now, bool(sunset) and now > sunset
 
-        try:
-            tz = ZoneInfo(self.timezone_str)
-            now = datetime.now(tz)
-            return now > sunset
-        except Exception:
-            return False
+    def _is_past_sunset(self) -> bool:
+        """Check if current time is past today's sunset."""
+        return self._sunset_context()[2]
 
     def _control_loop(self):
         """Main control loop - evaluates conditions every min_interval_sec."""
@@ -289,21 +318,53 @@ class AutoControlService:
         while self._running:
             try:
                 if not self.enabled:
-                    time.sleep(self.min_interval_sec)
+                    self._wait_for_next_tick()
                     continue
 
+                self._tick_revision = self.battery.snapshot_revision
+
                 # Only Away Mode is implemented
                 if self.mode == "away":
                     self._away_mode_control()
+                    self._report_decision()
                 else:
                     print(f"[AutoControl] Mode '{self.mode}' not implemented")
 
             except Exception as e:
                 print(f"[AutoControl] Error in control loop: {e}")
-                import traceback
-                traceback.print_exc()
+                self._loop_errors.report(e)
+
+            self._wait_for_next_tick()
 
-            time.sleep(self.min_interval_sec)
+    def _report_decision(self):
+        """Print the outcome of a tick when it differs from the previous one."""
+        decision = (self.stop_reason, self.target_pct, self.current_state_description)
+        if decision == self._last_reported_decision:
+            return
+        self._last_reported_decision = decision
+        print(f"[AutoControl] {self.current_state_description} "
+              f"(target={self.target_pct}%, stop_reason={self.stop_reason})")
+
+    def _kick(self):
+        """Wake the control loop for an immediate tick."""
+        self._wake.set()
+        self.battery.notify_snapshot_waiters()
+
+    def _wait_for_next_tick(self):
+        """Sleep min_interval_sec, returning early when _wake is set.
+
+        If the interval runs out before the battery has published a new
+        snapshot since the last tick, wait up to one battery poll for it so
+        the tick sees fresh telemetry. The extra wait is bounded, so a
+        stalled battery API still reaches the stale gate.
+        """
+        if self._wake.wait(self.min_interval_sec):
+            self._wake.clear()
+            return
+        if self.enabled and self._running:
+            bound = min(self.min_interval_sec, max(1, int(self.battery.poll_seconds)))
+            self.battery.wait_for_snapshot(self._tick_revision, bound)
+            self._wake.clear()
 
     def _away_mode_control(self):
         """
@@ -316,6 +377,8 @@ class AutoControlService:
         4. Normal discharge tiers (SOC → power%)
         """
 
+        self._trace = __debug__ and is_enabled("AUTOCONTROL")
+
         # SAFETY GATE: If battery telemetry is stale, stop the miner and do nothing else.
         if not self.battery.is_fresh():
             age = self.battery.get_battery_age_seconds()
@@ -357,18 +420,15 @@ class AutoControlService:
             return
 
         # Get sunset info
-        sunset_time = self._get_sunset_time()
-        is_past_sunset = self._is_past_sunset()
+        sunset_time, now, is_past_sunset = self._sunset_context()
 
         # Log decision context
-        print(f"\n{'='*60}")
-        print(f"[AutoControl] === AWAY MODE DECISION ===")
-        if sunset_time:
-            print(f"[AutoControl] Sunset today: {sunset_time.strftime('%H:%M:%S')}")
-        tz = ZoneInfo(self.timezone_str)
-        now = datetime.now(tz)
-        print(f"[AutoControl] Current time: {now.strftime('%H:%M:%S')} ({'after' if is_past_sunset else 'before'} sunset)")
-        print(f"[AutoControl] Current state: SOC={soc:.1f}%, PV={pv_power:.0f}W, Miner={'OFF' if is_miner_off else 'ON'}")
+        if self._trace:
+            sunset_s = self._sunset_str(sunset_time) or "unknown"
+            log("AUTOCONTROL",
+                f"decision: sunset={sunset_s} now={now.strftime('%H:%M:%S')} "
+                f"({'after' if is_past_sunset else 'before'} sunset) "
+                f"SOC={soc:.1f}% PV={pv_power:.0f}W miner={'OFF' if is_miner_off else 'ON'}")
 
         # PRIORITY 1: Emergency Shutdown (trips the emergency latch)
         if soc < self.emergency_soc:
@@ -390,23 +450,23 @@ class AutoControlService:
             # Calculate appropriate power tier based on current SOC
             tier_pct = self._calculate_soc_tier(soc)
             self.target_pct = tier_pct
-            self.target_w = int(self.base_watts * (tier_pct / 100.0))
+            self.target_w = self._pct_to_watts(tier_pct)
             self.current_state_description = f"After sunset startup at {tier_pct}%"
             self.stop_reason = "normal"
             self.resume_at_soc = None
 
-            print(f"[AutoControl] Condition met: After sunset startup")
-            print(f"[AutoControl] Time is after sunset AND SOC > {self.after_sunset_min_soc}% AND miner is off")
-            print(f"[AutoControl] Target power: {tier_pct}% ({self.target_w}W) based on SOC tier")
+            if self._trace:
+                log("AUTOCONTROL",
+                    f"after sunset startup: SOC > {self.after_sunset_min_soc}% and miner off, "
+                    f"target {tier_pct}% ({self.target_w}W)")
 
             # One privileged op per tick when miner is off — the firmware
             # locks the privileged session for ~180s per get_token, so
             # power_on + set_power_pct on the same tick would self-contend.
             if self._in_post_cmd_grace_period():
-                elapsed = int(time.time() - self.last_set_ts)
-                print(f"[AutoControl] Post-command grace period ({elapsed}s of {self._post_cmd_grace_sec}s) — miner may be recalibrating, skipping power_on")
-                print(f"[AutoControl] Next evaluation in {self.min_interval_sec}s")
-                print(f"{'='*60}\n")
+                if self._trace:
+                    elapsed = int(time.time() - self.last_set_ts)
+                    log("AUTOCONTROL", f"post-command grace ({elapsed}s of {self._post_cmd_grace_sec}s), skipping power_on")
                 return
             print(f"[AutoControl] Powering on miner (deferring power adjust to next tick)...")
             self._last_sent_pct = None  # Force tier sync after power-on
@@ -414,30 +474,26 @@ class AutoControlService:
             self.last_set_ts = time.time()
             self.state.save(miner_power_state="running")
             time.sleep(2)  # Brief delay
-            print(f"[AutoControl] Next evaluation in {self.min_interval_sec}s")
-            print(f"{'='*60}\n")
             return
 
         # PRIORITY 4: Normal Discharge Tiers (decile table)
         tier_pct = self._calculate_soc_tier(soc)
         self.target_pct = tier_pct
-        self.target_w = int(self.base_watts * (tier_pct / 100.0))
+        self.target_w = self._pct_to_watts(tier_pct)
         self.current_state_description = f"Normal discharge at {tier_pct}%"
         self.stop_reason = "normal"
         self.resume_at_soc = None
 
-        print(f"[AutoControl] Condition met: Normal discharge")
-        print(f"[AutoControl] SOC tier: {tier_pct}% for SOC={soc:.1f}%")
-        print(f"[AutoControl] Target power: {tier_pct}% ({self.target_w}W)")
+        if self._trace:
+            log("AUTOCONTROL", f"normal discharge: SOC={soc:.1f}% -> tier {tier_pct}% ({self.target_w}W)")
 
         # Ensure miner is on if target > 0. If we have to power it on, do ONLY that
         # this tick — firmware lock contention (see PRIORITY 3 comment above).
         if tier_pct > 0 and is_miner_off:
             if self._in_post_cmd_grace_period():
-                elapsed = int(time.time() - self.last_set_ts)
-                print(f"[AutoControl] Post-command grace period ({elapsed}s of {self._post_cmd_grace_sec}s) — miner may be recalibrating, skipping power_on")
-                print(f"[AutoControl] Next evaluation in {self.min_interval_sec}s")
-                print(f"{'='*60}\n")
+                if self._trace:
+                    elapsed = int(time.time() - self.last_set_ts)
+                    log("AUTOCONTROL", f"post-command grace ({elapsed}s of {self._post_cmd_grace_sec}s), skipping power_on")
                 return
             print(f"[AutoControl] Powering on miner (deferring power adjust to next tick)...")
             self._last_sent_pct = None  # Force tier sync after power-on
@@ -445,13 +501,9 @@ class AutoControlService:
             self.last_set_ts = time.time()
             self.state.save(miner_power_state="running")
             time.sleep(2)
-            print(f"[AutoControl] Next evaluation in {self.min_interval_sec}s")
-            print(f"{'='*60}\n")
             return
 
         self._set_power_with_rate_limit(tier_pct)
-        print(f"[AutoControl] Next evaluation in {self.min_interval_sec}s")
-        print(f"{'='*60}\n")
 
     # ---- Emergency helpers ----
 
@@ -490,8 +542,6 @@ class AutoControlService:
         else:
             self.stop_reason = "emergency_unverified"
 
-        print(f"[AutoControl] Next evaluation in {self.min_interval_sec}s")
-        print(f"{'='*60}\n")
 
     def _run_emergency_latch_tick(self, soc: float):
         """One tick while emergency latch is active: re-check miner, re-stop if needed."""
@@ -629,11 +679,7 @@ class AutoControlService:
         sunset_dt = forecast.get("sunset_dt")
         cloud_remaining = forecast.get("cloud_cover_remaining_daylight_pct")
         fresh = bool(forecast.get("is_fresh"))
-        now_local = None
-        try:
-            now_local = datetime.now(ZoneInfo(self.timezone_str))
-        except Exception:
-            now_local = None
+        now_local = datetime.now(self._tz)
 
         prev_tier = self.tier_promotion.tier
         result = self.tier_promotion.evaluate(
@@ -674,24 +720,20 @@ class AutoControlService:
         """
         target_pct = tier_eval.target_pct  # 90 or 100
         self.target_pct = target_pct
-        self.target_w = int(self.base_watts * (target_pct / 100.0))
+        self.target_w = self._pct_to_watts(target_pct)
         self.current_state_description = tier_eval.description
         self.latched_floor_w = None
         self.stop_reason = "normal"
         self.resume_at_soc = None
 
-        print(f"[AutoControl] Condition met: Tier promotion ({tier_eval.description})")
-        print(f"[AutoControl] Target power: {target_pct}% ({self.target_w}W)")
+        if self._trace:
+            log("AUTOCONTROL", f"tier promotion ({tier_eval.description}): target {target_pct}% ({self.target_w}W)")
 
         if is_miner_off:
             if self._in_post_cmd_grace_period():
-                elapsed = int(time.time() - self.last_set_ts)
-                print(
-                    f"[AutoControl] Post-command grace period ({elapsed}s of "
-                    f"{self._post_cmd_grace_sec}s) — skipping power_on"
-                )
-                print(f"[AutoControl] Next evaluation in {self.min_interval_sec}s")
-                print(f"{'='*60}\n")
+                if self._trace:
+                    elapsed = int(time.time() - self.last_set_ts)
+                    log("AUTOCONTROL", f"post-command grace ({elapsed}s of {self._post_cmd_grace_sec}s), skipping power_on")
                 return
             print(f"[AutoControl] Powering on miner (deferring power adjust to next tick)...")
             self._last_sent_pct = None
@@ -699,20 +741,14 @@ class AutoControlService:
             self.last_set_ts = time.time()
             self.state.save(miner_power_state="running")
             time.sleep(2)
-            print(f"[AutoControl] Next evaluation in {self.min_interval_sec}s")
-            print(f"{'='*60}\n")
             return
 
         # Miner is already on. Only push a fresh power command when the tier
         # changed this tick — TierPromotion already enforces one-shot semantics.
         if tier_eval.tier_changed:
             self._set_power_with_rate_limit(target_pct)
-        else:
-            print(
-                f"[AutoControl] Tier unchanged at {target_pct}% — no power command needed"
-            )
-        print(f"[AutoControl] Next evaluation in {self.min_interval_sec}s")
-        print(f"{'='*60}\n")
+        elif self._trace:
+            log("AUTOCONTROL", f"tier unchanged at {target_pct}%, no power command needed")
 
     def _emergency_stop_with_verify(self) -> bool:
         """Send emergency_power_off and verify via re-poll. Up to 5 attempts.
@@ -793,20 +829,15 @@ class AutoControlService:
         Returns:
             Power percentage (0-100)
         """
-        if soc >= 80:
-            return 80
-        elif soc >= 70:
-            return 70
-        elif soc >= 60:
-            return 60
-        elif soc >= 50:
-            return 50
-        elif soc >= 40:
-            return 40
-        elif soc >= 30:
-            return 30
-        else:
+        # Deciles 30..80 floor to their tier; "not >=" also sends NaN to 0.
+        if not soc >= 30:
             return 0
+        return min(80, int(soc) // 10 * 10)
+
+    def _pct_to_watts(self, pct: int) -> int:
+        """Watts for a power percentage, from the precomputed tier table."""
+        watts = self._tier_watts.get(pct)
+        return watts if watts is not None else int(self.base_watts * (pct / 100.0))
 
     def _in_post_cmd_grace_period(self) -> bool:
         """True within _post_cmd_grace_sec of the last queued privileged command.
@@ -826,14 +857,16 @@ class AutoControlService:
         # Skip if tier hasn't changed — adjust_power_limit always causes a full
         # firmware recalibration, even when the value is identical to what's running.
         if self._last_sent_pct is not None and target_pct == self._last_sent_pct:
-            print(f"[AutoControl] Tier unchanged at {target_pct}% — no power command needed")
+            if self._trace:
+                log("AUTOCONTROL", f"tier unchanged at {target_pct}%, no power command needed")
             return
 
         wall_now = time.time()
 
         # Check rate limit
         if (wall_now - self.last_set_ts) < self.min_interval_sec:
-            print(f"[AutoControl] Rate limited - last adjustment {int(wall_now - self.last_set_ts)}s ago")
+            if self._trace:
+                log("AUTOCONTROL", f"rate limited, last adjustment {int(wall_now - self.last_set_ts)}s ago")
             return
 
         print(f"[AutoControl] Sending power command: {target_pct}% (was {self._last_sent_pct}%)...")
@@ -843,7 +876,7 @@ class AutoControlService:
 
         try:
             self.miner.set_power_pct(target_pct, on_verified=_on_verified)
-            self.last_set_w = int(self.base_watts * (target_pct / 100.0))
+            self.last_set_w = self._pct_to_watts(target_pct)
             self.last_set_ts = wall_now
             self._last_sent_pct = target_pct
             self.state.save(target_power_pct=target_pct)
@@ -862,7 +895,7 @@ class AutoControlService:
 
     def get_state(self) -> Dict[str, Any]:
         """Get current auto-control state for debugging and display."""
-        sunset_time = self._get_sunset_time()
+        sunset_time, _, is_past_sunset = self._sunset_context()
 
         # Derive the effective stop_reason for the dashboard.
         # When autocontrol is disabled, the miner state is purely manual.
@@ -920,8 +953,8 @@ class AutoControlService:
             "latched_floor_w": self.latched_floor_w,
             "min_interval_sec": self.min_interval_sec,
             "current_state_description": self.current_state_description,
-            "sunset_time": sunset_time.strftime('%H:%M:%S') if sunset_time else "Unknown",
-            "is_past_sunset": self._is_past_sunset(),
+            "sunset_time": self._sunset_str(sunset_time) or "Unknown",
+            "is_past_sunset": is_past_sunset,
             "emergency_soc": self.emergency_soc,
             "battery_fresh": self.battery.is_fresh(),
             "battery_age_seconds": self.battery.get_battery_age_seconds(),
@@ -9,6 +9,8 @@ from typing import Optional
 
 from eg4_client import EG4Client
 from models.device import ConnectionStatus
+from utils.error_throttle import ErrorThrottle
+from utils.log_config import is_enabled, log
 
 # If the most recent snapshot is older than this, battery telemetry is stale.
 # Autocontrol must stop the miner when stale.
@@ -31,6 +33,16 @@ CSV_FIELDNAMES = [
     "units",
 ]
 
+# Live history keeps only what /api/chart-data reads, one tuple per sample
+# (converted back to dicts in get_history()).
+_HISTORY_FIELDS = ("ts", "soc_percent", "pv_power_w", "load_power_w", "battery_net_w")
+
+# Default live history window; older points are served from the CSV log.
+HISTORY_WINDOW_SEC = 24 * 3600
+
+# Default spacing of live history rows; polls in between only update latest.
+HISTORY_SAMPLE_SEC = 60
+
 
 class BatteryService:
     """
@@ -49,7 +61,9 @@ class BatteryService:
                  poll_seconds: int,
                  log_interval_sec: int = 600,
                  log_file: str = None,
-                 session_refresh_hours: int = 168):  # 1 week default
+                 session_refresh_hours: int = 168,  # 1 week default
+                 max_history: Optional[int] = None,
+                 history_sample_sec: int = HISTORY_SAMPLE_SEC):
         """
         Initialize battery service.
 
@@ -61,6 +75,8 @@ class BatteryService:
             log_interval_sec: Seconds between CSV logs
             log_file: Path to CSV log file
             session_refresh_hours: Hours between forced session refreshes
+            max_history: Live history rows kept (default: 24h of samples)
+            history_sample_sec: Seconds between live history rows
         """
         self.username = username
         self.password = password
@@ -73,13 +89,34 @@ class BatteryService:
 
         self.client: Optional[EG4Client] = None
         self.latest = {}
-        self.history: deque = deque()
+        # Every Nth accepted snapshot goes into history (the first always does).
+        self._history_every = max(1, history_sample_sec // max(1, poll_seconds))
+        self._snapshots_accepted = 0
+        if max_history is None:
+            max_history = max(1, HISTORY_WINDOW_SEC // (max(1, poll_seconds) * self._history_every))
+        self.history: deque = deque(maxlen=max_history)
+        # Bumped on every history append; lets HTTP handlers detect new data
+        # without comparing rows.
+        self.history_revision = 0
+        # Bumped on every accepted snapshot and notified through _snap_cv;
+        # AutoControl waits on it to line its ticks up with fresh telemetry.
+        self.snapshot_revision = 0
+        self._snap_cv = threading.Condition()
 
         self._running = False
         self._thread: Optional[threading.Thread] = None
+        # Set by stop() so the poll wait and refresh_session's settle wait
+        # return immediately instead of sleeping out their full interval.
+        self._stop_evt = threading.Event()
+        # Repeating loop errors print their traceback at most once an hour.
+        self._loop_errors = ErrorThrottle()
         self._last_auth_time = 0.0
         self._last_log_ts = 0.0  # Start at 0 so first data point logs immediately
 
+        # CSV log handle and writer, opened on first write and kept until stop().
+        self._csv_fh = None
+        self._csv_writer: Optional[csv.DictWriter] = None
+
         # Freshness tracking — only advance when the EG4Client snapshot ts changes.
         # Starts as None so is_fresh() returns False until first real poll succeeds.
         self._last_snap_ts_str: Optional[str] = None
@@ -111,6 +148,7 @@ class BatteryService:
 
         print("[BatteryService] Starting...")
         self._running = True
+        self._stop_evt.clear()
         self._start_time = time.time()
 
         # Create and start EG4 client
@@ -132,10 +170,12 @@ class BatteryService:
     def stop(self):
         """Stop battery service."""
         self._running = False
+        self._stop_evt.set()
         if self.client:
             self.client.stop()
         if self._thread:
             self._thread.join(timeout=5)
+        self._close_csv()
         print("[BatteryService] Stopped")
 
     def _session_manager_loop(self):
@@ -145,10 +185,10 @@ class BatteryService:
         while self._running:
             try:
                 # Get latest data
-                print("[BatteryService] Getting latest battery data...")
+                trace = __debug__ and is_enabled("BATTERY_POLL")
                 snap = self.client.get_latest()
-                print(f"[BatteryService] RAW RESPONSE: {snap}")
-                print(f"[BatteryService] Available keys: {list(snap.keys()) if snap else 'None'}")
+                if trace:
+                    log("BATTERY_POLL", f"raw snapshot: {snap}")
 
                 if snap and snap.get("soc_percent") is not None:
                     now = time.time()
@@ -166,31 +206,30 @@ class BatteryService:
                             print("[BatteryService] ✓ Connected to battery API")
 
                         self.connection_status.connected = True
-                        self.connection_status.last_seen = datetime.now(timezone.utc)
+                        self.connection_status.last_seen = now
                         if self._first_connect_time:
                             self.connection_status.uptime_seconds = now - self._first_connect_time
                         self.connection_status.error = None
 
-                        self.latest = snap
-                        self.history.append(snap)
+                        self._accept_snapshot(snap)
                     elif snap_ts == self._last_snap_ts_str:
-                        print(f"[BatteryService] Snapshot ts unchanged ({snap_ts}) — EG4Client not advancing, skipping update")
+                        if __debug__:
+                            log("BATTERY_FRESHNESS", f"snapshot ts unchanged ({snap_ts}), EG4Client not advancing, skipping update")
                     else:
                         # snap has no ts — accept it but do not update freshness tracking
                         self.connection_status.connected = True
-                        self.connection_status.last_seen = datetime.now(timezone.utc)
-                        self.latest = snap
-                        self.history.append(snap)
+                        self.connection_status.last_seen = now
+                        self._accept_snapshot(snap)
 
                     # CSV logging check (log first data immediately, then every log_interval_sec)
                     if (now - self._last_log_ts) >= self.log_interval_sec:
                         self._log_to_csv(snap)
                         self._last_log_ts = now
 
-                    soc = snap.get("soc_percent")
-                    pv = snap.get("pv_power_w")
-                    load = snap.get("load_power_w")
-                    print(f"[BatteryService] Poll successful: SOC={soc}%, PV={pv}W, Load={load}W")
+                    if trace:
+                        log("BATTERY_POLL",
+                            f"poll ok: SOC={snap.get('soc_percent')}%, "
+                            f"PV={snap.get('pv_power_w')}W, Load={snap.get('load_power_w')}W")
 
                     # Check if session needs refresh
                     session_age = now - self._last_auth_time
@@ -223,20 +262,33 @@ class BatteryService:
                 print(f"[BatteryService] Session manager error: {e}")
                 self.connection_status.connected = False
                 self.connection_status.error = str(e)
-                import traceback
-                traceback.print_exc()
+                self._loop_errors.report(e)
 
-            time.sleep(self.poll_seconds)
+            self._stop_evt.wait(self.poll_seconds)
 
     def refresh_session(self) -> bool:
         """
-        Force session refresh by restarting the client.
+        Force session refresh.
+
+        Re-logs in on the running client first; only if that raises or
+        yields no data is the client stopped and recreated.
 
         Returns:
             True if refresh successful, False otherwise
         """
+        if self.client:
+            try:
+                print("[BatteryService] Refreshing session...")
+                if self.client.reauth():
+                    self._last_auth_time = time.time()
+                    print("[BatteryService] Session refresh successful")
+                    return True
+                print("[BatteryService] Re-login returned no data, restarting client")
+            except Exception as e:
+                print(f"[BatteryService] Re-login failed ({e}), restarting client")
+
         try:
-            print("[BatteryService] Refreshing session...")
+            print("[BatteryService] Restarting battery client...")
 
             # Stop old client
             if self.client:
@@ -253,7 +305,7 @@ class BatteryService:
             self._last_auth_time = time.time()
 
             # Wait a bit for first poll
-            time.sleep(5)
+            self._stop_evt.wait(5)
 
             # Check if it worked
             snap = self.client.get_latest()
@@ -268,6 +320,33 @@ class BatteryService:
             print(f"[BatteryService] Session refresh error: {e}")
             return False
 
+    def _accept_snapshot(self, snap: dict):
+        """Publish a new snapshot; sample it into history every Nth time."""
+        self.latest = snap
+        if self._snapshots_accepted % self._history_every == 0:
+            self.history.append(tuple(map(snap.get, _HISTORY_FIELDS)))
+            self.history_revision += 1
+        self._snapshots_accepted += 1
+        with self._snap_cv:
+            self.snapshot_revision += 1
+            self._snap_cv.notify_all()
+
+    def wait_for_snapshot(self, since_revision, timeout: float) -> bool:
+        """Block until snapshot_revision differs from `since_revision`.
+
+        Returns True once it has, False on timeout or when woken by
+        notify_snapshot_waiters().
+        """
+        with self._snap_cv:
+            if self.snapshot_revision == since_revision:
+                self._snap_cv.wait(timeout)
+            return self.snapshot_revision != since_revision
+
+    def notify_snapshot_waiters(self):
+        """Release wait_for_snapshot() callers without new data."""
+        with self._snap_cv:
+            self._snap_cv.notify_all()
+
     def is_fresh(self) -> bool:
         """Return True only if the most recent snapshot is within FRESHNESS_WINDOW_SEC of now.
 
@@ -293,18 +372,23 @@ class BatteryService:
         return (datetime.now(timezone.utc) - self._last_snap_datetime).total_seconds()
 
     def get_status(self) -> dict:
-        """Get current battery status."""
-        return self.latest.copy() if self.latest else {}
+        """Get current battery status.
+
+        Returns the latest snapshot itself, not a copy. The poll loop only
+        ever replaces `self.latest`, never mutates it, so callers must treat
+        the result as read-only.
+        """
+        return self.latest or {}
 
     def get_history(self) -> list:
-        """Get history."""
-        return list(self.history)
+        """Get live history as dicts keyed by _HISTORY_FIELDS, oldest first."""
+        return [dict(zip(_HISTORY_FIELDS, row)) for row in list(self.history)]
 
     def get_connection_status(self) -> dict:
         """Get connection status."""
         return {
             "connected": self.connection_status.connected,
-            "last_seen": self.connection_status.last_seen.isoformat() if self.connection_status.last_seen else None,
+            "last_seen": self.connection_status.last_seen_iso(),
             "uptime_seconds": self.connection_status.uptime_seconds,
             "error": self.connection_status.error,
             "session_age_hours": (time.time() - self._last_auth_time) / 3600 if self._last_auth_time else None,
@@ -320,6 +404,8 @@ class BatteryService:
         Otherwise, atomically rename the legacy file to a timestamped archive
         path beside it and let the next write create a fresh file.
         """
+        # A handle left open would keep writing into the archived file.
+        self._close_csv()
         if not os.path.exists(self.log_file) or os.path.getsize(self.log_file) == 0:
             print("[BatteryService] CSV schema check: no existing file, will create on first write.")
             return
@@ -347,22 +433,33 @@ class BatteryService:
             f"archived to {archive_path}. Starting fresh log with canonical schema."
         )
 
+    def _open_csv(self) -> csv.DictWriter:
+        """Open the CSV log for appending, writing the header if it is new."""
+        os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
+        # Line-buffered: each row reaches the file as soon as it is written,
+        # so the chart/PV readers never see a partial line.
+        fh = open(self.log_file, "a", newline="", buffering=1)
+        writer = csv.DictWriter(fh, fieldnames=CSV_FIELDNAMES, extrasaction="ignore")
+        if fh.tell() == 0:
+            writer.writeheader()
+        self._csv_fh, self._csv_writer = fh, writer
+        return writer
+
+    def _close_csv(self):
+        fh, self._csv_fh, self._csv_writer = self._csv_fh, None, None
+        if fh is not None:
+            try:
+                fh.close()
+            except OSError:
+                pass
+
     def _log_to_csv(self, row: dict):
         """Append row to CSV log file using the pinned canonical schema."""
         try:
-            os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
-            file_exists = os.path.exists(self.log_file)
-
-            with open(self.log_file, "a", newline="") as f:
-                writer = csv.DictWriter(
-                    f,
-                    fieldnames=CSV_FIELDNAMES,
-                    extrasaction="ignore",
-                )
-                if not file_exists:
-                    writer.writeheader()
-                writer.writerow(row)
-
+            writer = self._csv_writer or self._open_csv()
+            writer.writerow(row)
             print(f"[BatteryService] Logged to CSV: {row.get('ts', 'no timestamp')}")
         except Exception as e:
+            # Reopen on the next write (disk full, file removed, ...).
+            self._close_csv()
             print(f"[BatteryService] CSV logging error: {e}")
@@ -1,9 +1,143 @@
 """Data loading service with proper 3-day default and lazy loading."""
 import csv
+import io
+import mmap
 import os
 from collections import deque
 from datetime import datetime, timedelta, timezone
-from typing import Deque, Optional
+from functools import lru_cache
+from typing import Deque, Iterator, Optional
+
+from utils.iso_time import parse_iso
+from utils.log_config import is_enabled, log
+
+# Read buffer for CSV preloads. The logs grow to tens of MB over a month; a
+# 1 MiB raw buffer keeps the io stack from issuing thousands of 8 KiB reads.
+_READ_BUFFER_BYTES = 1 << 20
+
+# Logs are appended in time order, so for large files the loader
+# binary-searches the byte offset of the cutoff and parses only the tail.
+# Smaller files are scanned from the top.
+_SEEK_MIN_BYTES = 1 << 20
+# Stop bisecting once the window is this small; the rest is scanned.
+_SEEK_RESOLUTION_BYTES = 64 << 10
+# The seek target errs early by this much so naive/local-offset
+# timestamps and slightly out-of-order rows near the cutoff still load.
+_SEEK_MARGIN = timedelta(days=1)
+
+
+def _ts_columns(header: list) -> tuple[int, int, int]:
+    """Positions of the "ts", "date" and "time" columns (-1 if absent).
+
+    A repeated name resolves to its last column, as it would in a dict row.
+    """
+    pos = {name: i for i, name in enumerate(header)}
+    return pos.get("ts", -1), pos.get("date", -1), pos.get("time", -1)
+
+
+def _extract_ts(fields: list, cols: tuple[int, int, int]) -> Optional[str]:
+    """Timestamp string of a CSV record in any of the three log layouts:
+    1. "ts" field (battery CSV)
+    2. separate "date" and "time" fields (old miner CSV)
+    3. "date" column holding a full ISO timestamp (new miner CSV)
+    """
+    ts_i, date_i, time_i = cols
+    n = len(fields)
+    if 0 <= ts_i < n and fields[ts_i]:
+        return fields[ts_i]
+    date_val = fields[date_i] if 0 <= date_i < n else None
+    time_val = fields[time_i] if 0 <= time_i < n else None
+    if date_val and time_val:
+        if "T" in date_val or ":" in date_val:
+            return date_val
+        return f"{date_val}T{time_val}"
+    return None
+
+
+def _cutoff_prefix(cutoff: datetime, ts_str: str, cache: dict) -> Optional[str]:
+    """The cutoff rendered as "YYYY-MM-DDTHH:MM:SS" in `ts_str`'s own UTC
+    offset, or None when `ts_str` is not an ISO timestamp with an offset.
+
+    Within one offset, ISO strings order the same as the instants they
+    name, so a row whose first 19 characters sort below this prefix is
+    older than the cutoff. The writers stamp local time with .astimezone(),
+    so a file holds one or two offsets (DST); `cache` keeps one prefix per
+    offset suffix.
+    """
+    if len(ts_str) < 20 or ts_str[10] != "T":
+        return None
+    suffix = "Z" if ts_str[-1] == "Z" else ts_str[-6:]
+    prefix = cache.get(suffix)
+    if prefix is not None:
+        return prefix
+    if suffix == "Z":
+        tz = timezone.utc
+    elif (suffix[0] in "+-" and suffix[3] == ":"
+          and suffix[1:3].isdigit() and suffix[4:].isdigit()):
+        offset = timedelta(hours=int(suffix[1:3]), minutes=int(suffix[4:]))
+        tz = timezone(-offset if suffix[0] == "-" else offset)
+    else:
+        return None  # naive (possibly fractional) timestamp
+    prefix = cache[suffix] = cutoff.astimezone(tz).strftime("%Y-%m-%dT%H:%M:%S")
+    return prefix
+
+
+def _row_dict(header: list, fields: list) -> dict:
+    """Build the row dict csv.DictReader would: short records are padded
+    with None, surplus fields are listed under the None key."""
+    row = dict(zip(header, fields))
+    extra = len(fields) - len(header)
+    if extra > 0:
+        row[None] = fields[len(header):]
+    elif extra < 0:
+        for name in header[len(fields):]:
+            row[name] = None
+    return row
+
+
+# Every chart request reloads the same CSV rows, so parsed timestamps are
+# memoized across loads. Bounded like chart_data.normalize_timestamp.
+@lru_cache(maxsize=100_000)
+def _parse_ts(ts_str: str) -> datetime:
+    """Parse an ISO timestamp (memoized); naive values are taken as UTC."""
+    dt = parse_iso(ts_str)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _line_ts(line: bytes, header: list) -> Optional[datetime]:
+    """Timestamp of one raw CSV line, or None if it cannot be read."""
+    try:
+        fields = next(csv.reader([line.decode("utf-8", "replace")]))
+        ts_str = _extract_ts(fields, _ts_columns(header))
+        return _parse_ts(ts_str) if ts_str else None
+    except (StopIteration, ValueError, csv.Error):
+        return None
+
+
+def _seek_offset(mm, start: int, header: list, target: datetime) -> int:
+    """Byte offset of a line start at or before the first row >= target.
+
+    Bisects [start, len(mm)) on line timestamps. A probe that cannot be
+    parsed counts as "not older", which only moves the result earlier.
+    """
+    lo, hi = start, len(mm)
+    while hi - lo > _SEEK_RESOLUTION_BYTES:
+        mid = (lo + hi) // 2
+        nl = mm.find(b"\n", mid)
+        if nl < 0 or nl + 1 >= hi:
+            hi = mid
+            continue
+        line_start = nl + 1
+        line_end = mm.find(b"\n", line_start)
+        line = mm[line_start:line_end if line_end >= 0 else len(mm)]
+        dt = _line_ts(line, header)
+        if dt is not None and dt < target:
+            lo = line_start
+        else:
+            hi = mid
+    return lo
 
 
 class DataLoader:
@@ -23,6 +157,9 @@ class DataLoader:
         self.max_days = max_days
         self.miner_loaded_days = 0
         self.battery_loaded_days = 0
+        # Per-file counters from the most recent load pass, so status
+        # endpoints can report them without re-scanning the CSV.
+        self._load_counts: dict[str, dict] = {}
 
         self.miner_log_file = os.path.join(log_dir, "wm_status_log.csv")
         self.battery_log_file = os.path.join(log_dir, "eg4_battery_log.csv")
@@ -118,104 +255,142 @@ class DataLoader:
         Returns:
             List of rows as dicts
         """
+        stats: dict = {}
+        loaded_rows = list(self._iter_csv_by_days(file_path, days, stats))
+        if "cutoff" not in stats or stats.get("error"):
+            return []
+        cutoff = stats["cutoff"]
+        skipped = stats["skipped"]
+
+        # One line per load; the chart and history endpoints reload on every
+        # request, so the detail goes to the DATA_LOADER tag.
+        bad = stats["unparseable_ts"]
+        print(f"[DataLoader] {os.path.basename(file_path)}: loaded {len(loaded_rows)} rows "
+              f"since {cutoff.date()} ({days}d), skipped {skipped}"
+              + (f", {bad} with bad timestamps" if bad else "")
+              + (f"; seeked past {stats['seek_bytes']} bytes" if stats["seek_bytes"] else ""))
+        if not loaded_rows:
+            print(f"[DataLoader] ⚠️  NO DATA LOADED! All CSV data is older than {cutoff.date()}")
+
+        if __debug__ and is_enabled("DATA_LOADER"):
+            log("DATA_LOADER", f"{file_path}: scanned {len(loaded_rows) + skipped} rows")
+            if loaded_rows:
+                log("DATA_LOADER", f"date range: {loaded_rows[0].get('ts')} to {loaded_rows[-1].get('ts')}")
+                for i, row in enumerate(loaded_rows[:3]):
+                    keys = list(row.keys())[:5]
+                    log("DATA_LOADER", f"row {i+1}: {', '.join(f'{k}={row.get(k)}' for k in keys)}")
+
+        return loaded_rows
+
+    def _iter_csv_by_days(self, file_path: str, days: int, stats: dict) -> Iterator[dict]:
+        """Yield the rows of a CSV log that fall within the last N days.
+
+        Fills `stats` (cutoff, skipped, unparseable_ts, seek_bytes, error)
+        and the per-file get_stats() counters once the file is exhausted.
+        A read error ends the stream with stats["error"] set.
+        """
         if not os.path.exists(file_path):
             print(f"[DataLoader] File not found: {file_path}")
-            return []
+            return
 
         # Calculate cutoff timestamp
         now = datetime.now(timezone.utc)
         cutoff = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days)
-        print(f"[DataLoader] Loading data from {file_path}, cutoff date: {cutoff.isoformat()}, current time: {now.isoformat()}")
 
-        loaded_rows = []
+        # Rows older than the cutoff are dropped on a string compare against
+        # the cutoff in the row's own offset; see _cutoff_prefix.
+        cutoff_prefixes = {}
+
+        loaded = 0
         skipped = 0
+        unparseable = 0
+        seek_bytes = 0
+        stats["cutoff"] = cutoff
 
         try:
-            with open(file_path, "r", newline="") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # Handle multiple timestamp formats:
-                    # 1. "ts" field (battery CSV)
-                    # 2. separate "date" and "time" fields (old miner CSV)
-                    # 3. first column contains full ISO timestamp (new miner CSV)
-                    ts_str = None
-
-                    if row.get("ts"):
-                        ts_str = row["ts"]
-                    elif row.get("date") and row.get("time"):
-                        # Check if "date" column actually contains a full timestamp
-                        date_val = row["date"]
-                        if "T" in date_val or ":" in date_val:
-                            # First column is actually a full timestamp
-                            ts_str = date_val
-                            row["ts"] = ts_str  # Add ts field for compatibility
-                        else:
-                            # Separate date and time columns
-                            ts_str = f"{date_val}T{row['time']}"
-                            row["ts"] = ts_str  # Add ts field for compatibility
-
-                    if not ts_str:
-                        skipped += 1
-                        continue
-
-                    try:
-                        # Parse timestamp - ensure timezone aware for comparison
-                        dt = datetime.fromisoformat(ts_str.replace('Z', '+00:00'))
+            with open(file_path, "rb", buffering=_READ_BUFFER_BYTES) as raw:
+                header_line = raw.readline()
+                header = next(csv.reader([header_line.decode("utf-8")]), [])
+                data_start = raw.tell()
+
+                size = os.fstat(raw.fileno()).st_size
+                if header and size >= _SEEK_MIN_BYTES:
+                    with mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        offset = _seek_offset(mm, data_start, header, cutoff - _SEEK_MARGIN)
+                    if offset > data_start:
+                        raw.seek(offset)
+                        seek_bytes = offset - data_start
+
+                # Records stay plain field lists until they pass the cutoff;
+                # only the rows handed back pay for a dict.
+                cols = _ts_columns(header)
+                with io.TextIOWrapper(raw, encoding="utf-8", newline="") as f:
+                    for fields in csv.reader(f):
+                        if not fields:
+                            continue  # blank line, as DictReader skips
+                        ts_str = _extract_ts(fields, cols)
+                        if not ts_str:
+                            skipped += 1
+                            unparseable += 1
+                            continue
 
-                        # CRITICAL: If timezone-naive, add UTC timezone
-                        if dt.tzinfo is None:
-                            dt = dt.replace(tzinfo=timezone.utc)
+                        prefix = _cutoff_prefix(cutoff, ts_str, cutoff_prefixes)
+                        if prefix is not None and ts_str[:19] < prefix:
+                            skipped += 1
+                            continue
+
+                        try:
+                            dt = _parse_ts(ts_str)
+                        except Exception as e:
+                            # Counted and reported once in the load summary.
+                            if __debug__ and is_enabled("DATA_LOADER"):
+                                log("DATA_LOADER", f"bad timestamp {ts_str!r}: {e}")
+                            skipped += 1
+                            unparseable += 1
+                            continue
 
                         # Filter by cutoff date
                         if dt >= cutoff:
-                            loaded_rows.append(row)
+                            loaded += 1
+                            row = _row_dict(header, fields)
+                            row["ts"] = ts_str  # Add ts field for compatibility
+                            yield row
                         else:
                             skipped += 1
 
-                    except Exception as e:
-                        print(f"[DataLoader] Skipping row with bad timestamp: {ts_str} - {e}")
-                        skipped += 1
-                        continue
-
         except Exception as e:
             print(f"[DataLoader] Error reading {file_path}: {e}")
-            return []
+            stats["error"] = True
+            return
+
+        stats.update(skipped=skipped, unparseable_ts=unparseable, seek_bytes=seek_bytes)
+        self._load_counts[file_path] = {
+            "rows": loaded,
+            "skipped": skipped,
+            "unparseable_ts": unparseable,
+        }
 
-        # Log summary with date details
-        print(f"[DataLoader] ===== CSV LOAD SUMMARY =====")
-        print(f"[DataLoader] File: {os.path.basename(file_path)}")
-        print(f"[DataLoader] Cutoff date: {cutoff.date()} (loading last {days} days)")
-        print(f"[DataLoader] Total rows in CSV: {len(loaded_rows) + skipped}")
-        print(f"[DataLoader] Rows loaded: {len(loaded_rows)}")
-        print(f"[DataLoader] Rows skipped (too old): {skipped}")
-
-        if loaded_rows:
-            # Show date range of loaded data
-            first_ts = loaded_rows[0].get('ts', 'unknown')
-            last_ts = loaded_rows[-1].get('ts', 'unknown')
-            print(f"[DataLoader] Date range: {first_ts} to {last_ts}")
-            print(f"[DataLoader] ✓ Data loaded successfully!")
-        else:
-            print(f"[DataLoader] ⚠️  NO DATA LOADED!")
-            print(f"[DataLoader] All CSV data is older than {cutoff.date()}")
-        print(f"[DataLoader] ==============================")
-
-        # DEBUG: Log first 3 rows to see format
-        if loaded_rows:
-            print(f"[DataLoader] === FIRST 3 ROWS ===")
-            for i, row in enumerate(loaded_rows[:3]):
-                print(f"[DataLoader] Row {i+1}: ts={row.get('ts')}, type={type(row.get('ts'))}")
-                # Show a few data fields
-                keys = list(row.keys())[:5]
-                print(f"[DataLoader]   Fields: {', '.join([f'{k}={row.get(k)}' for k in keys])}")
+    @staticmethod
+    def file_signature(file_path: str) -> Optional[tuple]:
+        """Return (mtime_ns, size) for a log file, or None if it is missing.
 
-        return loaded_rows
+        Changes whenever a row is appended, so callers can use it to tell
+        whether a previous load is still current.
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
 
     def get_stats(self) -> dict:
         """Get statistics about loaded data."""
+        empty = {"rows": 0, "skipped": 0, "unparseable_ts": 0}
         return {
             "miner_loaded_days": self.miner_loaded_days,
             "battery_loaded_days": self.battery_loaded_days,
             "default_days": self.default_days,
             "max_days": self.max_days,
+            "miner_rows": self._load_counts.get(self.miner_log_file, empty),
+            "battery_rows": self._load_counts.get(self.battery_log_file, empty),
         }
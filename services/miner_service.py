@@ -1,7 +1,6 @@
 """Miner service for polling and control."""
 import asyncio
 import threading
-import queue
 import time
 import platform
 import csv
@@ -13,7 +12,20 @@ from typing import Dict, Any, Optional
 from pyasic.rpc.btminer import BTMinerRPCAPI
 from models.device import ConnectionStatus
 from utils.nc_miner_api import NCMinerAPI
-from utils.log_config import log as debug_log
+from utils.error_throttle import ErrorThrottle
+from utils.log_config import is_enabled, log as debug_log
+
+
+# Default live history window (one row per poll); see BatteryService.
+HISTORY_WINDOW_SEC = 24 * 3600
+
+# SUMMARY hashrate fields in priority order, with the divisor to TH/s.
+# The first present, numeric one wins.
+_HASHRATE_KEYS = (
+    *((k, 1.0) for k in ("THS 5s", "THS av", "TH/s", "THS")),
+    *((k, 1000.0) for k in ("GHS 5s", "GHS av", "GH/s", "GHS")),
+    *((k, 1000000.0) for k in ("MHS 5s", "MHS av", "MH/s", "MHS", "MHS 1m", "MHS 5m", "MHS 15m")),
+)
 
 
 class MinerController:
@@ -32,7 +44,9 @@ class MinerController:
         # Use dedicated privileged API if provided; otherwise fall back to polling API.
         # NCMinerAPI is subprocess-based and stateless, so it is always safe to reuse.
         self._priv_api = priv_api if priv_api is not None else api
-        self.q = queue.Queue()
+        # Pending ops, oldest first: (kind, req, on_verified). Guarded by _cv.
+        self._pending: deque = deque()
+        self._cv = threading.Condition()
         self.state: dict[str, object] = {
             "op_state": "idle",
             "op_kind": None,
@@ -48,16 +62,33 @@ class MinerController:
         return dict(self.state)
 
     def enqueue_stop(self, on_verified=None):
-        self.q.put(("stop", {}, on_verified))
+        self._put(("stop", {}, on_verified))
 
     def enqueue_resume(self, on_verified=None):
-        self.q.put(("resume", {}, on_verified))
+        self._put(("resume", {}, on_verified))
 
     def enqueue_set_power_limit(self, watts: int, on_verified=None):
-        self.q.put(("power_limit", {"watts": int(watts)}, on_verified))
+        self._put(("power_limit", {"watts": int(watts)}, on_verified))
 
     def enqueue_set_power_pct(self, percent: int, on_verified=None):
-        self.q.put(("power_pct", {"percent": int(percent)}, on_verified))
+        self._put(("power_pct", {"percent": int(percent)}, on_verified))
+
+    # Both set the same firmware power limit; the newer one supersedes.
+    _LIMIT_OPS = ("power_limit", "power_pct")
+
+    def _put(self, item):
+        """Queue an op. A power-limit op replaces a power-limit op still
+        waiting at the tail (slider drags send one per step, and each takes
+        seconds to apply and verify); the replaced op's on_verified never
+        runs. Stop/resume are never dropped or reordered.
+        """
+        with self._cv:
+            if (item[0] in self._LIMIT_OPS and self._pending
+                    and self._pending[-1][0] in self._LIMIT_OPS):
+                self._pending[-1] = item
+            else:
+                self._pending.append(item)
+            self._cv.notify()
 
     def drain_queue(self):
         """Remove all pending ops from the queue without executing them.
@@ -66,13 +97,9 @@ class MinerController:
         The Layer 3 verify-and-retry loop in AutoControlService handles this case
         by detecting the miner is still on and issuing another emergency stop.
         """
-        drained = 0
-        while True:
-            try:
-                self.q.get_nowait()
-                drained += 1
-            except queue.Empty:
-                break
+        with self._cv:
+            drained = len(self._pending)
+            self._pending.clear()
         if drained:
             print(f"[MinerController] Drained {drained} pending op(s) from queue")
 
@@ -268,20 +295,18 @@ class MinerController:
 
     def _worker(self):
         while True:
-            item = self.q.get()
-            kind = item[0]
-            req = item[1]
-            on_verified = item[2] if len(item) > 2 else None
-            try:
-                self._run_op(kind, req, on_verified=on_verified)
-            finally:
-                self.q.task_done()
+            with self._cv:
+                while not self._pending:
+                    self._cv.wait()
+                kind, req, on_verified = self._pending.popleft()
+            self._run_op(kind, req, on_verified=on_verified)
 
 
 class MinerService:
     """Service for miner polling and control."""
 
-    def __init__(self, host: str, password: str, poll_seconds: int, log_interval_sec: int, log_file: str = None, state_manager=None):
+    def __init__(self, host: str, password: str, poll_seconds: int, log_interval_sec: int, log_file: str = None, state_manager=None,
+                 max_history: Optional[int] = None):
         # Always use NCMinerAPI for both polling and privileged commands.
         # NCMinerAPI uses nc (subprocess) which closes the TCP connection immediately
         # after each command, avoiding the miner's "over max connect" limit.
@@ -299,12 +324,24 @@ class MinerService:
         self.log_file = log_file or os.path.join("miner_logs", "wm_status_log.csv")
 
         self.latest = {}
-        self.history: deque = deque()
+        # Live rows for /api/chart-data; older points come from the CSV log.
+        if max_history is None:
+            max_history = max(1, HISTORY_WINDOW_SEC // max(1, poll_seconds))
+        self.history: deque = deque(maxlen=max_history)
+        # Bumped on every history append; lets HTTP handlers detect new data
+        # without comparing rows.
+        self.history_revision = 0
         self.last_nonzero_limit: Optional[int] = None
 
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._last_log_ts = 0.0  # Start at 0 so first data point logs immediately
+        # CSV log handle, opened on the first write and kept for the process.
+        self._csv_fh = None
+        self._csv_writer: Optional[csv.DictWriter] = None
+        self._csv_fields: tuple = ()
+        # Repeating poll errors print their traceback at most once an hour.
+        self._loop_errors = ErrorThrottle()
 
         # is_off: True until confirmed hashing. Starts conservative (safe default).
         self._is_off: bool = True
@@ -345,6 +382,7 @@ class MinerService:
         self._running = False
         if self._thread:
             self._thread.join(timeout=5)
+        self._close_csv()
         print("[MinerService] Stopped polling")
 
     def _poll_loop(self):
@@ -354,7 +392,9 @@ class MinerService:
 
         while self._running:
             try:
-                print(f"[MinerService] Polling miner at {ip}...")
+                trace = __debug__ and is_enabled("MINER_POLL")
+                if trace:
+                    debug_log("MINER_POLL", f"polling miner at {ip}")
 
                 # Use sync or async based on API type
                 if self.use_async:
@@ -362,8 +402,8 @@ class MinerService:
                 else:
                     reply = self.api.summary()
 
-                print(f"[MinerService] RAW RESPONSE: {reply}")
-                print(f"[MinerService] Response type: {type(reply)}")
+                if trace:
+                    debug_log("MINER_POLL", f"raw response ({type(reply).__name__}): {reply}")
                 item = self._extract_summary_item(reply)
 
                 if item:
@@ -374,7 +414,7 @@ class MinerService:
                         print(f"[MinerService] ✓ Connected to miner at {self.api.ip}")
 
                     self.connection_status.connected = True
-                    self.connection_status.last_seen = datetime.now(timezone.utc)
+                    self.connection_status.last_seen = now
                     if self._first_connect_time:
                         self.connection_status.uptime_seconds = now - self._first_connect_time
                     self.connection_status.error = None
@@ -384,9 +424,9 @@ class MinerService:
                     if pl and pl > 0:
                         self.last_nonzero_limit = pl
 
-                    row = {"ts": self._now_iso()}
-                    for k, v in item.items():
-                        row[str(k)] = v
+                    # "ts" stays the first CSV column. SUMMARY keys come
+                    # from JSON and are already strings.
+                    row = {"ts": self._now_iso(now), **item}
 
                     # --- Hashrate 5s (MHS 5s / 1e6) ---
                     try:
@@ -475,18 +515,21 @@ class MinerService:
 
                     self.latest = row
                     self.history.append(row)
+                    self.history_revision += 1
 
                     # CSV logging check (log first data immediately, then every log_interval_sec)
-                    now_ts = time.time()
-                    if (now_ts - self._last_log_ts) >= self.log_interval_sec:
+                    if (now - self._last_log_ts) >= self.log_interval_sec:
                         self._log_to_csv(row)
-                        self._last_log_ts = now_ts
-
-                    # Safe logging with None checks
-                    hr_display = f"{hr_ths:.1f}" if hr_ths is not None else "—"
-                    pwr_display = f"{pwr_val:.0f}" if pwr_val is not None else "—"
-                    print(f"[MinerService] Poll successful: {hr_display}TH/s, {pwr_display}W")
-                    print(f"[MinerService] Sending update to UI: {row.get('Hashrate')}TH/s, {row.get('Hashrate 5s')}TH/s(5s), {row.get('Power')}W, {row.get('Power 5s')}W(5s), is_off={self._is_off}")
+                        self._last_log_ts = now
+
+                    if trace:
+                        # Safe logging with None checks
+                        hr_display = f"{hr_ths:.1f}" if hr_ths is not None else "—"
+                        pwr_display = f"{pwr_val:.0f}" if pwr_val is not None else "—"
+                        debug_log("MINER_POLL",
+                                  f"poll ok: {hr_display}TH/s, {pwr_display}W "
+                                  f"(5s: {row.get('Hashrate 5s')}TH/s, {row.get('Power 5s')}W), "
+                                  f"is_off={self._is_off}")
                 else:
                     print(f"[MinerService] No data in summary response")
 
@@ -501,8 +544,7 @@ class MinerService:
                 else:
                     print(f"[MinerService] ✗ Cannot connect to miner at {self.api.ip}: {e}")
 
-                import traceback
-                traceback.print_exc()
+                self._loop_errors.report(e)
 
             time.sleep(self.poll_seconds)
 
@@ -525,7 +567,7 @@ class MinerService:
         """Get connection status."""
         return {
             "connected": self.connection_status.connected,
-            "last_seen": self.connection_status.last_seen.isoformat() if self.connection_status.last_seen else None,
+            "last_seen": self.connection_status.last_seen_iso(),
             "uptime_seconds": self.connection_status.uptime_seconds,
             "error": self.connection_status.error,
         }
@@ -604,25 +646,44 @@ class MinerService:
                 print(f"[MinerService] Failed to persist user_power_intent: {e}")
 
     # Helper methods
-    def _now_iso(self):
-        return datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds")
+    def _now_iso(self, now: Optional[float] = None):
+        """Local ISO timestamp for epoch `now` (default: the current time)."""
+        if now is None:
+            return datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds")
+        return datetime.fromtimestamp(now, timezone.utc).astimezone().isoformat(timespec="seconds")
 
     def _log_to_csv(self, row: dict):
         """Append row to CSV log file."""
         try:
-            os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
-            file_exists = os.path.exists(self.log_file)
-
-            with open(self.log_file, "a", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=row.keys())
-                if not file_exists:
-                    writer.writeheader()
-                writer.writerow(row)
-
-            print(f"[MinerService] Logged to CSV: {row.get('ts', 'no timestamp')}")
+            if self._csv_fh is None:
+                os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
+                # Line-buffered so readers never see a partial row.
+                self._csv_fh = open(self.log_file, "a", newline="", buffering=1)
+            fields = tuple(row)
+            if fields != self._csv_fields:
+                # Columns follow the row, as with a fresh DictWriter per row;
+                # the summary keys only change if the firmware reply does.
+                self._csv_writer = csv.DictWriter(self._csv_fh, fieldnames=fields)
+                self._csv_fields = fields
+                if self._csv_fh.tell() == 0:
+                    self._csv_writer.writeheader()
+            self._csv_writer.writerow(row)
+
+            if __debug__ and is_enabled("MINER_POLL"):
+                debug_log("MINER_POLL", f"logged to CSV: {row.get('ts', 'no timestamp')}")
         except Exception as e:
+            # Reopen on the next write (disk full, file removed, ...).
+            self._close_csv()
             print(f"[MinerService] CSV logging error: {e}")
 
+    def _close_csv(self):
+        fh, self._csv_fh, self._csv_writer, self._csv_fields = self._csv_fh, None, None, ()
+        if fh is not None:
+            try:
+                fh.close()
+            except OSError:
+                pass
+
     def _extract_summary_item(self, reply: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         if not reply or "SUMMARY" not in reply or not reply["SUMMARY"]:
             return {}
@@ -640,30 +701,11 @@ class MinerService:
         if not isinstance(item, dict):
             return None
 
-        # Direct TH/s fields
-        for k in ("THS 5s", "THS av", "TH/s", "THS"):
-            if k in item:
-                try:
-                    v = float(item[k])
-                    return v if v >= 0 else None
-                except Exception:
-                    pass
-
-        # GH/s fields (convert to TH/s)
-        for k in ("GHS 5s", "GHS av", "GH/s", "GHS"):
-            if k in item:
-                try:
-                    v = float(item[k])
-                    return v / 1000.0 if v >= 0 else None
-                except Exception:
-                    pass
-
-        # MH/s fields (convert to TH/s)
-        for k in ("MHS 5s", "MHS av", "MH/s", "MHS", "MHS 1m", "MHS 5m", "MHS 15m"):
+        for k, div in _HASHRATE_KEYS:
             if k in item:
                 try:
                     v = float(item[k])
-                    return v / 1000000.0 if v >= 0 else None
+                    return v / div if v >= 0 else None
                 except Exception:
                     pass
 
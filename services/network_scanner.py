@@ -1,14 +1,43 @@
 """Network scanner for discovering mining devices."""
+import shutil
 import socket
+import struct
 import threading
 import time
 import subprocess
 import re
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import List, Optional, Tuple
 import platform
 
 from models.device import Device, DeviceType
 
+# Concurrent ping subprocesses when fping is not installed.
+PING_WORKERS = 64
+
+# Ports _identify_device looks at: WhatsMiner API, Bitaxe HTTP.
+IDENTIFY_PORTS = (4028, 80)
+# Concurrent port probes per scan.
+PROBE_WORKERS = 32
+# API timeout when asking a host with port 4028 open what it is. A miner
+# answers summary in well under a second.
+IDENTIFY_TIMEOUT_SEC = 2
+
+# One `arp -a` line: "whatsminer.lan (192.168.86.52) at aa:bb:... on en0",
+# or "? (...)" when the host has no name.
+_ARP_A_LINE_RE = re.compile(r'^(\S+)\s+\((\d+\.\d+\.\d+\.\d+)\)')
+
+# Pause after the broadcast ping so late replies reach the ARP table.
+ARP_SETTLE_SEC = 0.5
+
+# Linux ARP table (the data behind `ip neigh`).
+PROC_NET_ARP = "/proc/net/arp"
+
+# macOS needs nc/arp -a where Linux uses sockets and /proc; fixed for the
+# life of the process.
+_IS_DARWIN = platform.system() == "Darwin"
+
 
 class NetworkScanner:
     """
@@ -27,12 +56,21 @@ class NetworkScanner:
             subnet: First 3 octets of subnet to scan (e.g., "192.168.86")
         """
         self.subnet = subnet
+        # Network address of the /24 as an integer, for _subnet_host().
+        self._subnet_net = struct.unpack('>I', socket.inet_aton(f"{subnet}.0"))[0]
         self.discovered_devices: List[Device] = []
+        # get_devices()'s snapshot, replaced (never mutated) per scan.
+        self._devices_tuple: Tuple[Device, ...] = ()
+        # get_scan_info()'s "devices" list, rebuilt only when a scan lands.
+        self._device_dicts: List[dict] = []
         self.last_scan_time: float = 0.0
         self.scanning: bool = False  # Track if scan is in progress
 
         self._running = False
         self._thread = None
+        # Set to cut the wait between scans short: stop() to exit promptly,
+        # trigger_scan_now() to start the next scan right away.
+        self._wake = threading.Event()
 
     def start_background_scan(self):
         """Start background scanning thread."""
@@ -46,10 +84,19 @@ class NetworkScanner:
     def stop(self):
         """Stop background scanning."""
         self._running = False
+        self._wake.set()
         if self._thread:
             self._thread.join(timeout=5)
         print("[NetworkScanner] Stopped")
 
+    def trigger_scan_now(self):
+        """Wake the background loop for an immediate scan.
+
+        Called mid-scan, the next scan starts as soon as the current one
+        finishes.
+        """
+        self._wake.set()
+
     def _scan_loop(self):
         """Background scan loop."""
         import sys
@@ -61,8 +108,7 @@ class NetworkScanner:
         try:
             self.scanning = True
             devices = self.scan_network()
-            self.discovered_devices = devices
-            self.last_scan_time = time.time()
+            self._publish(devices)
             self.scanning = False
             print(f"[NetworkScanner] ✓ Initial scan complete: Found {len(devices)} devices")
             for d in devices:
@@ -74,13 +120,15 @@ class NetworkScanner:
             traceback.print_exc()
 
         while self._running:
-            time.sleep(SCAN_INTERVAL)
+            self._wake.wait(SCAN_INTERVAL)
+            self._wake.clear()
+            if not self._running:
+                break
             try:
                 print("[NetworkScanner] Starting periodic scan...")
                 self.scanning = True
                 devices = self.scan_network()
-                self.discovered_devices = devices
-                self.last_scan_time = time.time()
+                self._publish(devices)
                 self.scanning = False
                 print(f"[NetworkScanner] ✓ Scan complete: Found {len(devices)} devices")
             except Exception as e:
@@ -103,14 +151,21 @@ class NetworkScanner:
         print(f"[NetworkScanner] ✓ Found {len(alive_ips)} alive hosts: {', '.join(alive_ips)}")
 
         # Phase 2: Identify device types
+        open_ports = self._probe_ports(alive_ips, IDENTIFY_PORTS)
+        print(f"[NetworkScanner] Phase 2: Identifying {len(alive_ips)} hosts...")
+        # Each identification waits on a device API round trip; run them
+        # side by side and report in IP order afterwards.
+        with ThreadPoolExecutor(max_workers=max(1, min(PROBE_WORKERS, len(alive_ips)))) as pool:
+            identified = list(pool.map(
+                lambda ip: self._identify_device(ip, open_ports.get(ip, set())),
+                alive_ips))
+
         devices = []
-        for ip in alive_ips:
+        for ip, device in zip(alive_ips, identified):
             hostname = self._hostname_map.get(ip)
-            print(f"[NetworkScanner] Phase 2: Identifying {ip}...")
-            device = self._identify_device(ip)
             if device:
                 # Add hostname to identified device
-                device.hostname = hostname
+                device = replace(device, hostname=hostname)
                 devices.append(device)
                 print(f"[NetworkScanner]   ✓ {ip} = {device.device_type.value}")
             else:
@@ -141,9 +196,11 @@ class NetworkScanner:
         alive_hosts = set()
         self._hostname_map = {}  # Store IP -> hostname mapping
 
+        self._prime_arp_cache()
+
         # Method 1: Use ARP table (Mac/Linux)
         try:
-            if platform.system() == "Darwin":
+            if _IS_DARWIN:
                 # macOS: Use arp -a (with hostnames)
                 # Takes ~6 seconds but scans are infrequent (startup + every 5 min)
                 result = subprocess.run(
@@ -162,19 +219,14 @@ class NetworkScanner:
                             continue  # Skip incomplete ARP entries
 
                         # Extract hostname (if present) and IP
-                        hostname = None
-                        hostname_match = re.search(r'^(\S+)\s+\(', line)
-                        if hostname_match:
-                            hostname = hostname_match.group(1)
+                        match = _ARP_A_LINE_RE.match(line)
+                        if match:
+                            hostname, ip = match.groups()
                             if hostname == '?':
                                 hostname = None
-
-                        ip_match = re.search(r'\((\d+\.\d+\.\d+\.\d+)\)', line)
-                        if ip_match:
-                            ip = ip_match.group(1)
-                            if ip.startswith(self.subnet):
+                            last_octet = self._subnet_host(ip)
+                            if last_octet is not None:
                                 # Skip network (.0) and broadcast (.255) addresses
-                                last_octet = int(ip.split('.')[-1])
                                 if last_octet == 0 or last_octet == 255:
                                     continue
                                 alive_hosts.add(ip)
@@ -184,24 +236,10 @@ class NetworkScanner:
                                 else:
                                     print(f"[NetworkScanner]   ARP: {ip} alive")
             else:
-                # Linux: Use ip neigh
-                result = subprocess.run(
-                    ['ip', 'neigh'],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-
-                if result.returncode == 0:
-                    for line in result.stdout.split('\n'):
-                        if "INCOMPLETE" in line or "FAILED" in line:
-                            continue  # Skip incomplete entries
-                        match = re.search(r'^(\d+\.\d+\.\d+\.\d+)', line)
-                        if match:
-                            ip = match.group(1)
-                            if ip.startswith(self.subnet):
-                                alive_hosts.add(ip)
-                                print(f"[NetworkScanner]   ARP: {ip} alive")
+                # Linux: the kernel neighbour table, read directly
+                for ip in self._read_proc_arp():
+                    alive_hosts.add(ip)
+                    print(f"[NetworkScanner]   ARP: {ip} alive")
 
         except Exception as e:
             print(f"[NetworkScanner]   ARP lookup failed: {e}")
@@ -209,21 +247,96 @@ class NetworkScanner:
         # Method 2: If ARP didn't find many hosts, try ping sweep on common IPs
         if len(alive_hosts) < 5:
             print("[NetworkScanner]   ARP found few hosts, trying ping sweep...")
-            common_ips = list(range(1, 256))  # Scan all .1-.255
-
-            for last_octet in common_ips:
-                ip = f"{self.subnet}.{last_octet}"
-                if self._ping_host(ip):
-                    alive_hosts.add(ip)
-                    print(f"[NetworkScanner]   PING: {ip} alive")
+            for ip in self._ping_sweep():
+                alive_hosts.add(ip)
+                print(f"[NetworkScanner]   PING: {ip} alive")
 
         return sorted(list(alive_hosts))
 
+    def _prime_arp_cache(self):
+        """Broadcast-ping the subnet so hosts that answer land in the ARP table.
+
+        ARP entries expire after minutes of silence, so an idle device is
+        otherwise only found by the slower ping sweep. Best effort: many
+        hosts ignore broadcast echo, and a failure here changes nothing.
+        """
+        broadcast = f"{self.subnet}.255"
+        if _IS_DARWIN:
+            cmd = ['ping', '-c', '2', '-t', '2', broadcast]
+        else:
+            cmd = ['ping', '-b', '-c', '2', '-W', '1', broadcast]
+        try:
+            subprocess.run(cmd, capture_output=True, timeout=3)
+        except Exception as e:
+            print(f"[NetworkScanner]   Broadcast ping failed: {e}")
+            return
+        time.sleep(ARP_SETTLE_SEC)
+
+    def _subnet_host(self, ip: str) -> Optional[int]:
+        """Last octet of `ip` if it is on the scanned /24, else None."""
+        try:
+            ip_int = struct.unpack('>I', socket.inet_aton(ip))[0]
+        except OSError:
+            return None
+        if ip_int & 0xFFFFFF00 != self._subnet_net:
+            return None
+        return ip_int & 0xFF
+
+    def _read_proc_arp(self, path: str = PROC_NET_ARP) -> List[str]:
+        """Subnet IPs with a resolved MAC in the Linux ARP table.
+
+        Same table `ip neigh` prints, without spawning a process. Columns:
+        IP address, HW type, Flags, HW address, Mask, Device. Flags 0x0
+        marks an incomplete entry.
+        """
+        hosts = []
+        with open(path) as f:
+            next(f, None)  # header
+            for line in f:
+                parts = line.split()
+                if len(parts) < 4:
+                    continue
+                ip, flags, mac = parts[0], parts[2], parts[3]
+                if flags == "0x0" or mac == "00:00:00:00:00:00":
+                    continue
+                # Skip off-subnet, network (.0) and broadcast (.255) addresses
+                if self._subnet_host(ip) in (None, 0, 255):
+                    continue
+                hosts.append(ip)
+        return hosts
+
+    def _ping_sweep(self) -> List[str]:
+        """Ping .1-.254 of the subnet at once; return the hosts that answered.
+
+        One fping process pings the whole range in parallel. Without fping,
+        the per-host ping runs on a thread pool instead of one IP at a time.
+        """
+        fping = shutil.which("fping")
+        if fping:
+            try:
+                # fping exits 1 when any host is unreachable; stdout still
+                # lists the alive ones, one IP per line.
+                result = subprocess.run(
+                    [fping, '-a', '-q', '-g', f"{self.subnet}.1", f"{self.subnet}.254",
+                     '-t', '300', '-r', '0'],
+                    capture_output=True,
+                    text=True,
+                    timeout=10
+                )
+                return [ip for ip in result.stdout.split()
+                        if ip.startswith(f"{self.subnet}.")]
+            except Exception as e:
+                print(f"[NetworkScanner]   fping sweep failed ({e}), falling back to ping")
+
+        ips = [f"{self.subnet}.{last_octet}" for last_octet in range(1, 255)]
+        with ThreadPoolExecutor(max_workers=PING_WORKERS) as pool:
+            return [ip for ip, alive in zip(ips, pool.map(self._ping_host, ips)) if alive]
+
     def _ping_host(self, ip: str, timeout: float = 0.5) -> bool:
         """Check if host responds to ping."""
         try:
             # Use system ping command (works on Mac/Linux)
-            if platform.system() == "Darwin":
+            if _IS_DARWIN:
                 # macOS: ping -c 1 -W timeout_ms
                 result = subprocess.run(
                     ['ping', '-c', '1', '-W', str(int(timeout * 1000)), ip],
@@ -242,24 +355,49 @@ class NetworkScanner:
         except Exception:
             return False
 
-    def _identify_device(self, ip: str) -> Optional[Device]:
+    def _probe_ports(self, ips: List[str], ports: tuple) -> dict:
+        """Check every (ip, port) pair concurrently.
+
+        Returns {ip: set of open ports}. Each probe still goes through
+        _check_port (nc on macOS, sockets on Linux); the pool only stops
+        the probes from waiting on each other.
+        """
+        pairs = [(ip, port) for ip in ips for port in ports]
+        open_ports = {ip: set() for ip in ips}
+        if not pairs:
+            return open_ports
+        with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(pairs))) as pool:
+            results = pool.map(lambda pair: self._check_port(*pair, timeout=1.0), pairs)
+            for (ip, port), is_open in zip(pairs, results):
+                if is_open:
+                    open_ports[ip].add(port)
+        return open_ports
+
+    def _identify_device(self, ip: str, open_ports: Optional[set] = None) -> Optional[Device]:
         """
         Try to identify device type.
 
         Args:
             ip: IP address to identify
+            open_ports: Ports already found open by _probe_ports; when None
+                each port is checked here
 
         Returns:
             Device if identified, None otherwise
         """
+        def is_open(port):
+            if open_ports is None:
+                return self._check_port(ip, port, timeout=1.0)
+            return port in open_ports
+
         # Try WhatsMiner (port 4028)
-        if self._check_port(ip, 4028, timeout=1.0):
+        if is_open(4028):
             device = self._identify_whatsminer(ip)
             if device:
                 return device
 
         # Try Bitaxe (port 80 with API)
-        if self._check_port(ip, 80, timeout=1.0):
+        if is_open(80):
             device = self._identify_bitaxe(ip)
             if device:
                 return device
@@ -269,7 +407,7 @@ class NetworkScanner:
     def _check_port(self, ip: str, port: int, timeout: float = 1.0) -> bool:
         """Check if port is open."""
         # Use nc command on macOS (Python sockets don't work due to security restrictions)
-        if platform.system() == "Darwin":
+        if _IS_DARWIN:
             try:
                 # Use nc with -z flag (scan mode) and -w timeout
                 result = subprocess.run(
@@ -294,16 +432,11 @@ class NetworkScanner:
     def _identify_whatsminer(self, ip: str) -> Optional[Device]:
         """Try to identify WhatsMiner device."""
         try:
-            # Use NC-based API on macOS
-            if platform.system() == "Darwin":
-                from utils.nc_miner_api import NCMinerAPI
-                api = NCMinerAPI(ip)
-                summary = api.summary()
-            else:
-                from pyasic.rpc.btminer import BTMinerRPCAPI
-                import asyncio
-                api = BTMinerRPCAPI(ip)
-                summary = asyncio.run(api.summary())
+            # NCMinerAPI: nc on macOS, a plain socket elsewhere; both honour
+            # the short identify timeout (pyasic's read timeout is 100s)
+            from utils.nc_miner_api import NCMinerAPI
+            api = NCMinerAPI(ip, timeout=IDENTIFY_TIMEOUT_SEC)
+            summary = api.summary()
 
             if summary and "SUMMARY" in summary:
                 item = summary["SUMMARY"][0] if summary["SUMMARY"] else {}
@@ -354,24 +487,39 @@ class NetworkScanner:
 
         return None
 
-    def get_devices(self) -> List[Device]:
-        """Get list of discovered devices."""
-        return self.discovered_devices.copy()
+    def _publish(self, devices: List[Device]):
+        """Store a finished scan and its serialized device list."""
+        self._device_dicts = [
+            {
+                "ip": d.ip,
+                "hostname": d.hostname,
+                "type": d.device_type.value,
+                "hashrate_ths": d.hashrate_ths,
+                "power_w": d.power_w,
+            }
+            for d in devices
+        ]
+        self.discovered_devices = devices
+        self._devices_tuple = tuple(devices)
+        self.last_scan_time = time.time()
+
+    def get_devices(self) -> Tuple[Device, ...]:
+        """Get discovered devices from the last scan.
+
+        The same tuple is returned until the next scan lands; use
+        list(...) for a mutable copy.
+        """
+        return self._devices_tuple
 
     def get_scan_info(self) -> dict:
-        """Get scan information."""
+        """Get scan information.
+
+        "devices" is the list built when the last scan finished, shared
+        between calls; callers serialize it and must not modify it.
+        """
         return {
             "scanning": self.scanning,
             "last_scan_time": self.last_scan_time,
-            "device_count": len(self.discovered_devices),
-            "devices": [
-                {
-                    "ip": d.ip,
-                    "hostname": d.hostname,
-                    "type": d.device_type.value,
-                    "hashrate_ths": d.hashrate_ths,
-                    "power_w": d.power_w,
-                }
-                for d in self.discovered_devices
-            ]
+            "device_count": len(self._device_dicts),
+            "devices": self._device_dicts,
         }
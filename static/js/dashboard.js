@@ -175,7 +175,7 @@ async function loadChartData(hours) {
     const url = `/api/chart-data?hours=${hours}`;
     console.log(`[loadChartData] Fetching from: ${url}`);
 
-    const res = await fetch(url, { cache: 'no-store' });
+    const res = await fetch(url, { cache: 'no-cache' });
     console.log(`[loadChartData] Fetch response status: ${res.status} ${res.statusText}`);
 
     if (!res.ok) {
@@ -604,7 +604,7 @@ function pushMinerHistory(row){
 async function loadMinerHistory(days = 3) {
   try {
     addDebugLog(`Loading ${days} days of miner data...`, 'info');
-    const res = await fetch(`/api/miner/history?days=${days}`, { cache: 'no-store' });
+    const res = await fetch(`/api/miner/history?days=${days}`, { cache: 'no-cache' });
     const response = await res.json();
 
     // Handle both old format (array) and new format (object with data/meta)
@@ -654,7 +654,7 @@ function pushBatteryHistory(row){
 async function loadBatteryHistory(days = 3) {
   try {
     addDebugLog(`Loading ${days} days of battery data...`, 'info');
-    const res = await fetch(`/api/battery/history?days=${days}`, { cache: 'no-store' });
+    const res = await fetch(`/api/battery/history?days=${days}`, { cache: 'no-cache' });
     const response = await res.json();
 
     // Handle both old format (array) and new format (object with data/meta)
@@ -0,0 +1,58 @@
+"""Tests for the shared background event loop.
+
+Coverage:
+  - coroutine results are returned to the synchronous caller
+  - the same loop (and thread) serves every call
+  - exceptions raised in the coroutine propagate
+  - a timeout cancels the coroutine
+"""
+import asyncio
+import concurrent.futures
+import threading
+
+import pytest
+
+from utils.async_runner import get_loop, run_coroutine
+
+
+def test_returns_result():
+    async def add(a, b):
+        await asyncio.sleep(0)
+        return a + b
+
+    assert run_coroutine(add(2, 3), timeout=5) == 5
+
+
+def test_loop_is_shared_and_off_caller_thread():
+    async def where():
+        return asyncio.get_running_loop(), threading.current_thread()
+
+    loop1, thread1 = run_coroutine(where(), timeout=5)
+    loop2, thread2 = run_coroutine(where(), timeout=5)
+
+    assert loop1 is loop2 is get_loop()
+    assert thread1 is thread2
+    assert thread1 is not threading.current_thread()
+
+
+def test_exception_propagates():
+    async def boom():
+        raise ValueError("nope")
+
+    with pytest.raises(ValueError, match="nope"):
+        run_coroutine(boom(), timeout=5)
+
+
+def test_timeout_cancels():
+    cancelled = threading.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(concurrent.futures.TimeoutError):
+        run_coroutine(slow(), timeout=0.05)
+    assert cancelled.wait(2)
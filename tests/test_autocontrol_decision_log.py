@@ -0,0 +1,75 @@
+"""Tests for AutoControlService decision reporting and SOC tiers.
+
+Coverage:
+  - _calculate_soc_tier matches the decile ladder (NaN and < 30 -> 0)
+  - tier watts come from the precomputed table; other pcts still compute
+  - _report_decision prints once per distinct (stop_reason, target, state)
+  - per-tick decision context stays off stdout while AUTOCONTROL is off
+"""
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from services import autocontrol_service as ac_mod
+from services.autocontrol_service import AutoControlService
+from utils.state_manager import StateManager
+
+
+@pytest.fixture
+def svc(tmp_path):
+    return AutoControlService(
+        miner_service=MagicMock(),
+        battery_service=MagicMock(),
+        state_manager=StateManager(path=str(tmp_path / "state.json")),
+        base_watts=3600,
+        min_interval_sec=60,
+        mode="away",
+        away_config={},
+        location_config={"latitude": 40.0, "longitude": -74.0, "timezone": "America/New_York"},
+    )
+
+
+def _ladder(soc):
+    for floor in (80, 70, 60, 50, 40, 30):
+        if soc >= floor:
+            return floor
+    return 0
+
+
+def test_soc_tier_matches_ladder(svc):
+    for soc in [x / 4 for x in range(-8, 420)] + [29.999, 30.0, 79.99, 1e6]:
+        assert svc._calculate_soc_tier(soc) == _ladder(soc), soc
+    assert svc._calculate_soc_tier(float("nan")) == 0
+
+
+def test_pct_to_watts(svc):
+    assert svc._pct_to_watts(70) == 2520
+    assert svc._pct_to_watts(100) == 3600
+    assert svc._pct_to_watts(0) == 0
+    assert svc._pct_to_watts(55) == 1980
+
+
+def test_report_decision_only_on_change(svc, capsys):
+    svc.stop_reason, svc.target_pct, svc.current_state_description = "normal", 50, "Discharging"
+    svc._report_decision()
+    svc._report_decision()
+    assert capsys.readouterr().out.count("[AutoControl]") == 1
+
+    svc.target_pct = 70
+    svc._report_decision()
+    assert "target=70%" in capsys.readouterr().out
+
+
+def test_tick_context_not_printed_when_tag_off(svc, capsys, monkeypatch):
+    monkeypatch.setattr(ac_mod, "is_enabled", lambda tag: False)
+    svc.battery.is_fresh.return_value = True
+    svc.battery.get_latest.return_value = {"soc_percent": 80.0, "pv_power_w": 0, "load_power_w": 0}
+    svc.miner.get_latest.return_value = {"power_w": 1000, "online": True}
+    monkeypatch.setattr(svc, "_set_power_with_rate_limit", lambda *a, **k: None)
+
+    svc._away_mode_control()
+
+    out = capsys.readouterr().out
+    assert "DECISION" not in out and "Next evaluation" not in out
@@ -0,0 +1,104 @@
+"""Tests for AutoControlService sunset handling.
+
+Coverage:
+  - _sunset_context reads the clock once and compares against the cached
+    sunset (before / after)
+  - a failed sunset calculation reports "not past sunset"
+  - get_state reports the same sunset/is_past pair
+  - _get_sunset_time matches astral's full sun() result and is cached per day
+  - without astral the configured fallback time is used, in the local tz
+  - the sunset HH:MM:SS string is formatted once per cached sunset
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from services import autocontrol_service as ac_mod
+from services.autocontrol_service import AutoControlService
+from utils.state_manager import StateManager
+
+
+@pytest.fixture
+def svc(tmp_path):
+    return AutoControlService(
+        miner_service=MagicMock(),
+        battery_service=MagicMock(),
+        state_manager=StateManager(path=str(tmp_path / "state.json")),
+        base_watts=3600,
+        min_interval_sec=60,
+        mode="away",
+        away_config={},
+        location_config={"latitude": 40.0, "longitude": -74.0, "timezone": "America/New_York"},
+    )
+
+
+def _pin_sunset(svc, offset):
+    svc._cached_sunset_date = date.today()
+    svc._cached_sunset_time = datetime.now(svc._tz) + offset
+
+
+def test_before_sunset(svc):
+    _pin_sunset(svc, timedelta(hours=1))
+    sunset, now, is_past = svc._sunset_context()
+    assert sunset == svc._cached_sunset_time
+    assert now.tzinfo is svc._tz
+    assert is_past is False
+
+
+def test_after_sunset(svc):
+    _pin_sunset(svc, -timedelta(minutes=1))
+    assert svc._sunset_context()[2] is True
+    assert svc._is_past_sunset() is True
+
+
+def test_failed_sunset_is_not_past(svc, monkeypatch):
+    monkeypatch.setattr(svc, "_get_sunset_time", lambda: None)
+    assert svc._sunset_context()[0] is None
+    assert svc._sunset_context()[2] is False
+
+
+def test_get_state_uses_same_context(svc):
+    _pin_sunset(svc, -timedelta(minutes=1))
+    state = svc.get_state()
+    assert state["is_past_sunset"] is True
+    assert state["sunset_time"] == svc._cached_sunset_time.strftime("%H:%M:%S")
+
+
+def test_sunset_matches_astral_sun(svc):
+    astral_sun = pytest.importorskip("astral.sun")
+    expected = astral_sun.sun(svc.location.observer, date=date.today(), tzinfo=svc._tz)["sunset"]
+    assert svc._get_sunset_time() == expected
+    assert svc._get_sunset_time() is svc._cached_sunset_time
+
+
+def test_fallback_sunset_without_astral(tmp_path, monkeypatch):
+    monkeypatch.setattr(ac_mod, "ASTRAL_AVAILABLE", False)
+    svc = AutoControlService(
+        miner_service=MagicMock(),
+        battery_service=MagicMock(),
+        state_manager=StateManager(path=str(tmp_path / "state.json")),
+        base_watts=3600,
+        min_interval_sec=60,
+        mode="away",
+        away_config={},
+        location_config={"timezone": "America/Denver"},
+        sunset_hour=18,
+        sunset_minute=45,
+    )
+    sunset = svc._get_sunset_time()
+    assert (sunset.date(), sunset.hour, sunset.minute) == (date.today(), 18, 45)
+    assert sunset.tzinfo is svc._tz
+
+
+def test_sunset_str_formatted_once_per_sunset(svc):
+    _pin_sunset(svc, timedelta(hours=1))
+    first = svc._sunset_str(svc._cached_sunset_time)
+    assert first == svc._cached_sunset_time.strftime("%H:%M:%S")
+    assert svc._sunset_str(svc._cached_sunset_time) is first
+
+    _pin_sunset(svc, timedelta(hours=2))
+    assert svc.get_state()["sunset_time"] == svc._cached_sunset_time.strftime("%H:%M:%S")
+    assert svc._sunset_str(None) is None
@@ -185,6 +185,45 @@ def test_missing_keys_blank(tmp_path):
     assert data[header.index("units")] == ""
 
 
+def test_handle_reused_across_writes(tmp_path):
+    """Consecutive writes share one open handle and the header is written once."""
+    log_file = str(tmp_path / "eg4_battery_log.csv")
+    svc = _make_service(log_file)
+
+    svc._log_to_csv(_sample_snap())
+    fh = svc._csv_fh
+    svc._log_to_csv(_sample_snap())
+
+    assert svc._csv_fh is fh
+    with open(log_file, "r", newline="") as f:
+        rows = list(csv.reader(f))
+    assert len(rows) == 3 and rows[0] == CSV_FIELDNAMES
+
+    svc._close_csv()
+    svc._log_to_csv(_sample_snap())
+    with open(log_file, "r", newline="") as f:
+        assert len(list(csv.reader(f))) == 4, "reopen must not repeat the header"
+
+
+def test_reconcile_closes_open_handle(tmp_path):
+    """Archiving a legacy file must not leave the writer pointed at the archive."""
+    log_file = str(tmp_path / "eg4_battery_log.csv")
+    with open(log_file, "w", newline="") as f:
+        csv.writer(f).writerow(LEGACY_HEADER)
+
+    svc = _make_service(log_file)
+    svc._csv_fh = open(log_file, "a", newline="")
+    svc._csv_writer = csv.DictWriter(svc._csv_fh, fieldnames=CSV_FIELDNAMES)
+    svc._reconcile_csv_schema()
+    assert svc._csv_fh is None
+
+    svc._log_to_csv(_sample_snap())
+    svc._close_csv()
+    with open(log_file, "r", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == CSV_FIELDNAMES and len(rows) == 2
+
+
 def _sample_snap_values() -> list:
     """Return the values of _sample_snap() as a positional row for the canonical schema."""
     snap = _sample_snap()
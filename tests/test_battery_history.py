@@ -0,0 +1,52 @@
+"""Tests for BatteryService live history.
+
+Coverage:
+  - history is bounded (default: 24h of samples; explicit max_history)
+  - accepted snapshots are sampled into history every history_sample_sec,
+    while latest and snapshot_revision advance on every one
+  - rows are stored as tuples and returned as dicts with the chart fields
+  - keys missing from a snapshot come back as None
+"""
+from __future__ import annotations
+
+from services.battery_service import _HISTORY_FIELDS, BatteryService
+
+
+def _svc(tmp_path, **kw):
+    return BatteryService(username="u", password="p", base_url="http://x",
+                          poll_seconds=10, log_file=str(tmp_path / "b.csv"), **kw)
+
+
+def test_default_window_is_one_day_of_samples(tmp_path):
+    assert _svc(tmp_path).history.maxlen == 1440
+    assert _svc(tmp_path, history_sample_sec=10).history.maxlen == 8640
+
+
+def test_snapshots_sampled_into_history(tmp_path):
+    svc = _svc(tmp_path, history_sample_sec=30)  # every 3rd poll at 10s
+    for i in range(7):
+        svc._accept_snapshot({"ts": f"t{i}", "soc_percent": i})
+
+    assert [r["ts"] for r in svc.get_history()] == ["t0", "t3", "t6"]
+    assert svc.history_revision == 3
+    assert svc.snapshot_revision == 7
+    assert svc.latest["ts"] == "t6"
+
+
+def test_history_rolls_and_converts(tmp_path):
+    svc = _svc(tmp_path, max_history=3)
+    for i in range(5):
+        snap = {"ts": f"t{i}", "soc_percent": i, "pv_power_w": 1, "load_power_w": 2,
+                "battery_net_w": 3, "pack_voltage_v": 52.0}
+        svc.history.append(tuple(map(snap.get, _HISTORY_FIELDS)))
+
+    rows = svc.get_history()
+    assert [r["ts"] for r in rows] == ["t2", "t3", "t4"]
+    assert set(rows[0]) == set(_HISTORY_FIELDS)
+    assert rows[-1]["soc_percent"] == 4
+
+
+def test_missing_keys_are_none(tmp_path):
+    svc = _svc(tmp_path)
+    svc.history.append(tuple(map({"ts": "t", "soc_percent": 50}.get, _HISTORY_FIELDS)))
+    assert svc.get_history()[0]["battery_net_w"] is None
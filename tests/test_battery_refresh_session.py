@@ -0,0 +1,51 @@
+"""Tests for BatteryService.refresh_session.
+
+Coverage:
+  - a successful reauth() keeps the existing client
+  - reauth() raising or returning no data falls back to recreating the client
+"""
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from services import battery_service as bs_mod
+from services.battery_service import BatteryService
+
+
+@pytest.fixture
+def svc(tmp_path):
+    s = BatteryService(username="u", password="p", base_url="http://x",
+                       poll_seconds=10, log_file=str(tmp_path / "b.csv"))
+    s.client = MagicMock()
+    return s
+
+
+def test_reauth_keeps_client(svc, monkeypatch):
+    old = svc.client
+    old.reauth.return_value = True
+    monkeypatch.setattr(bs_mod, "EG4Client", MagicMock(side_effect=AssertionError("recreated")))
+
+    assert svc.refresh_session() is True
+    assert svc.client is old
+    old.stop.assert_not_called()
+    assert svc._last_auth_time > 0
+
+
+@pytest.mark.parametrize("outcome", [RuntimeError("loop not running"), False])
+def test_falls_back_to_new_client(svc, monkeypatch, outcome):
+    old = svc.client
+    if isinstance(outcome, Exception):
+        old.reauth.side_effect = outcome
+    else:
+        old.reauth.return_value = outcome
+    new = MagicMock()
+    new.get_latest.return_value = {"soc_percent": 80}
+    monkeypatch.setattr(bs_mod, "EG4Client", MagicMock(return_value=new))
+    svc._stop_evt.set()  # skip the settle wait
+
+    assert svc.refresh_session() is True
+    old.stop.assert_called_once()
+    assert svc.client is new
+    new.start.assert_called_once()
@@ -0,0 +1,120 @@
+"""Tests for the /api/chart-data merge helper.
+
+Coverage:
+  - timestamps from both sources are normalized to UTC and merged in order
+  - live rows override CSV rows at the same timestamp
+  - numeric fields are converted; blanks and junk become None
+  - fan speed is taken from the first fan/rpm column that parses
+  - alternate column names (Env Temperature, Chip Temp Avg)
+  - rows with missing or unparseable timestamps are dropped
+  - timestamp normalization is memoized across requests
+  - the merge index can be consumed lazily one point at a time
+"""
+from utils.chart_data import (
+    build_chart_data,
+    index_chart_rows,
+    iter_chart_points,
+    normalize_timestamp,
+)
+
+
+def test_normalize_timestamp_variants():
+    assert normalize_timestamp("2025-08-30T17:30:16-04:00") == "2025-08-30T21:30:16+00:00"
+    assert normalize_timestamp("2025-08-30T04:47:24") == "2025-08-30T04:47:24+00:00"
+    assert normalize_timestamp("2025-08-30T04:47:24Z") == "2025-08-30T04:47:24+00:00"
+    assert normalize_timestamp("") is None
+    assert normalize_timestamp(None) is None
+    assert normalize_timestamp("garbage") is None
+
+
+def test_sources_merge_on_normalized_timestamp():
+    miner = [{"ts": "2025-08-30T17:30:00-04:00", "Hashrate": "180.5", "Power": "3400"}]
+    battery = [
+        {"ts": "2025-08-30T21:30:00+00:00", "soc_percent": "77", "pv_power_w": "5000",
+         "load_power_w": "3600", "battery_net_w": "-1400"},
+        {"ts": "2025-08-30T21:29:00+00:00", "soc_percent": "76"},
+    ]
+
+    data = build_chart_data(miner, [], battery, [])
+
+    assert [d["timestamp"] for d in data] == [
+        "2025-08-30T21:29:00+00:00",
+        "2025-08-30T21:30:00+00:00",
+    ]
+    first, second = data
+    assert first["hash_rate"] is None and first["battery_soc"] == 76.0
+    assert second == {
+        "timestamp": "2025-08-30T21:30:00+00:00",
+        "hash_rate": 180.5,
+        "miner_power": 3400.0,
+        "fan_speed": None,
+        "env_temp": None,
+        "miner_temp": None,
+        "battery_soc": 77.0,
+        "pv_power": 5000.0,
+        "eps_power": 3600.0,
+        "net_power": -1400.0,
+    }
+
+
+def test_live_row_overrides_csv_row():
+    csv_rows = [{"ts": "2025-08-30T21:30:00+00:00", "soc_percent": "10"}]
+    live = [{"ts": "2025-08-30T17:30:00-04:00", "soc_percent": 55.5}]
+
+    data = build_chart_data([], [], csv_rows, live)
+
+    assert len(data) == 1
+    assert data[0]["battery_soc"] == 55.5
+
+
+def test_blank_and_junk_values_become_none():
+    miner = [{"ts": "2025-08-30T21:30:00+00:00", "Hashrate": "", "Power": "n/a"}]
+
+    data = build_chart_data(miner, [], [], [])
+
+    assert data[0]["hash_rate"] is None
+    assert data[0]["miner_power"] is None
+
+
+def test_fan_speed_and_alternate_columns():
+    miner = [{
+        "ts": "2025-08-30T21:30:00+00:00",
+        "Fan Speed In": "",
+        "Fan Speed Out": "4200",
+        "Env Temperature": "31.5",
+        "Chip Temp Avg": "68.25",
+    }]
+
+    row = build_chart_data(miner, [], [], [])[0]
+
+    assert row["fan_speed"] == 4200
+    assert row["env_temp"] == 31.5
+    assert row["miner_temp"] == 68.25
+
+
+def test_rows_without_timestamp_dropped():
+    miner = [{"Power": "3400"}, {"ts": "bad", "Power": "1"}]
+    assert build_chart_data(miner, [], [], []) == []
+
+
+def test_normalize_timestamp_is_memoized():
+    normalize_timestamp.cache_clear()
+    normalize_timestamp("2025-08-30T17:30:16-04:00")
+    normalize_timestamp("2025-08-30T17:30:16-04:00")
+    info = normalize_timestamp.cache_info()
+    assert info.hits == 1 and info.misses == 1
+
+
+def test_index_then_lazy_points():
+    miner = [{"ts": "2025-08-30T21:30:00+00:00", "Power": "3400"}]
+    battery = [{"ts": "2025-08-30T21:31:00+00:00", "soc_percent": "70"}]
+
+    index = index_chart_rows(miner, [], battery, [])
+
+    assert [(ts, m is not None, b is not None) for ts, m, b in index] == [
+        ("2025-08-30T21:30:00+00:00", True, False),
+        ("2025-08-30T21:31:00+00:00", False, True),
+    ]
+    points = iter_chart_points(index)
+    assert next(points)["miner_power"] == 3400.0
+    assert next(points)["battery_soc"] == 70.0
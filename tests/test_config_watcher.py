@@ -0,0 +1,96 @@
+"""Tests for config.watcher (optional watchdog-driven settings reload).
+
+The handler is exercised directly with stand-in events, so these run
+whether or not watchdog is installed.
+
+Coverage:
+  - events for other files, and read-only events, are ignored
+  - a burst of events is debounced into one reload with fresh settings
+  - rename events match on dest_path
+  - a broken config is reported and does not call on_change
+  - start_config_watcher returns None without watchdog
+"""
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from config import watcher
+from config.settings import load_settings
+from config.watcher import _ConfigChangeHandler, start_config_watcher
+
+GOOD = "miner:\n  host: {host}\nbattery:\n  user: u\n  password: p\n"
+
+
+@pytest.fixture(autouse=True)
+def _clean(monkeypatch):
+    for name in ("WM_HOST", "EG4_USER", "EG4_PASS"):
+        monkeypatch.delenv(name, raising=False)
+    load_settings.cache_clear()
+
+
+def _event(src, dest=None, event_type="modified"):
+    return SimpleNamespace(event_type=event_type, src_path=str(src),
+                           dest_path=str(dest) if dest else None)
+
+
+def _handler(tmp_path, calls):
+    path = tmp_path / "config.yaml"
+    path.write_text(GOOD.format(host="10.0.0.1"))
+    return path, _ConfigChangeHandler(path, calls.append, debounce_sec=0.05)
+
+
+def _wait_for(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if cond():
+            return True
+        time.sleep(0.01)
+    return cond()
+
+
+def test_unrelated_file_ignored(tmp_path):
+    calls = []
+    _, handler = _handler(tmp_path, calls)
+    handler.on_any_event(_event(tmp_path / "other.yaml"))
+    handler.on_any_event(_event(tmp_path / "config.yaml", event_type="opened"))
+    handler.on_any_event(_event(tmp_path / "config.yaml", event_type="closed_no_write"))
+    time.sleep(0.15)
+    assert calls == []
+
+
+def test_burst_debounced_into_one_reload(tmp_path):
+    calls = []
+    path, handler = _handler(tmp_path, calls)
+    for _ in range(5):
+        handler.on_any_event(_event(path))
+    path.write_text(GOOD.format(host="10.0.0.2"))
+    handler.on_any_event(_event(path))
+
+    assert _wait_for(lambda: calls)
+    time.sleep(0.15)
+    assert len(calls) == 1
+    assert calls[0].miner.host == "10.0.0.2"
+
+
+def test_rename_matches_dest_path(tmp_path):
+    calls = []
+    path, handler = _handler(tmp_path, calls)
+    handler.on_any_event(_event(tmp_path / ".config.yaml.swp", dest=path, event_type="moved"))
+    assert _wait_for(lambda: calls)
+
+
+def test_broken_config_keeps_previous(tmp_path, capsys):
+    calls = []
+    path, handler = _handler(tmp_path, calls)
+    path.write_text("miner:\n  host: h\n")  # no battery creds -> ValueError
+    handler.on_any_event(_event(path))
+    assert _wait_for(lambda: "Reload of" in capsys.readouterr().out)
+    assert calls == []
+
+
+def test_start_without_watchdog_returns_none(monkeypatch):
+    monkeypatch.setattr(watcher, "WATCHDOG_AVAILABLE", False)
+    assert start_config_watcher(lambda s: None) is None
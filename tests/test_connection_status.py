@@ -0,0 +1,22 @@
+"""Tests for models.device.ConnectionStatus.
+
+Coverage:
+  - last_seen is an epoch float, rendered as UTC ISO 8601 on demand
+  - never-seen status renders None
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from models.device import ConnectionStatus
+
+
+def test_last_seen_iso_renders_utc():
+    status = ConnectionStatus(connected=True, last_seen=1_700_000_000.25)
+    iso = status.last_seen_iso()
+    assert iso == "2023-11-14T22:13:20.250000+00:00"
+    assert datetime.fromisoformat(iso).tzinfo == timezone.utc
+
+
+def test_never_seen_is_none():
+    assert ConnectionStatus(connected=False).last_seen_iso() is None
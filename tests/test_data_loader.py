@@ -0,0 +1,253 @@
+"""Tests for DataLoader CSV preloading.
+
+Coverage:
+  - rows older than the day-aligned cutoff are dropped
+  - the three timestamp layouts (ts column, date+time columns, full
+    timestamp in the date column) all load and gain a "ts" field
+  - non-ASCII content survives the binary read + UTF-8 decode path
+  - a missing file returns an empty list
+  - get_stats() reports counters from the last load pass
+  - bad timestamps are counted into the one-line load summary, not
+    printed per row
+  - file_signature() changes when a row is appended
+  - _parse_ts handles Z / naive / offset timestamps and is memoized
+  - old rows with a UTC or local offset are dropped on a string compare
+    against the cutoff in their own offset; naive rows are still parsed
+  - large files seek to the cutoff and load the same rows as a full scan
+  - short/long/blank records load exactly as csv.DictReader reads them,
+    and rows dropped by the cutoff are never turned into dicts
+"""
+import csv
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from services import data_loader as dl_mod
+from services.data_loader import DataLoader
+
+
+def _iso(dt: datetime) -> str:
+    return dt.astimezone().isoformat(timespec="seconds")
+
+
+def _write_csv(path, fieldnames, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+@pytest.fixture
+def loader(tmp_path):
+    return DataLoader(log_dir=str(tmp_path), default_days=3, max_days=30)
+
+
+def test_battery_rows_filtered_by_cutoff(loader):
+    now = datetime.now(timezone.utc)
+    recent = _iso(now - timedelta(hours=1))
+    old = _iso(now - timedelta(days=10))
+    _write_csv(loader.battery_log_file, ["ts", "soc_percent"], [
+        {"ts": old, "soc_percent": "40"},
+        {"ts": recent, "soc_percent": "55"},
+    ])
+
+    rows = loader.load_battery_data(3)
+
+    assert [r["ts"] for r in rows] == [recent]
+    assert rows[0]["soc_percent"] == "55"
+    assert loader.battery_loaded_days == 3
+
+
+def test_miner_date_time_columns(loader):
+    now = datetime.now(timezone.utc) - timedelta(hours=2)
+    _write_csv(loader.miner_log_file, ["date", "time", "Power"], [
+        {"date": now.strftime("%Y-%m-%d"), "time": now.strftime("%H:%M:%S"), "Power": "3400"},
+    ])
+
+    rows = loader.load_miner_data(3)
+
+    assert len(rows) == 1
+    assert rows[0]["ts"] == f"{now.strftime('%Y-%m-%d')}T{now.strftime('%H:%M:%S')}"
+
+
+def test_miner_full_timestamp_in_date_column(loader):
+    ts = _iso(datetime.now(timezone.utc) - timedelta(hours=2))
+    _write_csv(loader.miner_log_file, ["date", "time", "Power"], [
+        {"date": ts, "time": "ignored", "Power": "3400"},
+    ])
+
+    rows = loader.load_miner_data(3)
+
+    assert len(rows) == 1
+    assert rows[0]["ts"] == ts
+
+
+def test_utf8_content_round_trips(loader):
+    ts = _iso(datetime.now(timezone.utc))
+    _write_csv(loader.miner_log_file, ["ts", "Env Temp", "note"], [
+        {"ts": ts, "Env Temp": "31.5", "note": "fan ✓ °C"},
+    ])
+
+    rows = loader.load_miner_data(1)
+
+    assert rows[0]["note"] == "fan ✓ °C"
+
+
+def test_missing_file_returns_empty(loader):
+    assert not os.path.exists(loader.battery_log_file)
+    assert loader.load_battery_data(3) == []
+
+
+def test_stats_report_unparseable_rows_from_last_load(loader):
+    ts = _iso(datetime.now(timezone.utc))
+    _write_csv(loader.battery_log_file, ["ts", "soc_percent"], [
+        {"ts": ts, "soc_percent": "50"},
+        {"ts": "not-a-timestamp", "soc_percent": "51"},
+        {"ts": "", "soc_percent": "52"},
+    ])
+
+    loader.load_battery_data(3)
+    stats = loader.get_stats()
+
+    assert stats["battery_rows"] == {"rows": 1, "skipped": 2, "unparseable_ts": 2}
+    assert stats["miner_rows"] == {"rows": 0, "skipped": 0, "unparseable_ts": 0}
+
+
+def test_file_signature_changes_on_append(loader):
+    assert DataLoader.file_signature(loader.battery_log_file) is None
+    _write_csv(loader.battery_log_file, ["ts", "soc_percent"], [])
+    before = DataLoader.file_signature(loader.battery_log_file)
+
+    with open(loader.battery_log_file, "a", encoding="utf-8") as f:
+        f.write("2026-01-01T00:00:00+00:00,50\n")
+
+    after = DataLoader.file_signature(loader.battery_log_file)
+    assert before is not None and after != before
+
+
+def _hourly_rows(days):
+    start = datetime.now(timezone.utc) - timedelta(days=days)
+    return [{"ts": _iso(start + timedelta(hours=h)), "soc_percent": str(h % 100)}
+            for h in range(days * 24)]
+
+
+def test_large_file_seeks_to_cutoff(loader, monkeypatch, capsys):
+    _write_csv(loader.battery_log_file, ["ts", "soc_percent"], _hourly_rows(40))
+    full = loader.load_battery_data(5)
+
+    monkeypatch.setattr(dl_mod, "_SEEK_MIN_BYTES", 0)
+    monkeypatch.setattr(dl_mod, "_SEEK_RESOLUTION_BYTES", 256)
+    capsys.readouterr()
+    seeked = loader.load_battery_data(5)
+
+    assert seeked == full and len(full) > 100
+    assert "seeked past" in capsys.readouterr().out
+    # Only rows inside the one-day margin were parsed and dropped.
+    assert loader.get_stats()["battery_rows"]["skipped"] <= 2 * 24 + 1
+
+
+def test_seek_with_unparseable_rows_stays_conservative(loader, monkeypatch):
+    rows = _hourly_rows(20)
+    for i in range(0, len(rows), 7):
+        rows[i] = {"ts": "garbage", "soc_percent": "0"}
+    _write_csv(loader.battery_log_file, ["ts", "soc_percent"], rows)
+    full = loader.load_battery_data(3)
+
+    monkeypatch.setattr(dl_mod, "_SEEK_MIN_BYTES", 0)
+    monkeypatch.setattr(dl_mod, "_SEEK_RESOLUTION_BYTES", 128)
+    assert loader.load_battery_data(3) == full
+
+
+def test_parse_ts_forms_and_memo():
+    dl_mod._parse_ts.cache_clear()
+    z = dl_mod._parse_ts("2026-01-02T03:04:05Z")
+    naive = dl_mod._parse_ts("2026-01-02T03:04:05")
+    offset = dl_mod._parse_ts("2026-01-01T22:04:05-05:00")
+    assert z == naive == offset and naive.tzinfo is not None
+    assert dl_mod._parse_ts("2026-01-02T03:04:05Z") is z
+    with pytest.raises(ValueError):
+        dl_mod._parse_ts("not-a-timestamp")
+
+
+def test_old_rows_skip_parsing_in_any_offset(loader, monkeypatch):
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(days=10)
+    recent = now - timedelta(hours=1)
+    new_york = timezone(timedelta(hours=-4))
+    _write_csv(loader.battery_log_file, ["ts", "soc_percent"], [
+        {"ts": old.isoformat(timespec="seconds"), "soc_percent": "1"},
+        {"ts": old.strftime("%Y-%m-%dT%H:%M:%SZ"), "soc_percent": "2"},
+        {"ts": old.astimezone(new_york).isoformat(), "soc_percent": "3"},
+        {"ts": old.astimezone(timezone(timedelta(hours=5, minutes=30))).isoformat(),
+         "soc_percent": "4"},
+        {"ts": old.replace(tzinfo=None).isoformat(timespec="seconds"), "soc_percent": "5"},
+        {"ts": recent.astimezone(new_york).isoformat(timespec="seconds"), "soc_percent": "6"},
+    ])
+    parsed = []
+    real = dl_mod._parse_ts
+    monkeypatch.setattr(dl_mod, "_parse_ts", lambda s: parsed.append(s) or real(s))
+
+    rows = loader.load_battery_data(3)
+
+    assert [r["soc_percent"] for r in rows] == ["6"]
+    assert len(parsed) == 2  # the naive row and the kept row
+    assert loader.get_stats()["battery_rows"]["skipped"] == 5
+
+
+def test_offset_prefix_keeps_rows_just_past_cutoff():
+    cutoff = datetime(2026, 10, 10, tzinfo=timezone.utc)
+    cache = {}
+    # 21:00-04:00 on the 9th is 01:00Z on the 10th: after the cutoff,
+    # although it sorts before the cutoff's UTC string.
+    after = "2026-10-09T21:00:00-04:00"
+    before = "2026-10-09T19:59:59-04:00"
+    prefix = dl_mod._cutoff_prefix(cutoff, after, cache)
+    assert prefix == "2026-10-09T20:00:00"
+    assert not after[:19] < prefix and before[:19] < prefix
+    assert dl_mod._cutoff_prefix(cutoff, "2026-10-09T23:00:00Z", cache) == "2026-10-10T00:00:00"
+    assert dl_mod._cutoff_prefix(cutoff, "2026-10-09T21:00:00.5+05:30", cache) == "2026-10-10T05:30:00"
+    assert set(cache) == {"-04:00", "Z", "+05:30"}
+    assert dl_mod._cutoff_prefix(cutoff, "2026-10-09T21:00:00", cache) is None
+    assert dl_mod._cutoff_prefix(cutoff, "2026-10-09T21:00:00.123456", cache) is None
+    assert set(cache) == {"-04:00", "Z", "+05:30"}
+    assert dl_mod._cutoff_prefix(cutoff, "2026-10-09 21:00:00-04:00", {}) is None
+
+
+def test_ragged_rows_match_dictreader(loader):
+    recent = _iso(datetime.now(timezone.utc) - timedelta(hours=1))
+    with open(loader.battery_log_file, "w", newline="", encoding="utf-8") as f:
+        f.write("ts,soc_percent,pv_power_w\n")
+        f.write(f"{recent},50\n")
+        f.write(f"{recent},51,900,extra\n")
+        f.write("\n")
+        f.write(f"{recent},52,800\n")
+    with open(loader.battery_log_file, newline="", encoding="utf-8") as f:
+        expected = list(csv.DictReader(f))
+
+    assert loader.load_battery_data(3) == expected
+
+
+def test_old_rows_never_become_dicts(loader, monkeypatch):
+    now = datetime.now(timezone.utc)
+    _write_csv(loader.battery_log_file, ["ts", "soc_percent"], [
+        {"ts": _iso(now - timedelta(days=10, hours=h)), "soc_percent": "1"} for h in range(5)
+    ] + [{"ts": _iso(now - timedelta(hours=1)), "soc_percent": "2"}])
+    built = []
+    real = dl_mod._row_dict
+    monkeypatch.setattr(dl_mod, "_row_dict", lambda h, f: built.append(f) or real(h, f))
+
+    assert [r["soc_percent"] for r in loader.load_battery_data(3)] == ["2"]
+    assert len(built) == 1
+
+
+def test_bad_timestamps_reported_once_in_summary(loader, capsys):
+    recent = _iso(datetime.now(timezone.utc) - timedelta(hours=1))
+    _write_csv(loader.battery_log_file, ["ts", "soc_percent"],
+               [{"ts": "garbage", "soc_percent": "0"}] * 50 + [{"ts": recent, "soc_percent": "1"}])
+
+    loader.load_battery_data(3)
+
+    out = capsys.readouterr().out
+    assert "garbage" not in out
+    assert "50 with bad timestamps" in out
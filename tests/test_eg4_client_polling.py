@@ -0,0 +1,272 @@
+"""Tests for the EG4Client poll path: merge, poll scheduling and history.
+
+Fed with the eg4_inverter_api model objects the live poller receives and
+with plain dicts, which must merge identically.
+
+Coverage:
+  - _num numeric coercion (ints/floats fast path, strings parsed, junk -> None)
+  - PV sum over ppv1..3, EPS load with pToUser fallback, battery net power
+  - SOC from remain/full capacity, falling back to the per-unit mean
+  - pack voltage/current from the *Text fields, per-unit voltage fallback
+  - units list shape; unchanged units reuse the previous list, changed
+    units never alter an earlier snapshot
+  - _next_poll_delay doubles on failure up to the cap, resets on success
+  - _is_auth_error separates session failures from transient errors
+  - battery and runtime are fetched concurrently; a failure still raises
+  - reauth() logs in on the running loop, re-selects the inverter and
+    polls once; it refuses when the loop is not running
+  - get_history returns the newest `limit` snapshots, oldest first, rebuilt
+    from compact history rows
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from eg4_inverter_api import EG4APIError, EG4AuthError
+from eg4_inverter_api.models import BatteryData, BatteryUnit, RuntimeData
+
+from eg4_client import (
+    POLL_BACKOFF_MAX_SEC,
+    _HISTORY_FIELDS,
+    EG4Client,
+    _history_row,
+    _is_auth_error,
+    _num,
+    _next_poll_delay,
+)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    (3200, 3200.0), (54.6, 54.6), ("53.1", 53.1), (True, 1.0),
+    (None, None), ("", None), ("n/a", None), ([], None),
+])
+def test_num(raw, expected):
+    assert _num(raw) == expected
+    assert _num(raw) is None or type(_num(raw)) is float
+
+
+@pytest.fixture
+def client():
+    return EG4Client(username="u", password="p")
+
+
+def _runtime(**kw):
+    base = dict(ppv1=1000, ppv2=2000, ppv3=None, pEpsL1N=300, pEpsL2N=200,
+                pToUser=999, pToGrid=0, acCouplePower=50, pCharge=1500, pDisCharge=0)
+    base.update(kw)
+    return base
+
+
+def _units():
+    return [
+        dict(batterySn="A1", soc=80, totalVoltage=5300, current=10),
+        dict(batterySn="A2", soc=90, totalVoltage=5310, current=11),
+    ]
+
+
+def _battery(**kw):
+    base = dict(remainCapacity=150, fullCapacity=200, totalNumber=2,
+                totalVoltageText="53.1", currentText="21.0",
+                battery_units=_units())
+    base.update(kw)
+    return base
+
+
+def test_model_objects_and_dicts_merge_identically(client):
+    b, r = _battery(), _runtime()
+    model_batt = BatteryData(**{**b, "battery_units": [BatteryUnit(**u) for u in b["battery_units"]]})
+    model_rt = RuntimeData(**r)
+
+    from_models = client._merge_response(model_batt, model_rt)
+    from_dicts = client._merge_response(b, r)
+    from_models.pop("ts"), from_dicts.pop("ts")
+    assert from_models == from_dicts
+
+
+def test_power_fields(client):
+    m = client._merge_response(_battery(), _runtime())
+    assert m["pv_power_w"] == 3000.0
+    assert m["load_power_w"] == 500.0
+    assert m["grid_power_w"] == 0.0
+    assert m["ac_couple_w"] == 50.0
+    assert m["battery_net_w"] == 1500.0
+
+
+def test_load_falls_back_to_pToUser_without_eps(client):
+    m = client._merge_response(_battery(), _runtime(pEpsL1N=None, pEpsL2N=0))
+    assert m["load_power_w"] == 999.0
+
+
+def test_pv_falls_back_to_ppv_total(client):
+    m = client._merge_response(_battery(), _runtime(ppv1=None, ppv2=None, ppv=4200))
+    assert m["pv_power_w"] == 4200.0
+
+
+def test_pack_metrics_from_capacity_and_text_fields(client):
+    m = client._merge_response(_battery(), _runtime())
+    assert m["soc_percent"] == 75.0
+    assert m["pack_voltage_v"] == 53.1
+    assert m["pack_current_a"] == 21.0
+    assert m["units"] == [
+        {"sn": "A1", "soc": 80, "voltage_mv": 5300, "current_a": 10},
+        {"sn": "A2", "soc": 90, "voltage_mv": 5310, "current_a": 11},
+    ]
+
+
+def test_unchanged_units_reuse_list_changed_units_do_not_mutate(client):
+    first = client._merge_response(_battery(), _runtime())
+    same = client._merge_response(_battery(), _runtime())
+    assert same["units"] is first["units"]
+
+    units = _units()
+    units[0]["soc"] = 81
+    changed = client._merge_response(_battery(battery_units=units), _runtime())
+    assert changed["units"] is not first["units"]
+    assert changed["units"][0]["soc"] == 81
+    assert first["units"][0]["soc"] == 80
+
+
+def test_pack_metrics_fall_back_to_units(client):
+    b = _battery(remainCapacity=None, totalVoltageText=None, currentText=None)
+    m = client._merge_response(b, _runtime())
+    assert m["soc_percent"] == 85.0
+    assert m["pack_voltage_v"] == 106.1
+    assert m["pack_current_a"] is None
+
+
+def test_missing_fields_give_none(client):
+    m = client._merge_response({}, {})
+    assert tuple(m) == _HISTORY_FIELDS
+    assert m["soc_percent"] is None
+    assert m["pv_power_w"] is None
+    assert m["battery_net_w"] is None
+    assert m["units"] == []
+
+
+def test_get_history_returns_newest_limit_oldest_first():
+    client = EG4Client(username="u", password="p", history_max=5)
+    for i in range(8):
+        merged = client._merge_response(_battery(), _runtime(ppv1=i, ppv2=0))
+        client.history.append(_history_row(merged))
+
+    recent = client.get_history(3)
+    assert [h["pv_power_w"] for h in recent] == [5.0, 6.0, 7.0]
+    assert set(recent[0]) == set(_HISTORY_FIELDS)
+    assert recent[0]["units"][0]["sn"] == "A1"
+    assert [h["pv_power_w"] for h in client.get_history(100)] == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert client.get_history(0) == []
+    assert client.get_history(-1) == []
+
+
+def test_poll_delay_backs_off_on_failure_and_resets():
+    delay = 10
+    seen = []
+    for _ in range(6):
+        delay = _next_poll_delay(delay, 10, failed=True)
+        seen.append(delay)
+    assert seen == [20, 40, 80, POLL_BACKOFF_MAX_SEC, POLL_BACKOFF_MAX_SEC, POLL_BACKOFF_MAX_SEC]
+    assert _next_poll_delay(delay, 10, failed=False) == 10
+
+
+def test_poll_delay_never_drops_below_base():
+    assert _next_poll_delay(300, 300, failed=True) == 300
+
+
+@pytest.mark.parametrize("exc, expected", [
+    (EG4AuthError("Login failed. Please check your credentials."), True),
+    (EG4APIError("API request failed: 401"), True),
+    (EG4APIError("API request failed: 403 - Forbidden"), True),
+    (EG4APIError("API request failed: 502 - Bad Gateway"), False),
+    (TimeoutError(), False),
+    (OSError("Name or service not known"), False),
+])
+def test_is_auth_error(exc, expected):
+    assert _is_auth_error(exc) is expected
+
+
+class _FakeApi:
+    def __init__(self, delay=0.05, fail=None):
+        self.delay = delay
+        self.fail = fail
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _call(self, name, value):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail == name:
+                raise EG4APIError(f"{name} failed")
+            return value
+        finally:
+            self.in_flight -= 1
+
+    async def get_inverter_battery_async(self):
+        return await self._call("battery", _battery())
+
+    async def get_inverter_runtime_async(self):
+        return await self._call("runtime", _runtime())
+
+
+def test_battery_and_runtime_fetched_concurrently(client):
+    client._api = _FakeApi()
+    batt, runtime = asyncio.run(client._fetch_battery_and_runtime())
+    assert batt["fullCapacity"] == 200 and runtime["ppv1"] == 1000
+    assert client._api.max_in_flight == 2
+
+
+@pytest.mark.parametrize("which", ["battery", "runtime"])
+def test_fetch_failure_propagates(client, which):
+    client._api = _FakeApi(delay=0, fail=which)
+    with pytest.raises(EG4APIError, match=which):
+        asyncio.run(client._fetch_battery_and_runtime())
+
+
+class _LoginApi(_FakeApi):
+    def __init__(self):
+        super().__init__(delay=0)
+        self.calls = []
+
+    async def login(self, ignore_ssl=False):
+        self.calls.append("login")
+
+    def get_inverters(self):
+        self.calls.append("get_inverters")
+        return [object()]
+
+    def set_selected_inverter(self, inverterIndex=0):
+        self.calls.append("select")
+
+    # The poll path sees library model objects, not the raw dicts.
+    async def get_inverter_battery_async(self):
+        b = _battery()
+        return BatteryData(**{**b, "battery_units": [BatteryUnit(**u) for u in b["battery_units"]]})
+
+    async def get_inverter_runtime_async(self):
+        return RuntimeData(**_runtime())
+
+
+def test_reauth_requires_running_loop(client):
+    with pytest.raises(RuntimeError):
+        client.reauth()
+
+
+def test_reauth_logs_in_and_polls_on_running_loop(client):
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        client._loop = loop
+        client._api = _LoginApi()
+        assert client.reauth(timeout=5) is True
+        assert client._api.calls == ["login", "get_inverters", "select"]
+        assert client.get_latest()["soc_percent"] is not None
+        assert len(client.history) == 1
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
@@ -0,0 +1,42 @@
+"""Tests for utils.error_throttle.ErrorThrottle.
+
+Coverage:
+  - first occurrence prints a traceback; identical repeats are suppressed
+  - a different error prints immediately
+  - after the interval the repeat prints again with the suppressed count
+"""
+from __future__ import annotations
+
+from utils import error_throttle
+from utils.error_throttle import ErrorThrottle
+
+
+def _raise(exc):
+    try:
+        raise exc
+    except Exception as e:
+        return e
+
+
+def test_repeats_suppressed_until_interval(capsys, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(error_throttle.time, "monotonic", lambda: clock[0])
+    t = ErrorThrottle(interval_sec=60)
+
+    assert t.report(_raise(OSError("down"))) is True
+    assert "Traceback" in capsys.readouterr().err
+    assert t.report(_raise(OSError("down"))) is False
+    assert t.report(_raise(OSError("down"))) is False
+    assert capsys.readouterr().err == ""
+
+    clock[0] += 61
+    assert t.report(_raise(OSError("down"))) is True
+    out = capsys.readouterr()
+    assert "repeated 2 times" in out.out and "OSError: down" in out.err
+
+
+def test_new_error_prints_immediately(capsys):
+    t = ErrorThrottle(interval_sec=3600)
+    assert t.report(_raise(OSError("down"))) is True
+    assert t.report(_raise(ValueError("bad"))) is True
+    assert "ValueError: bad" in capsys.readouterr().err
@@ -0,0 +1,38 @@
+"""Tests for the ISO 8601 parsing helper.
+
+Coverage:
+  - offset, naive and Z-suffixed timestamps parse on the stdlib path
+  - garbage raises ValueError
+  - the ciso8601 path (when installed) agrees with the stdlib path
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from utils import iso_time
+
+SAMPLES = [
+    "2025-08-30T17:30:16-04:00",
+    "2025-08-30T04:47:24",
+    "2025-08-30T04:47:24Z",
+    "2025-08-30T04:47:24.123456+00:00",
+]
+
+
+def test_stdlib_parse():
+    p = iso_time._py_parse
+    assert p("2025-08-30T17:30:16-04:00") == datetime(
+        2025, 8, 30, 17, 30, 16, tzinfo=timezone(timedelta(hours=-4)))
+    assert p("2025-08-30T04:47:24").tzinfo is None
+    assert p("2025-08-30T04:47:24Z") == datetime(2025, 8, 30, 4, 47, 24, tzinfo=timezone.utc)
+
+
+def test_garbage_raises_value_error():
+    with pytest.raises(ValueError):
+        iso_time.parse_iso("not-a-timestamp")
+
+
+def test_ciso8601_matches_stdlib():
+    ciso8601 = pytest.importorskip("ciso8601")
+    for s in SAMPLES:
+        assert ciso8601.parse_datetime(s) == iso_time._py_parse(s)
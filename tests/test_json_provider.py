@@ -0,0 +1,70 @@
+"""Tests for the orjson-backed Flask JSON provider.
+
+Coverage:
+  - jsonify() output round-trips through the provider
+  - key order is preserved (no sorting)
+  - non-string dict keys are stringified like the stdlib encoder does
+  - values orjson rejects fall back to the stdlib encoder
+  - request bodies are decoded via the provider
+  - the stdlib path is used when orjson is unavailable
+"""
+from __future__ import annotations
+
+import json
+
+import pytest
+from flask import Flask, jsonify, request
+
+from utils import json_provider
+from utils.json_provider import OrjsonProvider
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+
+    @app.get("/rows")
+    def rows():
+        return jsonify({"data": [{"ts": "2026-01-01T00:00:00+00:00", "b": 1, "a": None}], "count": 1})
+
+    @app.get("/int-keys")
+    def int_keys():
+        return jsonify({1: "one"})
+
+    @app.get("/bigint")
+    def bigint():
+        return jsonify({"n": 2 ** 70})
+
+    @app.post("/echo")
+    def echo():
+        return jsonify(request.get_json())
+
+    return app
+
+
+def test_rows_round_trip_in_insertion_order(app):
+    resp = app.test_client().get("/rows")
+    assert resp.mimetype == "application/json"
+    assert resp.get_json()["data"][0] == {"ts": "2026-01-01T00:00:00+00:00", "b": 1, "a": None}
+    assert resp.data.index(b'"b"') < resp.data.index(b'"a"')
+
+
+def test_non_string_keys(app):
+    assert app.test_client().get("/int-keys").get_json() == {"1": "one"}
+
+
+def test_bigint_falls_back_to_stdlib(app):
+    resp = app.test_client().get("/bigint")
+    assert json.loads(resp.data) == {"n": 2 ** 70}
+
+
+def test_request_body_decoded(app):
+    resp = app.test_client().post("/echo", json={"mode": "away"})
+    assert resp.get_json() == {"mode": "away"}
+
+
+def test_stdlib_path_without_orjson(app, monkeypatch):
+    monkeypatch.setattr(json_provider, "ORJSON_AVAILABLE", False)
+    resp = app.test_client().get("/rows")
+    assert resp.get_json()["count"] == 1
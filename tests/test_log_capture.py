@@ -0,0 +1,89 @@
+"""Tests for the dashboard log buffer and stdout capture.
+
+Coverage:
+  - the background consumer moves queued messages into the buffer
+  - captured text is classified by content; explicit add() levels are kept
+  - get_recent() returns the newest entries oldest-first, bounded by maxlen
+  - LogCapture forwards everything (including newlines) to the real stream
+    and skips blank writes for the buffer
+  - clear() empties the buffer
+"""
+import io
+import time
+from datetime import datetime
+
+from utils.log_capture import LogBuffer, LogCapture, classify_level
+
+
+def _recent_when_settled(buf, expected, count=200):
+    """Wait for the consumer thread to process `expected` messages."""
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline and buf._queue.qsize():
+        time.sleep(0.001)
+    # qsize() hits 0 as the last item is taken; give _append a moment.
+    while time.monotonic() < deadline and len(buf.logs) < expected:
+        time.sleep(0.001)
+    return buf.get_recent(count)
+
+
+def test_add_reaches_reader():
+    buf = LogBuffer()
+    buf.add("hello", "info")
+    [entry] = _recent_when_settled(buf, 1)
+    assert entry["message"] == "hello"
+    assert entry["level"] == "info"
+    # Formatted on read as local ISO time, like datetime.now().isoformat().
+    assert datetime.fromisoformat(entry["timestamp"]).tzinfo is None
+
+
+def test_classify_level():
+    assert classify_level("[X] ERROR: boom", "info") == "error"
+    assert classify_level("[X] ✗ failed", "info") == "error"
+    assert classify_level("Warning: low SOC", "info") == "warning"
+    assert classify_level("[X] ✓ done", "info") == "success"
+    assert classify_level("Success!", "info") == "success"
+    assert classify_level("plain", "error") == "error"
+    assert classify_level("[X] ❌ boom", "info") == "error"
+
+
+def test_classify_level_precedence_ignores_position():
+    assert classify_level("✓ saved, success", "info") == "success"
+    assert classify_level("success then Warning", "info") == "warning"
+    assert classify_level("warning: error later", "info") == "error"
+
+
+def test_explicit_level_not_reclassified():
+    buf = LogBuffer()
+    buf.add("error mentioned but info level", "info")
+    assert _recent_when_settled(buf, 1)[0]["level"] == "info"
+
+
+def test_recent_is_newest_in_order_and_bounded():
+    buf = LogBuffer(maxlen=5)
+    for i in range(8):
+        buf.add(str(i))
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline and (not buf.logs or buf.logs[-1][1] != "7"):
+        time.sleep(0.001)
+    assert [e["message"] for e in buf.get_recent(3)] == ["5", "6", "7"]
+    assert [e["message"] for e in buf.get_recent(100)] == ["3", "4", "5", "6", "7"]
+
+
+def test_capture_forwards_and_buffers():
+    out = io.StringIO()
+    buf = LogBuffer()
+    cap = LogCapture(out, buf, "info")
+
+    print("[APP] ✓ started", file=cap)
+    print("", file=cap)
+
+    assert out.getvalue() == "[APP] ✓ started\n\n"
+    assert [(e["message"], e["level"]) for e in _recent_when_settled(buf, 1)] == [("[APP] ✓ started", "success")]
+
+
+def test_clear_empties_buffer():
+    buf = LogBuffer()
+    buf.add("a")
+    _recent_when_settled(buf, 1)
+    buf.clear()
+    assert buf.get_recent(10) == []
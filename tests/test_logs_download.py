@@ -0,0 +1,57 @@
+"""Tests for the /logs/<name>.csv download blueprint.
+
+A fake DataLoader points at CSVs in a temp directory.
+
+Coverage:
+  - /logs/miner.csv and /logs/battery.csv (the dashboard links) serve the
+    miner and battery CSVs as attachments
+  - a matching If-None-Match gets 304 with no body
+  - any other name is a 404, including the real file names
+"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+from api.logs import create_blueprint
+
+
+@pytest.fixture
+def client(tmp_path):
+    (tmp_path / "wm_status_log.csv").write_text("ts,Power\nt1,3400\n")
+    (tmp_path / "eg4_battery_log.csv").write_text("ts,soc\nt1,80\n")
+    loader = SimpleNamespace(
+        miner_log_file=str(tmp_path / "wm_status_log.csv"),
+        battery_log_file=str(tmp_path / "eg4_battery_log.csv"),
+    )
+    app = Flask(__name__)
+    app.register_blueprint(create_blueprint(loader))
+    return app.test_client()
+
+
+@pytest.mark.parametrize("name, filename, body", [
+    ("miner", "wm_status_log.csv", b"ts,Power\nt1,3400\n"),
+    ("battery", "eg4_battery_log.csv", b"ts,soc\nt1,80\n"),
+])
+def test_dashboard_links_serve_log_files(client, name, filename, body):
+    resp = client.get(f"/logs/{name}.csv")
+    assert resp.status_code == 200
+    assert resp.data == body
+    assert "attachment" in resp.headers["Content-Disposition"]
+    assert filename in resp.headers["Content-Disposition"]
+    assert resp.headers["ETag"]
+
+
+def test_if_none_match_gets_304(client):
+    etag = client.get("/logs/miner.csv").headers["ETag"]
+    resp = client.get("/logs/miner.csv", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.data == b""
+
+
+@pytest.mark.parametrize("name", ["wm_status_log", "eg4_battery_log", "config", "..%2Fapp"])
+def test_unknown_names_404(client, name):
+    resp = client.get(f"/logs/{name}.csv")
+    assert resp.status_code == 404
@@ -0,0 +1,100 @@
+"""Tests for MinerController's pending-op queue.
+
+The worker is serial and each op takes seconds to apply and verify, so a
+burst of power-limit changes collapses to the newest one while stop and
+resume keep their place.
+
+Coverage:
+  - ops run in FIFO order on the worker thread
+  - a power_pct/power_limit op replaces one still waiting at the tail;
+    the replaced op's on_verified is never called
+  - stop/resume are never coalesced and are not jumped by later limit ops
+  - drain_queue drops everything still pending
+"""
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+from services.miner_service import MinerController
+
+
+class _RecordingController(MinerController):
+    """Records ops instead of talking to a miner; the first op blocks until
+    released so the test can stack up pending ops behind it."""
+
+    def __init__(self):
+        self.ran = []
+        self.release = threading.Event()
+        self.started = threading.Event()
+        super().__init__(api=MagicMock())
+
+    def _run_op(self, kind, req, on_verified=None):
+        self.started.set()
+        self.release.wait(timeout=5)
+        self.ran.append((kind, req))
+        if on_verified:
+            on_verified()
+
+
+def _wait_for(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if cond():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def _blocked_controller():
+    c = _RecordingController()
+    c.enqueue_set_power_pct(50)
+    assert c.started.wait(timeout=2)
+    return c
+
+
+def test_limit_ops_coalesce_between_stop_and_resume():
+    c = _blocked_controller()
+    verified = []
+    c.enqueue_set_power_pct(60, on_verified=lambda: verified.append(60))
+    c.enqueue_set_power_pct(70, on_verified=lambda: verified.append(70))
+    c.enqueue_stop()
+    c.enqueue_resume()
+    c.enqueue_set_power_pct(80)
+    c.enqueue_set_power_limit(3000)
+    c.release.set()
+
+    assert _wait_for(lambda: len(c.ran) == 5)
+    assert c.ran == [
+        ("power_pct", {"percent": 50}),
+        ("power_pct", {"percent": 70}),
+        ("stop", {}),
+        ("resume", {}),
+        ("power_limit", {"watts": 3000}),
+    ]
+    assert verified == [70]
+
+
+def test_stop_and_resume_are_not_coalesced():
+    c = _blocked_controller()
+    c.enqueue_stop()
+    c.enqueue_stop()
+    c.enqueue_resume()
+    c.release.set()
+
+    assert _wait_for(lambda: len(c.ran) == 4)
+    assert [k for k, _ in c.ran] == ["power_pct", "stop", "stop", "resume"]
+
+
+def test_drain_queue_drops_pending(capsys):
+    c = _blocked_controller()
+    c.enqueue_stop()
+    c.enqueue_set_power_pct(40)
+    c.drain_queue()
+    assert "Drained 2 pending op(s)" in capsys.readouterr().out
+
+    c.release.set()
+    c.enqueue_resume()
+    assert _wait_for(lambda: len(c.ran) == 2)
+    assert [k for k, _ in c.ran] == ["power_pct", "resume"]
@@ -0,0 +1,95 @@
+"""Tests for MinerService CSV logging and live history bounds.
+
+The service is constructed against a dummy host; start() is never called,
+so no poll thread or miner connection is involved.
+
+Coverage:
+  - the log file is opened once and kept across rows; the header is
+    written only for a new/empty file
+  - appending to an existing log does not repeat the header
+  - a row with a different key set is written with its own columns
+  - a write error closes the handle and the next row reopens it
+  - stop() closes the handle
+  - live history keeps 24h of polls by default, or max_history rows
+  - _now_iso stamps the poll's own epoch instant in local time
+"""
+from __future__ import annotations
+
+import csv
+from datetime import datetime
+
+import pytest
+
+from services.miner_service import MinerService
+
+
+@pytest.fixture
+def svc(tmp_path):
+    s = MinerService(host="127.0.0.1", password="x", poll_seconds=5,
+                     log_interval_sec=60, log_file=str(tmp_path / "logs" / "wm_status_log.csv"))
+    yield s
+    s._close_csv()
+
+
+def _read(path):
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_handle_kept_and_header_written_once(svc):
+    svc._log_to_csv({"ts": "t1", "Power": 3400})
+    fh = svc._csv_fh
+    svc._log_to_csv({"ts": "t2", "Power": 3300})
+
+    assert svc._csv_fh is fh
+    assert _read(svc.log_file) == [["ts", "Power"], ["t1", "3400"], ["t2", "3300"]]
+
+
+def test_existing_log_gets_no_second_header(svc):
+    svc._log_to_csv({"ts": "t1", "Power": 1})
+    svc._close_csv()
+    svc._log_to_csv({"ts": "t2", "Power": 2})
+    assert _read(svc.log_file) == [["ts", "Power"], ["t1", "1"], ["t2", "2"]]
+
+
+def test_changed_keys_follow_the_row(svc):
+    svc._log_to_csv({"ts": "t1", "Power": 1})
+    svc._log_to_csv({"ts": "t2", "Power": 2, "Efficiency": 20.5})
+    assert _read(svc.log_file)[-1] == ["t2", "2", "20.5"]
+
+
+def test_write_error_reopens_on_next_row(svc, capsys):
+    svc._log_to_csv({"ts": "t1", "Power": 1})
+    svc._csv_fh.close()  # simulate the handle going bad
+    svc._log_to_csv({"ts": "t2", "Power": 2})
+    assert "CSV logging error" in capsys.readouterr().out
+    assert svc._csv_fh is None
+
+    svc._log_to_csv({"ts": "t3", "Power": 3})
+    assert _read(svc.log_file)[-1] == ["t3", "3"]
+
+
+def test_stop_closes_handle(svc):
+    svc._log_to_csv({"ts": "t1", "Power": 1})
+    fh = svc._csv_fh
+    svc.stop()
+    assert fh.closed and svc._csv_fh is None
+
+
+def test_history_bounded_to_window(tmp_path):
+    s = MinerService(host="127.0.0.1", password="x", poll_seconds=10, log_interval_sec=60,
+                     log_file=str(tmp_path / "wm_status_log.csv"))
+    assert s.history.maxlen == 24 * 3600 // 10
+
+    s = MinerService(host="127.0.0.1", password="x", poll_seconds=10, log_interval_sec=60,
+                     log_file=str(tmp_path / "wm_status_log.csv"), max_history=3)
+    for i in range(5):
+        s.history.append({"ts": str(i)})
+    assert [r["ts"] for r in s.get_history()] == ["2", "3", "4"]
+
+
+def test_now_iso_formats_given_instant(svc):
+    now = 1_760_000_000.0
+    ts = svc._now_iso(now)
+    assert datetime.fromisoformat(ts).timestamp() == now
+    assert datetime.fromisoformat(svc._now_iso()).tzinfo is not None
@@ -0,0 +1,34 @@
+"""Tests for MinerService._extract_hashrate_ths.
+
+Coverage:
+  - TH/s, GH/s and MH/s fields convert to TH/s
+  - TH/s fields win over GH/s over MH/s, and 5s over av within a unit
+  - a non-numeric field falls through to the next key
+  - negative values and missing fields give None
+"""
+from __future__ import annotations
+
+import pytest
+
+from services.miner_service import MinerService
+
+
+@pytest.fixture(scope="module")
+def svc(tmp_path_factory):
+    return MinerService(host="127.0.0.1", password="x", poll_seconds=5, log_interval_sec=60,
+                        log_file=str(tmp_path_factory.mktemp("logs") / "wm_status_log.csv"))
+
+
+@pytest.mark.parametrize("item, expected", [
+    ({"THS 5s": "120.5"}, 120.5),
+    ({"GHS av": 120500}, 120.5),
+    ({"MHS 15m": 120500000}, 120.5),
+    ({"MHS 5s": 1e8, "GHS 5s": 1e5, "THS av": 90}, 90.0),
+    ({"MHS av": 2e8, "MHS 5s": 1e8}, 100.0),
+    ({"THS 5s": "n/a", "GHS 5s": 110000}, 110.0),
+    ({"THS 5s": -1, "GHS 5s": 110000}, None),
+    ({"Power": 3400}, None),
+    (None, None),
+])
+def test_extract_hashrate_ths(svc, item, expected):
+    assert svc._extract_hashrate_ths(item) == expected
@@ -0,0 +1,139 @@
+"""Tests for the NCMinerAPI request transport.
+
+A loopback TCP server stands in for the miner's API port; nc itself is
+never run.
+
+Coverage:
+  - the socket transport sends the JSON command and parses the reply
+  - a reply is kept when the peer leaves the connection open past the
+    timeout; no reply at all reports a timeout
+  - a refused connection returns None from _send_command
+  - macOS and WM_USE_NC=1 select nc; other platforms use sockets
+  - nc failures surface as OSError/TimeoutError for the command paths
+  - the MD5-crypt password is computed once per (password, salt)
+"""
+from __future__ import annotations
+
+import json
+import socket
+import subprocess
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from utils import nc_miner_api as nc_mod
+from utils.nc_miner_api import NCMinerAPI
+
+
+class _FakeMiner:
+    """Accept one connection, record the request, send `reply`."""
+
+    def __init__(self, reply: bytes, hold_open: float = 0.0):
+        self.reply = reply
+        self.hold_open = hold_open
+        self.received = b""
+        self.srv = socket.create_server(("127.0.0.1", 0))
+        self.port = self.srv.getsockname()[1]
+        self.done = threading.Event()
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        conn, _ = self.srv.accept()
+        with conn:
+            self.received = conn.recv(4096)
+            if self.reply:
+                conn.sendall(self.reply)
+            self.done.wait(self.hold_open)
+        self.srv.close()
+
+
+def _api(port, timeout=2):
+    api = NCMinerAPI("127.0.0.1", port=port, timeout=timeout)
+    api.use_nc = False
+    return api
+
+
+def test_socket_round_trip():
+    reply = {"STATUS": [{"STATUS": "S"}], "SUMMARY": [{"Power": 3400}]}
+    miner = _FakeMiner(json.dumps(reply).encode())
+    assert _api(miner.port).summary() == reply
+    assert json.loads(miner.received) == {"command": "summary"}
+
+
+def test_reply_kept_when_peer_holds_connection_open():
+    miner = _FakeMiner(b'{"STATUS": "S"}', hold_open=5)
+    try:
+        assert _api(miner.port, timeout=0.3)._send_command("version") == {"STATUS": "S"}
+    finally:
+        miner.done.set()
+
+
+def test_no_reply_is_a_timeout(capsys):
+    miner = _FakeMiner(b"", hold_open=5)
+    try:
+        assert _api(miner.port, timeout=0.3)._send_command("version") is None
+        assert "Timeout" in capsys.readouterr().out
+    finally:
+        miner.done.set()
+
+
+def test_refused_connection_returns_none():
+    srv = socket.create_server(("127.0.0.1", 0))
+    port = srv.getsockname()[1]
+    srv.close()
+    assert _api(port)._send_command("summary") is None
+
+
+@pytest.mark.parametrize("system, env, expected", [
+    ("Darwin", None, True),
+    ("Linux", None, False),
+    ("Linux", "1", True),
+])
+def test_transport_selection(monkeypatch, system, env, expected):
+    monkeypatch.setattr(nc_mod.platform, "system", lambda: system)
+    if env is None:
+        monkeypatch.delenv("WM_USE_NC", raising=False)
+    else:
+        monkeypatch.setenv("WM_USE_NC", env)
+    assert NCMinerAPI("127.0.0.1").use_nc is expected
+
+
+def test_nc_failures_raise(monkeypatch):
+    api = NCMinerAPI("127.0.0.1")
+    monkeypatch.setattr(nc_mod.subprocess, "run",
+                        lambda *a, **kw: SimpleNamespace(returncode=1, stdout=b"", stderr=b"refused"))
+    with pytest.raises(OSError, match="nc failed: refused"):
+        api._exchange_nc(b"{}")
+
+    def slow(*a, **kw):
+        raise subprocess.TimeoutExpired("nc", 7)
+
+    monkeypatch.setattr(nc_mod.subprocess, "run", slow)
+    with pytest.raises(TimeoutError):
+        api._exchange_nc(b"{}")
+
+
+def test_encrypt_password_memoized_per_salt(monkeypatch):
+    nc_mod._md5_crypt_cached.cache_clear()
+    calls = []
+    real = nc_mod.md5_crypt
+
+    class _Counting:
+        @staticmethod
+        def using(salt):
+            calls.append(salt)
+            return real.using(salt=salt)
+
+    monkeypatch.setattr(nc_mod, "md5_crypt", _Counting)
+    api = NCMinerAPI("127.0.0.1", password="admin")
+
+    first = api._encrypt_password("BQ5hoXV9")
+    assert first.startswith("$1$BQ5hoXV9$")
+    assert api._encrypt_password("BQ5hoXV9") == first
+    assert calls == ["BQ5hoXV9"]
+
+    assert api._encrypt_password("other") != first
+    assert NCMinerAPI("127.0.0.1", password="other")._encrypt_password("BQ5hoXV9") != first
+    assert len(calls) == 3
+    nc_mod._md5_crypt_cached.cache_clear()
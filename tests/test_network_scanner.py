@@ -0,0 +1,356 @@
+"""Tests for NetworkScanner host discovery.
+
+No packets are sent: subprocess.run, shutil.which and the per-host probes
+are replaced with fakes.
+
+Coverage:
+  - the ping sweep runs one fping over .1-.254 and keeps the IPs it prints,
+    even though fping exits non-zero when some hosts are down
+  - without fping the sweep pings .1-.254 concurrently, in IP order
+  - a failing fping falls back to the per-host ping
+  - on Linux the ARP table is read from /proc/net/arp: incomplete,
+    zero-MAC, broadcast and off-subnet entries are dropped
+  - on macOS `arp -a` lines yield IPs and hostnames ("?" means none)
+  - subnet membership is a /24 match on the parsed address, so a
+    subnet of 10.0.1 does not pick up 10.0.10.x
+  - discovery first broadcast-pings the subnet; a failed ping is ignored
+  - identification ports are probed for all hosts concurrently, and
+    _identify_device only tries the APIs behind open ports
+  - WhatsMiner identification uses NCMinerAPI with the short identify
+    timeout on macOS and Linux alike
+  - scan_network identifies hosts concurrently and returns them in IP
+    order with their ARP hostnames; an empty subnet scans cleanly
+  - stop() interrupts the wait between scans; trigger_scan_now() starts
+    the next scan without waiting out the interval
+  - get_scan_info reuses the device list built when a scan is published,
+    while "scanning" stays live; get_devices hands out one tuple per scan
+"""
+from __future__ import annotations
+
+import subprocess
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from models.device import Device, DeviceType
+from services import network_scanner as ns_mod
+from services.network_scanner import NetworkScanner
+
+
+@pytest.fixture
+def scanner():
+    return NetworkScanner(subnet="10.0.0")
+
+
+def test_fping_sweep_parses_alive_hosts(scanner, monkeypatch):
+    calls = []
+
+    def fake_run(cmd, **kw):
+        calls.append(cmd)
+        return SimpleNamespace(returncode=1, stdout="10.0.0.1\n10.0.0.52\n", stderr="")
+
+    monkeypatch.setattr(ns_mod.shutil, "which", lambda name: "/usr/bin/fping")
+    monkeypatch.setattr(ns_mod.subprocess, "run", fake_run)
+
+    assert scanner._ping_sweep() == ["10.0.0.1", "10.0.0.52"]
+    assert len(calls) == 1
+    assert calls[0][:5] == ["/usr/bin/fping", "-a", "-q", "-g", "10.0.0.1"]
+    assert "10.0.0.254" in calls[0]
+
+
+def test_ping_fallback_is_concurrent_and_ordered(scanner, monkeypatch):
+    monkeypatch.setattr(ns_mod.shutil, "which", lambda name: None)
+    seen = []
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def fake_ping(ip, timeout=0.5):
+        with lock:
+            seen.append(ip)
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+        return ip.endswith((".7", ".52", ".200"))
+
+    monkeypatch.setattr(scanner, "_ping_host", fake_ping)
+
+    assert scanner._ping_sweep() == ["10.0.0.7", "10.0.0.52", "10.0.0.200"]
+    assert len(seen) == 254 and "10.0.0.255" not in seen
+    assert in_flight[1] > 1
+
+
+def test_fping_error_falls_back_to_ping(scanner, monkeypatch):
+    def boom(cmd, **kw):
+        raise subprocess.TimeoutExpired(cmd, 10)
+
+    monkeypatch.setattr(ns_mod.shutil, "which", lambda name: "/usr/bin/fping")
+    monkeypatch.setattr(ns_mod.subprocess, "run", boom)
+    monkeypatch.setattr(scanner, "_ping_host", lambda ip, timeout=0.5: ip == "10.0.0.9")
+
+    assert scanner._ping_sweep() == ["10.0.0.9"]
+
+
+_PROC_ARP = """\
+IP address       HW type     Flags       HW address            Mask     Device
+10.0.0.1         0x1         0x2         aa:bb:cc:dd:ee:01     *        eth0
+10.0.0.52        0x1         0x2         aa:bb:cc:dd:ee:52     *        eth0
+10.0.0.60        0x1         0x0         00:00:00:00:00:00     *        eth0
+10.0.0.255       0x1         0x2         ff:ff:ff:ff:ff:ff     *        eth0
+10.0.0.77        0x1         0x6         aa:bb:cc:dd:ee:77     *        eth0
+10.0.1.5         0x1         0x2         aa:bb:cc:dd:ee:05     *        eth0
+172.17.0.2       0x1         0x2         02:42:ac:11:00:02     *        docker0
+"""
+
+
+def test_read_proc_arp_keeps_complete_subnet_entries(scanner, tmp_path):
+    path = tmp_path / "arp"
+    path.write_text(_PROC_ARP)
+    assert scanner._read_proc_arp(str(path)) == ["10.0.0.1", "10.0.0.52", "10.0.0.77"]
+
+
+def test_linux_discovery_reads_proc_arp_without_subprocess(scanner, monkeypatch):
+    monkeypatch.setattr(ns_mod, "_IS_DARWIN", False)
+    monkeypatch.setattr(scanner, "_prime_arp_cache", lambda: None)
+    monkeypatch.setattr(scanner, "_read_proc_arp",
+                        lambda: [f"10.0.0.{i}" for i in (9, 3, 12, 4, 5)])
+
+    def no_run(*a, **kw):
+        raise AssertionError("no subprocess expected")
+
+    monkeypatch.setattr(ns_mod.subprocess, "run", no_run)
+    assert scanner._find_alive_hosts() == sorted(f"10.0.0.{i}" for i in (9, 3, 12, 4, 5))
+
+
+def test_probe_ports_checks_all_pairs_concurrently(scanner, monkeypatch):
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def fake_check(ip, port, timeout=1.0):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+        return (ip, port) in {("10.0.0.52", 4028), ("10.0.0.9", 80)}
+
+    monkeypatch.setattr(scanner, "_check_port", fake_check)
+
+    ips = ["10.0.0.9", "10.0.0.52", "10.0.0.60"]
+    assert scanner._probe_ports(ips, (4028, 80)) == {
+        "10.0.0.9": {80}, "10.0.0.52": {4028}, "10.0.0.60": set(),
+    }
+    assert in_flight[1] > 1
+    assert scanner._probe_ports([], (4028, 80)) == {}
+
+
+def test_identify_device_uses_probed_ports(scanner, monkeypatch):
+    monkeypatch.setattr(scanner, "_check_port",
+                        lambda *a, **kw: pytest.fail("port already probed"))
+    tried = []
+    monkeypatch.setattr(scanner, "_identify_whatsminer", lambda ip: tried.append(("wm", ip)))
+    monkeypatch.setattr(scanner, "_identify_bitaxe", lambda ip: tried.append(("bitaxe", ip)))
+
+    assert scanner._identify_device("10.0.0.9", {80}) is None
+    assert scanner._identify_device("10.0.0.60", set()) is None
+    assert tried == [("bitaxe", "10.0.0.9")]
+
+
+def test_scan_identifies_hosts_concurrently_in_ip_order(scanner, monkeypatch):
+    ips = ["10.0.0.2", "10.0.0.52", "10.0.0.60"]
+
+    def fake_find():
+        scanner._hostname_map = {"10.0.0.52": "whatsminer.lan"}
+        return ips
+
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def fake_identify(ip, open_ports=None):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        time.sleep(0.05 if ip.endswith(".2") else 0.01)
+        with lock:
+            in_flight[0] -= 1
+        if 4028 in open_ports:
+            return Device(ip=ip, device_type=DeviceType.WHATSMINER, hashrate_ths=100.0, power_w=3400)
+        return None
+
+    monkeypatch.setattr(scanner, "_find_alive_hosts", fake_find)
+    monkeypatch.setattr(scanner, "_probe_ports",
+                        lambda ips, ports: {ip: ({4028} if ip.endswith(".52") else set()) for ip in ips})
+    monkeypatch.setattr(scanner, "_identify_device", fake_identify)
+
+    devices = scanner.scan_network()
+
+    assert [d.ip for d in devices] == ips
+    assert [d.device_type for d in devices] == [DeviceType.UNKNOWN, DeviceType.WHATSMINER, DeviceType.UNKNOWN]
+    assert devices[1].hostname == "whatsminer.lan"
+    assert in_flight[1] > 1
+
+
+def test_scan_with_no_hosts(scanner, monkeypatch):
+    monkeypatch.setattr(scanner, "_find_alive_hosts", lambda: [])
+    assert scanner.scan_network() == []
+
+
+_ARP_A = """\
+whatsminer.lan (10.0.0.52) at aa:bb:cc:dd:ee:52 on en0 ifscope [ethernet]
+? (10.0.0.1) at aa:bb:cc:dd:ee:01 on en0 ifscope [ethernet]
+? (10.0.0.60) at (incomplete) on en0 ifscope [ethernet]
+? (10.0.0.255) at ff:ff:ff:ff:ff:ff on en0 ifscope [ethernet]
+printer.lan (10.0.1.5) at aa:bb:cc:dd:ee:05 on en0 ifscope [ethernet]
+"""
+
+
+def test_macos_arp_a_parsing(scanner, monkeypatch):
+    monkeypatch.setattr(ns_mod, "_IS_DARWIN", True)
+    monkeypatch.setattr(scanner, "_prime_arp_cache", lambda: None)
+    monkeypatch.setattr(ns_mod.subprocess, "run",
+                        lambda *a, **kw: SimpleNamespace(returncode=0, stdout=_ARP_A, stderr=""))
+    monkeypatch.setattr(scanner, "_ping_sweep", lambda: [])
+
+    assert scanner._find_alive_hosts() == ["10.0.0.1", "10.0.0.52"]
+    assert scanner._hostname_map == {"10.0.0.52": "whatsminer.lan"}
+
+
+def test_scan_info_device_list_built_once_per_scan(scanner):
+    scanner._publish([
+        Device(ip="10.0.0.52", hostname="whatsminer.lan", device_type=DeviceType.WHATSMINER,
+               hashrate_ths=100.0, power_w=3400),
+    ])
+    first = scanner.get_scan_info()
+    assert first["device_count"] == 1
+    assert first["devices"] == [{"ip": "10.0.0.52", "hostname": "whatsminer.lan",
+                                 "type": DeviceType.WHATSMINER.value,
+                                 "hashrate_ths": 100.0, "power_w": 3400}]
+    assert scanner.get_scan_info()["devices"] is first["devices"]
+    assert scanner.get_devices() is scanner.get_devices()
+    assert [d.ip for d in scanner.get_devices()] == ["10.0.0.52"]
+
+    scanner.scanning = True
+    assert scanner.get_scan_info()["scanning"] is True
+
+    scanner._publish([])
+    assert scanner.get_scan_info()["devices"] == [] and scanner.get_devices() == ()
+
+
+@pytest.mark.parametrize("is_darwin, flag", [(False, "-b"), (True, "-t")])
+def test_prime_arp_cache_broadcast_pings(scanner, monkeypatch, is_darwin, flag):
+    calls = []
+    monkeypatch.setattr(ns_mod, "_IS_DARWIN", is_darwin)
+    monkeypatch.setattr(ns_mod, "ARP_SETTLE_SEC", 0)
+    monkeypatch.setattr(ns_mod.subprocess, "run",
+                        lambda cmd, **kw: calls.append(cmd) or SimpleNamespace(returncode=0))
+
+    scanner._prime_arp_cache()
+
+    assert len(calls) == 1
+    assert calls[0][0] == "ping" and flag in calls[0] and calls[0][-1] == "10.0.0.255"
+
+
+def test_prime_failure_does_not_stop_discovery(scanner, monkeypatch, capsys):
+    def no_ping(cmd, **kw):
+        raise FileNotFoundError("ping")
+
+    monkeypatch.setattr(ns_mod, "_IS_DARWIN", False)
+    monkeypatch.setattr(ns_mod.subprocess, "run", no_ping)
+    monkeypatch.setattr(scanner, "_read_proc_arp", lambda: [f"10.0.0.{i}" for i in range(1, 6)])
+
+    assert len(scanner._find_alive_hosts()) == 5
+    assert "Broadcast ping failed" in capsys.readouterr().out
+
+
+def test_scan_loop_wakes_for_trigger_and_stop(scanner, monkeypatch):
+    scans = []
+    monkeypatch.setattr(scanner, "scan_network", lambda: scans.append(1) or [])
+
+    scanner.start_background_scan()
+    deadline = time.monotonic() + 2
+    while len(scans) < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    scanner.trigger_scan_now()
+    while len(scans) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(scans) == 2
+
+    t0 = time.monotonic()
+    scanner.stop()
+    assert time.monotonic() - t0 < 1
+    assert not scanner._thread.is_alive()
+    assert len(scans) == 2
+
+
+@pytest.mark.parametrize("is_darwin", [True, False])
+def test_identify_whatsminer_uses_short_timeout(scanner, monkeypatch, is_darwin):
+    from utils import nc_miner_api as nc_mod
+    made = []
+
+    class _FakeAPI:
+        def __init__(self, ip, timeout=5, **kw):
+            made.append((ip, timeout))
+
+        def summary(self):
+            return {"SUMMARY": [{"MHS 5s": 100_000_000, "Power": 3400}]}
+
+    monkeypatch.setattr(ns_mod, "_IS_DARWIN", is_darwin)
+    monkeypatch.setattr(nc_mod, "NCMinerAPI", _FakeAPI)
+
+    device = scanner._identify_whatsminer("10.0.0.52")
+    assert made == [("10.0.0.52", ns_mod.IDENTIFY_TIMEOUT_SEC)]
+    assert device.device_type == DeviceType.WHATSMINER and device.hashrate_ths == 100.0
+
+
+def test_subnet_host_matches_whole_octets():
+    scanner = NetworkScanner(subnet="10.0.1")
+    assert scanner._subnet_host("10.0.1.7") == 7
+    assert scanner._subnet_host("10.0.1.255") == 255
+    assert scanner._subnet_host("10.0.10.7") is None
+    assert scanner._subnet_host("10.0.11.7") is None
+    assert scanner._subnet_host("not-an-ip") is None
+
+
+def test_arp_parsers_skip_prefix_lookalikes(monkeypatch, tmp_path):
+    scanner = NetworkScanner(subnet="10.0.1")
+    path = tmp_path / "arp"
+    path.write_text(
+        "IP address       HW type     Flags       HW address            Mask     Device\n"
+        "10.0.1.5         0x1         0x2         aa:bb:cc:dd:ee:05     *        eth0\n"
+        "10.0.10.5        0x1         0x2         aa:bb:cc:dd:ee:06     *        eth0\n"
+    )
+    assert scanner._read_proc_arp(str(path)) == ["10.0.1.5"]
+
+    monkeypatch.setattr(ns_mod, "_IS_DARWIN", True)
+    monkeypatch.setattr(scanner, "_prime_arp_cache", lambda: None)
+    monkeypatch.setattr(scanner, "_ping_sweep", lambda: [])
+    monkeypatch.setattr(ns_mod.subprocess, "run", lambda *a, **kw: SimpleNamespace(
+        returncode=0, stdout=_ARP_A, stderr=""))
+    assert scanner._find_alive_hosts() == ["10.0.1.5"]
+
+
+def test_identify_whatsminer_silent_port_times_out(scanner, monkeypatch):
+    """A Linux host that accepts on 4028 but never answers is given up on
+    after IDENTIFY_TIMEOUT_SEC, not pyasic's 100s read timeout."""
+    import socket as _socket
+    from utils import nc_miner_api as nc_mod
+
+    monkeypatch.setattr(ns_mod, "_IS_DARWIN", False)
+    monkeypatch.setattr(ns_mod, "IDENTIFY_TIMEOUT_SEC", 0.2)
+    monkeypatch.delenv("WM_USE_NC", raising=False)
+    monkeypatch.setattr(nc_mod.platform, "system", lambda: "Linux")
+    srv = _socket.create_server(("127.0.0.1", 0))
+    port = srv.getsockname()[1]
+    real = nc_mod.NCMinerAPI
+    monkeypatch.setattr(nc_mod, "NCMinerAPI",
+                        lambda ip, timeout=5, **kw: real(ip, port=port, timeout=timeout, **kw))
+    try:
+        t0 = time.monotonic()
+        assert scanner._identify_whatsminer("127.0.0.1") is None
+        assert time.monotonic() - t0 < 2
+    finally:
+        srv.close()
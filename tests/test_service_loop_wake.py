@@ -0,0 +1,130 @@
+"""Tests for prompt wake-up of the AutoControl and BatteryService loops.
+
+Both loops pace themselves with threading.Event.wait instead of
+time.sleep, so stop() returns without waiting out the interval and
+AutoControl re-evaluates as soon as it is enabled.
+
+Coverage:
+  - AutoControlService.stop() returns well inside min_interval_sec
+  - enable() wakes a sleeping loop for an immediate tick
+  - BatteryService.stop() interrupts the poll wait
+  - wait_for_snapshot returns as soon as a new snapshot is published and
+    is released by notify_snapshot_waiters()
+  - after the interval AutoControl waits at most one battery poll for a
+    snapshot newer than the last tick
+"""
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+from services.autocontrol_service import AutoControlService
+from services.battery_service import BatteryService
+from utils.state_manager import StateManager
+
+
+def _autocontrol(tmp_path, enabled=False):
+    state = StateManager(path=str(tmp_path / "state.json"))
+    state.save(autocontrol=enabled)
+    svc = AutoControlService(
+        miner_service=MagicMock(),
+        battery_service=MagicMock(),
+        state_manager=state,
+        base_watts=3600,
+        min_interval_sec=60,
+        mode="away",
+        away_config={},
+        location_config={"timezone": "America/New_York"},
+    )
+    svc.ticks = 0
+
+    def _tick():
+        svc.ticks += 1
+
+    svc._away_mode_control = _tick
+    return svc
+
+
+def _wait_for(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if cond():
+            return True
+        time.sleep(0.01)
+    return cond()
+
+
+def test_autocontrol_stop_is_prompt(tmp_path):
+    svc = _autocontrol(tmp_path, enabled=True)
+    svc.start()
+    assert _wait_for(lambda: svc.ticks == 1)
+
+    t0 = time.monotonic()
+    svc.stop()
+    assert time.monotonic() - t0 < 1.0
+    assert not svc._thread.is_alive()
+
+
+def test_enable_wakes_loop(tmp_path):
+    svc = _autocontrol(tmp_path, enabled=False)
+    svc.start()
+    try:
+        time.sleep(0.05)
+        assert svc.ticks == 0
+        svc.enable()
+        assert _wait_for(lambda: svc.ticks == 1)
+    finally:
+        svc.stop()
+
+
+def test_battery_service_stop_is_prompt(tmp_path):
+    svc = BatteryService(
+        username="u", password="p", base_url="http://localhost",
+        poll_seconds=60, log_file=str(tmp_path / "eg4.csv"),
+    )
+    svc.client = MagicMock()
+    svc.client.get_latest.return_value = {}
+    svc.client.last_error.return_value = None
+    svc._running = True
+    svc._thread = threading.Thread(target=svc._session_manager_loop, daemon=True)
+    svc._thread.start()
+    assert _wait_for(lambda: svc.client.get_latest.called)
+
+    t0 = time.monotonic()
+    svc.stop()
+    assert time.monotonic() - t0 < 1.0
+    assert not svc._thread.is_alive()
+
+
+def _battery(tmp_path):
+    return BatteryService(
+        username="u", password="p", base_url="http://localhost",
+        poll_seconds=60, log_file=str(tmp_path / "eg4.csv"),
+    )
+
+
+def test_wait_for_snapshot_wakes_on_publish(tmp_path):
+    svc = _battery(tmp_path)
+    assert svc.wait_for_snapshot(None, 5) is True  # already past
+
+    rev = svc.snapshot_revision
+    threading.Timer(0.05, svc._accept_snapshot, args=({"ts": "t"},)).start()
+    t0 = time.monotonic()
+    assert svc.wait_for_snapshot(rev, 5) is True
+    assert time.monotonic() - t0 < 1.0
+
+    threading.Timer(0.05, svc.notify_snapshot_waiters).start()
+    assert svc.wait_for_snapshot(svc.snapshot_revision, 5) is False
+
+
+def test_tick_wait_bounded_by_battery_poll(tmp_path):
+    svc = _autocontrol(tmp_path, enabled=True)
+    svc._running = True
+    svc.min_interval_sec = 0.01
+    svc.battery.poll_seconds = 10
+    svc._tick_revision = 7
+
+    svc._wait_for_next_tick()
+
+    svc.battery.wait_for_snapshot.assert_called_once_with(7, 0.01)
@@ -0,0 +1,169 @@
+"""Tests for config.settings.load_settings.
+
+Coverage:
+  - YAML sections override dataclass defaults; missing keys keep defaults
+  - nested autocontrol sections (away_mode, location)
+  - weather_gate casts and the eg4_predict_multiplier > 0 check
+  - environment variables override YAML
+  - validate() rejects missing battery credentials
+  - parsed YAML is memoized in-process (no file written next to the
+    config) and re-parsed when the YAML changes
+  - in-process memo returns fresh Settings objects; cache_clear invalidates
+"""
+from __future__ import annotations
+
+import os
+import textwrap
+
+import pytest
+
+from config import settings as settings_mod
+from config.settings import load_settings
+
+_ENV_VARS = (
+    "WM_HOST", "WM_USER", "WM_PASS", "WM_BASE_WATTS",
+    "EG4_USER", "EG4_PASS", "EG4_BASE_URL", "POLL_SECONDS", "PORT",
+)
+
+BASE_YAML = textwrap.dedent("""
+    miner:
+      host: "10.0.0.5"
+      base_watts: 3400
+    battery:
+      user: "u"
+      password: "p"
+      poll_seconds: 20
+    autocontrol:
+      enabled: true
+      away_mode:
+        emergency_soc: 25
+      location:
+        latitude: 35.5
+    data:
+      default_days: 7
+      max_days: 60
+    app:
+      port: 9090
+    braiins:
+      enabled: true
+    weather_gate:
+      battery_total_kwh: 50
+      pre_sunrise_window_minutes: "45"
+""")
+
+
+@pytest.fixture(autouse=True)
+def _clean_env(monkeypatch):
+    for name in _ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+    load_settings.cache_clear()
+
+
+def _write(tmp_path, text):
+    path = tmp_path / "config.yaml"
+    path.write_text(text)
+    return str(path)
+
+
+def test_yaml_sections_override_defaults(tmp_path):
+    s = load_settings(_write(tmp_path, BASE_YAML))
+
+    assert s.miner.host == "10.0.0.5"
+    assert s.miner.base_watts == 3400
+    assert s.miner.user == "admin"           # default kept
+    assert s.battery.poll_seconds == 20
+    assert s.battery.session_refresh_hours == 168
+    assert s.data.default_days == 7 and s.data.max_days == 60
+    assert s.app.port == 9090 and s.app.host == "0.0.0.0"
+    assert s.braiins.enabled is True and s.braiins.poll_seconds == 60
+
+
+def test_nested_autocontrol_sections(tmp_path):
+    s = load_settings(_write(tmp_path, BASE_YAML))
+
+    assert s.autocontrol.enabled is True
+    assert s.autocontrol.mode == "away"
+    assert s.autocontrol.away_mode.emergency_soc == 25
+    assert s.autocontrol.away_mode.after_sunset_min_soc == 40
+    assert s.autocontrol.location.latitude == 35.5
+    assert s.autocontrol.location.timezone == "America/New_York"
+
+
+def test_weather_gate_casts(tmp_path):
+    s = load_settings(_write(tmp_path, BASE_YAML))
+
+    assert s.weather_gate.battery_total_kwh == 50.0
+    assert isinstance(s.weather_gate.battery_total_kwh, float)
+    assert s.weather_gate.pre_sunrise_window_minutes == 45
+    assert s.weather_gate.eg4_predict_multiplier == 0.8
+
+
+def test_weather_gate_rejects_non_positive_multiplier(tmp_path):
+    text = BASE_YAML + "  eg4_predict_multiplier: 0\n"
+    with pytest.raises(ValueError, match="eg4_predict_multiplier"):
+        load_settings(_write(tmp_path, text))
+
+
+def test_env_overrides_yaml(tmp_path, monkeypatch):
+    monkeypatch.setenv("WM_HOST", "10.9.9.9")
+    monkeypatch.setenv("WM_BASE_WATTS", "3000")
+    monkeypatch.setenv("EG4_PASS", "secret")
+    monkeypatch.setenv("POLL_SECONDS", "5")
+    monkeypatch.setenv("PORT", "8181")
+
+    s = load_settings(_write(tmp_path, BASE_YAML))
+
+    assert s.miner.host == "10.9.9.9"
+    assert s.miner.base_watts == 3000
+    assert s.battery.password == "secret"
+    assert s.miner.poll_seconds == 5 and s.battery.poll_seconds == 5
+    assert s.app.port == 8181
+
+
+def test_missing_battery_credentials_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Battery credentials"):
+        load_settings(_write(tmp_path, "miner:\n  host: h\n"))
+
+
+def test_parsed_yaml_memoized_without_sidecar(tmp_path, monkeypatch):
+    path = _write(tmp_path, BASE_YAML)
+    load_settings(path)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["config.yaml"]
+
+    def _no_yaml(*a, **k):
+        raise AssertionError("YAML re-parsed while unchanged")
+
+    monkeypatch.setattr(settings_mod.yaml, "load", _no_yaml)
+    assert load_settings(path).miner.host == "10.0.0.5"
+
+
+def test_edited_yaml_is_reparsed(tmp_path):
+    path = _write(tmp_path, BASE_YAML)
+    load_settings(path)
+    _write(tmp_path, BASE_YAML.replace("10.0.0.5", "10.0.0.77"))
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert load_settings(path).miner.host == "10.0.0.77"
+
+
+def test_memoized_parse_still_builds_fresh_settings(tmp_path, monkeypatch):
+    path = _write(tmp_path, BASE_YAML)
+    first = load_settings(path)
+    parses = []
+    real_load = settings_mod.yaml.load
+    monkeypatch.setattr(settings_mod.yaml, "load",
+                        lambda *a, **k: parses.append(1) or real_load(*a, **k))
+
+    monkeypatch.setenv("WM_HOST", "10.1.1.1")
+    second = load_settings(path)
+
+    # Served from memory: the YAML was not parsed again.
+    assert parses == []
+    assert second is not first and second.miner is not first.miner
+    assert first.miner.host == "10.0.0.5"
+    assert second.miner.host == "10.1.1.1"
+
+    load_settings.cache_clear()
+    load_settings(path)
+    assert parses == [1]
@@ -0,0 +1,80 @@
+"""Tests for StateManager's parsed-state cache.
+
+Coverage:
+  - repeated load() calls parse the file once while it is unchanged
+  - save() leaves the cache holding what it wrote, with no reparse
+  - a file replaced from outside is picked up on the next load()
+  - load() returns independent copies of the cached state
+  - the orjson and stdlib encoders write the same compact, key-sorted
+    bytes, and values orjson rejects fall back to the stdlib
+"""
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+from utils import state_manager as sm_mod
+from utils.state_manager import StateManager
+
+
+@pytest.fixture
+def mgr(tmp_path):
+    return StateManager(path=str(tmp_path / "wm_state.json"))
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    count = [0]
+    real = sm_mod._loads
+
+    def counting_loads(raw):
+        count[0] += 1
+        return real(raw)
+
+    monkeypatch.setattr(sm_mod, "_loads", counting_loads)
+    return count
+
+
+def test_unchanged_file_parsed_once(mgr, parses):
+    for _ in range(5):
+        assert mgr.load()["autocontrol"] is False
+    assert parses[0] == 1
+
+
+def test_save_updates_cache_without_reparse(mgr, parses):
+    mgr.save(target_power_pct=40)
+    mgr.save(autocontrol=True)
+    state = mgr.load()
+    assert (state["target_power_pct"], state["autocontrol"]) == (40, True)
+    assert parses[0] == 1  # only the first save's load read the file
+    with open(mgr.path) as f:
+        on_disk = json.loads(f.read())
+    assert (on_disk["target_power_pct"], on_disk["autocontrol"]) == (40, True)
+
+
+def test_outside_replace_is_reloaded(mgr, tmp_path):
+    mgr.save(target_power_pct=40)
+    other = tmp_path / "other.json"
+    other.write_text(json.dumps({"target_power_pct": 80}))
+    os.replace(other, mgr.path)
+    assert mgr.load()["target_power_pct"] == 80
+
+
+def test_load_returns_copies(mgr):
+    first = mgr.load()
+    first["target_power_pct"] = 99
+    assert mgr.load()["target_power_pct"] == 0
+
+
+def test_orjson_and_stdlib_write_same_bytes(monkeypatch):
+    state = dict(sm_mod.DEFAULT_STATE, target_power_pct=40, emergency_latch_set_at=1760000000.25)
+    fast = sm_mod._dumps(state)
+    monkeypatch.setattr(sm_mod, "ORJSON_AVAILABLE", False)
+    assert sm_mod._dumps(state) == fast
+    assert sm_mod._loads(fast) == state
+
+
+def test_wide_int_falls_back_to_stdlib():
+    assert sm_mod._dumps({"x": 2**70}) == b'{"x":1180591620717411303424}'
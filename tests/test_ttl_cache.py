@@ -0,0 +1,63 @@
+"""Tests for the zero-argument TTL memoizer.
+
+Coverage:
+  - calls inside the window reuse the first result
+  - the getter runs again once the window expires
+  - cache_clear() forces a refresh
+"""
+from utils import ttl_cache as ttl_module
+from utils.ttl_cache import ttl_cache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _counting_getter():
+    calls = []
+
+    def getter():
+        calls.append(1)
+        return {"n": len(calls)}
+
+    return getter, calls
+
+
+def test_reuses_result_within_window(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(ttl_module.time, "monotonic", clock)
+    getter, calls = _counting_getter()
+    cached = ttl_cache(2.0)(getter)
+
+    first = cached()
+    clock.now += 1.9
+    assert cached() is first
+    assert len(calls) == 1
+
+
+def test_refreshes_after_expiry(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(ttl_module.time, "monotonic", clock)
+    getter, calls = _counting_getter()
+    cached = ttl_cache(2.0)(getter)
+
+    cached()
+    clock.now += 2.0
+    assert cached() == {"n": 2}
+    assert len(calls) == 2
+
+
+def test_cache_clear(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(ttl_module.time, "monotonic", clock)
+    getter, calls = _counting_getter()
+    cached = ttl_cache(2.0)(getter)
+
+    cached()
+    cached.cache_clear()
+    cached()
+    assert len(calls) == 2
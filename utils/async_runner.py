@@ -0,0 +1,48 @@
+"""Shared background asyncio event loop for synchronous callers.
+
+Flask handlers and service threads are synchronous, but pyasic's RPC API is
+async. Calling asyncio.run() per command creates and tears down an event
+loop each time. Instead, run one loop forever on a daemon thread and submit
+coroutines to it.
+
+Usage:
+    from utils.async_runner import run_coroutine
+
+    summary = run_coroutine(api.summary(), timeout=30)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional
+
+_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared loop, starting its thread on first use."""
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="async-runner", daemon=True
+            ).start()
+            _loop = loop
+        return _loop
+
+
+def run_coroutine(coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+    """Run `coro` on the shared loop and block until it finishes.
+
+    Raises whatever the coroutine raises. On timeout the coroutine is
+    cancelled and concurrent.futures.TimeoutError is raised.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_loop())
+    try:
+        return future.result(timeout)
+    except BaseException:
+        future.cancel()
+        raise
@@ -0,0 +1,52 @@
+"""Rate-limited tracebacks for background loops.
+
+A loop that keeps hitting the same failure (network outage, portal down)
+would otherwise print a full traceback every iteration. ErrorThrottle
+prints the traceback for the first occurrence of each distinct error and
+again at most once per interval while it repeats; the repeats in between
+are counted and reported with the next traceback.
+
+Usage:
+    from utils.error_throttle import ErrorThrottle
+
+    errors = ErrorThrottle()
+    while running:
+        try:
+            ...
+        except Exception as e:
+            print(f"[Service] Loop error: {e}")
+            errors.report(e)
+"""
+
+from __future__ import annotations
+
+import time
+import traceback
+
+DEFAULT_INTERVAL_SEC = 3600
+
+
+class ErrorThrottle:
+    """Print a traceback per distinct (type, message), at most once per interval."""
+
+    def __init__(self, interval_sec: float = DEFAULT_INTERVAL_SEC):
+        self.interval_sec = interval_sec
+        self._key = None
+        self._last_ts = 0.0
+        self._suppressed = 0
+
+    def report(self, exc: BaseException) -> bool:
+        """Print exc's traceback unless it repeats the last error within the
+        interval. Call from inside the except block. Returns True if printed."""
+        key = (type(exc).__name__, str(exc))
+        now = time.monotonic()
+        if key == self._key and now - self._last_ts < self.interval_sec:
+            self._suppressed += 1
+            return False
+        if key == self._key and self._suppressed:
+            print(f"  (same error repeated {self._suppressed} times since last traceback)")
+        self._key = key
+        self._last_ts = now
+        self._suppressed = 0
+        traceback.print_exception(type(exc), exc, exc.__traceback__)
+        return True
@@ -0,0 +1,33 @@
+"""ISO 8601 timestamp parsing for log rows.
+
+parse_iso() uses ciso8601 (a C parser) when it is installed and falls back
+to datetime.fromisoformat otherwise. Both return the same aware/naive
+datetime for the timestamp shapes the CSV logs and live pollers produce:
+
+    2025-08-30T17:30:16-04:00
+    2025-08-30T04:47:24
+    2025-08-30T04:47:24Z
+
+Either backend raises ValueError for an unparseable string.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+try:
+    from ciso8601 import parse_datetime as _c_parse
+    CISO8601_AVAILABLE = True
+except ImportError:
+    _c_parse = None
+    CISO8601_AVAILABLE = False
+
+
+def _py_parse(ts_str: str) -> datetime:
+    # fromisoformat only accepts a trailing Z from Python 3.11 on.
+    if ts_str.endswith('Z'):
+        ts_str = ts_str[:-1] + '+00:00'
+    return datetime.fromisoformat(ts_str)
+
+
+parse_iso = _c_parse if CISO8601_AVAILABLE else _py_parse
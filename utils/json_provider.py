@@ -0,0 +1,74 @@
+"""orjson-backed Flask JSON provider.
+
+/api/chart-data and the history endpoints return thousands of row dicts;
+the stdlib encoder is the dominant cost of those responses. When orjson is
+installed this provider encodes with it directly to bytes. When it is not,
+or when orjson rejects a value the stdlib encoder can handle (e.g. ints
+wider than 64 bits), it falls back to Flask's default behaviour.
+
+Usage:
+    from utils.json_provider import OrjsonProvider
+
+    app.json = OrjsonProvider(app)
+"""
+
+from __future__ import annotations
+
+import json
+import typing as t
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """DefaultJSONProvider that prefers orjson for encoding and decoding."""
+
+    # orjson never sorts; keep the stdlib fallback path consistent with it.
+    sort_keys = False
+
+    def _encode(self, obj: t.Any, indent: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj: t.Any, **kwargs: t.Any) -> str:
+        if ORJSON_AVAILABLE:
+            try:
+                return self._encode(obj, indent=kwargs.get("indent") is not None).decode()
+            except TypeError:
+                pass
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s: str | bytes, **kwargs: t.Any) -> t.Any:
+        if ORJSON_AVAILABLE and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args: t.Any, **kwargs: t.Any):
+        if not ORJSON_AVAILABLE:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        try:
+            body = self._encode(obj, indent=indent)
+        except TypeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+
+def dumps_bytes(obj: t.Any) -> bytes:
+    """Encode plain JSON data (dicts/lists/str/numbers/None) to compact bytes.
+
+    For hand-built streaming responses, which bypass the app's provider.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
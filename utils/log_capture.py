@@ -0,0 +1,137 @@
+"""Backend log capture for the dashboard's log panel.
+
+LogCapture wraps sys.stdout / sys.stderr: text still goes to the real stream
+immediately, and each non-blank write is also handed to a LogBuffer, which
+/api/system/logs reads from.
+
+No lock is taken on the log path. LogBuffer.add() stamps the message and puts it on a
+SimpleQueue; a single daemon thread classifies queued messages and is the
+only writer to the bounded deque. Readers take a snapshot with deque.copy(),
+which is atomic under the GIL, so they never see a deque mid-mutation. A
+message becomes visible to readers once the consumer thread has picked it
+up (normally well under a millisecond).
+"""
+
+from __future__ import annotations
+
+import queue
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import Optional
+
+
+# One case-insensitive scan instead of lower() plus a substring scan per
+# keyword. Group name is the resulting level.
+_LEVEL_RE = re.compile(
+    r"(?P<error>error|✗|❌)|(?P<warning>warning)|(?P<success>success|✓)",
+    re.IGNORECASE,
+)
+
+
+def classify_level(text: str, default: str) -> str:
+    """Pick a dashboard log level from the message content.
+
+    Precedence is error > warning > success regardless of where each
+    keyword appears in the text.
+    """
+    found = None
+    for m in _LEVEL_RE.finditer(text):
+        level = m.lastgroup
+        if level == "error":
+            return level
+        if found is None or level == "warning":
+            found = level
+    return found or default
+
+
+class LogBuffer:
+    """Thread-safe buffer for capturing backend logs."""
+
+    def __init__(self, maxlen=500):
+        self.logs = deque(maxlen=maxlen)
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+    def add(self, message: str, level: str = "info", classify: bool = False):
+        """Queue a log message with timestamp.
+
+        With classify=True, `level` is only the fallback and the final level
+        is derived from the message text on the consumer side.
+        """
+        self._queue.put_nowait((time.time(), message, level, classify))
+        if self._worker is None:
+            self._start_worker()
+
+    def get_recent(self, count: int = 200):
+        """Get recent log messages."""
+        # Iterating the live deque would raise if the consumer appended
+        # mid-walk; copy() is a single atomic C call.
+        snapshot = self.logs.copy()
+        # Timestamps are stored as epoch floats and only formatted here,
+        # for the few entries actually read.
+        fromtimestamp = datetime.fromtimestamp
+        return [
+            {"timestamp": fromtimestamp(ts).isoformat(), "message": message, "level": level}
+            for ts, message, level in islice(snapshot, max(0, len(snapshot) - count), None)
+        ]
+
+    def clear(self):
+        """Clear all logs, including messages not yet consumed."""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self.logs.clear()
+
+    # ---------- consumer side ----------
+
+    def _start_worker(self):
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._consume, name="log-buffer", daemon=True
+                )
+                self._worker.start()
+
+    def _consume(self):
+        while True:
+            self._append(self._queue.get())
+
+    def _append(self, item):
+        ts, message, level, classify = item
+        if classify:
+            level = classify_level(message, level)
+        self.logs.append((ts, message, level))
+
+
+class LogCapture:
+    """Captures stdout/stderr and routes to log buffer."""
+
+    def __init__(self, original, buffer: LogBuffer, level="info"):
+        self.original = original
+        self.buffer = buffer
+        self.level = level
+
+    def write(self, text):
+        """Capture write calls."""
+        # Console output stays synchronous so it is not lost if the
+        # process dies; only the dashboard copy is deferred.
+        self.original.write(text)
+        self.original.flush()
+
+        # Bytes and blank writes (e.g. print()'s trailing newline) are not
+        # dashboard log lines.
+        if isinstance(text, bytes) or not text or not text.strip():
+            return
+
+        self.buffer.add(text.strip(), self.level, classify=True)
+
+    def flush(self):
+        """Flush the stream."""
+        self.original.flush()
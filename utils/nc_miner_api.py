@@ -1,19 +1,35 @@
 #!/usr/bin/env python3
 """
 NC-based miner API - workaround for macOS socket issues.
-Uses nc command via subprocess instead of Python sockets.
+On macOS, commands go through the nc command via subprocess instead of
+Python sockets. Elsewhere (the Raspberry Pi deployment) a plain socket does
+the same one-shot exchange without spawning a process; set WM_USE_NC=1 to
+force nc everywhere.
 Supports two encrypted privileged command formats:
   - MD5-crypt inline (enc_pwd field) — works for adjust_power_limit
   - AES envelope (pyasic format) — required for power_off and power_on
 """
+import os
+import platform
+import socket
 import subprocess
 import json
 import threading
 import time
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from passlib.hash import md5_crypt
 
 
+# MD5-crypt runs 1000 MD5 rounds per hash, which is noticeable on the Pi.
+# The miner hands out the same salt from one get_token to the next, so a
+# burst of power-limit changes re-derives an identical enc_pwd each time.
+@lru_cache(maxsize=32)
+def _md5_crypt_cached(pwd: str, salt: str) -> str:
+    """MD5-crypt `pwd` with `salt` ($1$salt$hash), memoized."""
+    return md5_crypt.using(salt=salt).hash(pwd)
+
+
 class NCMinerAPI:
     """Miner API using nc command as workaround for macOS socket restrictions."""
 
@@ -33,29 +49,60 @@ class NCMinerAPI:
         # "over max connect" failures — so repeated calls within the window extend
         # the lock indefinitely. Rate-limiting prevents this.
         self._last_get_token_at: float = 0.0
+        # Python sockets are blocked on macOS; nc is the only transport there.
+        self.use_nc = platform.system() == "Darwin" or bool(os.environ.get("WM_USE_NC"))
 
-    def _send_command(self, command: str) -> Optional[Dict[str, Any]]:
-        """Send command to miner via nc."""
-        cmd = {"command": command}
-        cmd_json = json.dumps(cmd)
+    def _exchange(self, payload: bytes) -> bytes:
+        """Send one request and return the raw reply.
 
+        One connection per request, closed once the miner has answered —
+        the firmware refuses new sessions while too many are open ("over
+        max connect"). Raises TimeoutError on timeout and OSError when the
+        connection or nc fails.
+        """
+        if self.use_nc:
+            return self._exchange_nc(payload)
+        with socket.create_connection((self.ip, self.port), timeout=self.timeout) as sock:
+            sock.sendall(payload)
+            chunks = []
+            try:
+                while True:
+                    chunk = sock.recv(4096)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+            except TimeoutError:
+                # Like nc -w: a reply that arrived before the idle timeout
+                # still counts if the miner leaves the connection open.
+                if not chunks:
+                    raise
+        return b"".join(chunks)
+
+    def _exchange_nc(self, payload: bytes) -> bytes:
         try:
             result = subprocess.run(
                 ['nc', '-w', str(self.timeout), self.ip, str(self.port)],
-                input=cmd_json.encode('utf-8'),
+                input=payload,
                 capture_output=True,
                 timeout=self.timeout + 2
             )
+        except subprocess.TimeoutExpired:
+            raise TimeoutError(f"nc timed out after {self.timeout + 2}s") from None
+        if result.returncode != 0:
+            raise OSError(f"nc failed: {result.stderr.decode(errors='replace')}")
+        return result.stdout
 
-            if result.returncode == 0:
-                response = result.stdout.decode('utf-8', errors='replace').strip()
-                data = json.loads(response)
-                return data
-            else:
-                print(f"[NCMinerAPI] nc failed: {result.stderr.decode()}")
-                return None
+    def _send_command(self, command: str) -> Optional[Dict[str, Any]]:
+        """Send a non-privileged command to the miner."""
+        cmd = {"command": command}
+        cmd_json = json.dumps(cmd)
 
-        except subprocess.TimeoutExpired:
+        try:
+            response = self._exchange(cmd_json.encode('utf-8')).decode('utf-8', errors='replace').strip()
+            data = json.loads(response)
+            return data
+
+        except TimeoutError:
             print(f"[NCMinerAPI] Timeout connecting to {self.ip}:{self.port}")
             return None
         except json.JSONDecodeError as e:
@@ -159,7 +206,7 @@ class NCMinerAPI:
         if not self.pwd:
             raise ValueError("Password not set")
         # Use MD5 crypt (same format as pyasic: $1$salt$hash)
-        return md5_crypt.using(salt=salt).hash(self.pwd)
+        return _md5_crypt_cached(self.pwd, salt)
 
     def send_aes_privileged_command(self, command: str, _token_max_attempts: int = 2, **params) -> Dict[str, Any]:
         """
@@ -247,36 +294,27 @@ class NCMinerAPI:
             # Brief pause to allow get_token connection to close before opening new one
             time.sleep(0.5)
 
-            # Step 4: Send via nc
-            result = subprocess.run(
-                ['nc', '-w', str(self.timeout), self.ip, str(self.port)],
-                input=enc_payload,
-                capture_output=True,
-                timeout=self.timeout + 2
-            )
-
-            if result.returncode == 0:
-                response = result.stdout.decode('utf-8', errors='replace').strip()
-                print(f"[NCMinerAPI] AES response received ({len(response)} bytes)")
-                try:
-                    data = json.loads(response)
-                    # AES responses are encrypted — presence of "enc" key indicates success
-                    if "enc" in data:
-                        print(f"[NCMinerAPI] ✓ AES command accepted (encrypted response received)")
-                    elif data.get("STATUS") == "E":
-                        print(f"[NCMinerAPI] ✗ ERROR: {data.get('Msg')}")
-                    return data
-                except json.JSONDecodeError:
-                    print(f"[NCMinerAPI] ✗ JSON decode error on response: {response[:100]}")
-                    return {"STATUS": [{"STATUS": "E", "Msg": "JSON decode error"}]}
-            else:
-                error_msg = result.stderr.decode()
-                print(f"[NCMinerAPI] ✗ nc failed: {error_msg}")
-                return {"STATUS": [{"STATUS": "E", "Msg": f"nc failed: {error_msg}"}]}
+            # Step 4: Send the envelope
+            response = self._exchange(enc_payload).decode('utf-8', errors='replace').strip()
+            print(f"[NCMinerAPI] AES response received ({len(response)} bytes)")
+            try:
+                data = json.loads(response)
+                # AES responses are encrypted — presence of "enc" key indicates success
+                if "enc" in data:
+                    print(f"[NCMinerAPI] ✓ AES command accepted (encrypted response received)")
+                elif data.get("STATUS") == "E":
+                    print(f"[NCMinerAPI] ✗ ERROR: {data.get('Msg')}")
+                return data
+            except json.JSONDecodeError:
+                print(f"[NCMinerAPI] ✗ JSON decode error on response: {response[:100]}")
+                return {"STATUS": [{"STATUS": "E", "Msg": "JSON decode error"}]}
 
-        except subprocess.TimeoutExpired:
+        except TimeoutError:
             print(f"[NCMinerAPI] ✗ Timeout")
             return {"STATUS": [{"STATUS": "E", "Msg": "Timeout"}]}
+        except OSError as e:
+            print(f"[NCMinerAPI] ✗ {e}")
+            return {"STATUS": [{"STATUS": "E", "Msg": str(e)}]}
         except Exception as e:
             print(f"[NCMinerAPI] ✗ AES command error: {e}")
             import traceback
@@ -351,49 +389,40 @@ class NCMinerAPI:
             cmd_json = json.dumps(cmd)
             print(f"[NCMinerAPI] Command payload: {json.dumps({k: v for k, v in cmd.items() if k != 'enc_pwd'})}")
 
-            result = subprocess.run(
-                ['nc', '-w', str(self.timeout), self.ip, str(self.port)],
-                input=cmd_json.encode('utf-8'),
-                capture_output=True,
-                timeout=self.timeout + 2
-            )
-
-            if result.returncode == 0:
-                response = result.stdout.decode('utf-8', errors='replace').strip()
-                print(f"[NCMinerAPI] Response: {response}")
-                data = json.loads(response)
-
-                # Check status
-                if data:
-                    # Handle both old and new API response formats
-                    if "STATUS" in data and isinstance(data["STATUS"], list) and data["STATUS"]:
-                        status = data["STATUS"][0]
-                        status_code = status.get("STATUS", "")
-                        msg = status.get("Msg", "")
-                    else:
-                        # Simple format: {"STATUS":"E","Msg":"..."}
-                        status_code = data.get("STATUS", "")
-                        msg = data.get("Msg", "")
-
-                    if status_code == "S":
-                        print(f"[NCMinerAPI] ✓ SUCCESS: {msg}")
-                    elif status_code == "E":
-                        print(f"[NCMinerAPI] ✗ ERROR: {msg}")
-                    else:
-                        print(f"[NCMinerAPI] ? Unknown status: {status_code}")
+            response = self._exchange(cmd_json.encode('utf-8')).decode('utf-8', errors='replace').strip()
+            print(f"[NCMinerAPI] Response: {response}")
+            data = json.loads(response)
+
+            # Check status
+            if data:
+                # Handle both old and new API response formats
+                if "STATUS" in data and isinstance(data["STATUS"], list) and data["STATUS"]:
+                    status = data["STATUS"][0]
+                    status_code = status.get("STATUS", "")
+                    msg = status.get("Msg", "")
+                else:
+                    # Simple format: {"STATUS":"E","Msg":"..."}
+                    status_code = data.get("STATUS", "")
+                    msg = data.get("Msg", "")
+
+                if status_code == "S":
+                    print(f"[NCMinerAPI] ✓ SUCCESS: {msg}")
+                elif status_code == "E":
+                    print(f"[NCMinerAPI] ✗ ERROR: {msg}")
+                else:
+                    print(f"[NCMinerAPI] ? Unknown status: {status_code}")
 
-                return data
-            else:
-                error_msg = result.stderr.decode()
-                print(f"[NCMinerAPI] ✗ nc failed: {error_msg}")
-                return {"STATUS": [{"STATUS": "E", "Msg": f"Command failed: {error_msg}"}]}
+            return data
 
-        except subprocess.TimeoutExpired:
+        except TimeoutError:
             print(f"[NCMinerAPI] ✗ Timeout")
             return {"STATUS": [{"STATUS": "E", "Msg": "Timeout"}]}
         except json.JSONDecodeError as e:
             print(f"[NCMinerAPI] ✗ JSON decode error: {e}")
             return {"STATUS": [{"STATUS": "E", "Msg": f"JSON decode error: {e}"}]}
+        except OSError as e:
+            print(f"[NCMinerAPI] ✗ {e}")
+            return {"STATUS": [{"STATUS": "E", "Msg": f"Command failed: {e}"}]}
         except Exception as e:
             print(f"[NCMinerAPI] ✗ Error: {e}")
             import traceback
@@ -1,5 +1,26 @@
 import json, os, tempfile, threading, time
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _dumps(state) -> bytes:
+    """Compact, key-sorted JSON bytes; orjson when available."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(state, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            pass  # e.g. an int wider than 64 bits; the stdlib copes
+    return json.dumps(state, separators=(",", ":"), sort_keys=True).encode()
+
+
+def _loads(raw: bytes):
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
 DEFAULT_STATE = {
     "autocontrol": False,           # whether autocontrol is enabled
     "miner_power_state": "stopped", # "stopped", "running", or "pending"
@@ -44,17 +65,30 @@ class StateManager:
     def __init__(self, path="wm_state.json"):
         self.path = path
         self._lock = threading.Lock()
+        # (stat key, merged state) of the last read or write. load() reparses
+        # only when the file's mtime/size/inode change; every write goes
+        # through os.replace, so an outside edit always shows up as a new key.
+        self._cached = None
         if not os.path.exists(self.path):
             self._atomic_write(DEFAULT_STATE)
 
+    def _stat_key(self):
+        st = os.stat(self.path)
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
     def load(self):
         try:
-            with open(self.path, "r") as f:
-                data = json.load(f)
+            key = self._stat_key()
+            cached = self._cached
+            if cached is not None and cached[0] == key:
+                return cached[1].copy()
+            with open(self.path, "rb") as f:
+                data = _loads(f.read())
             # fill any missing fields for forward compatibility
             merged = DEFAULT_STATE.copy()
             merged.update(data or {})
-            return merged
+            self._cached = (key, merged)
+            return merged.copy()
         except Exception:
             return DEFAULT_STATE.copy()
 
@@ -64,14 +98,18 @@ class StateManager:
             state.update(kwargs)
             state["last_updated"] = int(time.time())
             self._atomic_write(state)
+            try:
+                self._cached = (self._stat_key(), state.copy())
+            except OSError:
+                self._cached = None
             return state
 
     def _atomic_write(self, state):
         d = os.path.dirname(os.path.abspath(self.path)) or "."
         fd, tmp = tempfile.mkstemp(prefix=".wmstate.", dir=d)
         try:
-            with os.fdopen(fd, "w") as f:
-                json.dump(state, f, separators=(",", ":"), sort_keys=True)
+            with os.fdopen(fd, "wb") as f:
+                f.write(_dumps(state))
                 f.flush()
                 os.fsync(f.fileno())
             os.replace(tmp, self.path)  # atomic on POSIX
@@ -0,0 +1,49 @@
+"""Time-bounded memoization for zero-argument getters.
+
+For status payloads that are polled far more often than they change:
+the first call in each window does the real work, later calls in the
+window return the same object. Callers must treat the result as
+read-only.
+
+Usage:
+    from utils.ttl_cache import ttl_cache
+
+    scan_info = ttl_cache(2.0)(network_scanner.get_scan_info)
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from typing import Any, Callable
+
+
+def ttl_cache(seconds: float) -> Callable[[Callable[[], Any]], Callable[[], Any]]:
+    """Decorate a zero-argument callable so its result is reused for `seconds`."""
+    def decorator(fn: Callable[[], Any]) -> Callable[[], Any]:
+        lock = threading.Lock()
+        # (value, expires_at) swapped as one tuple so readers never see a
+        # value paired with the wrong expiry.
+        entry = [(None, float("-inf"))]
+
+        @functools.wraps(fn)
+        def wrapper():
+            value, expires_at = entry[0]
+            if time.monotonic() < expires_at:
+                return value
+            with lock:
+                value, expires_at = entry[0]
+                now = time.monotonic()
+                if now < expires_at:
+                    return value
+                value = fn()
+                entry[0] = (value, now + seconds)
+                return value
+
+        def cache_clear():
+            entry[0] = (None, float("-inf"))
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator